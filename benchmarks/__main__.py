@@ -0,0 +1,162 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import SIZES, InputCache, run_benchmark, select_benchmarks
+
+
+def run(args: argparse.Namespace) -> int:
+    results: List[Dict[str, Any]] = []
+
+    for size_name in args.sizes:
+        benchmarks = select_benchmarks(size_name, args.filter)
+        if not benchmarks:
+            continue
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            print(f"Generating {size_name} trace ({SIZES[size_name]})...")
+            inputs = InputCache(SIZES[size_name], Path(tmp_dir), args.seed)
+
+            for benchmark in benchmarks:
+                # A component that fails (e.g. on a missing optional
+                # dependency) must not abort the rest of the run.
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        result = run_benchmark(benchmark, inputs, args.repeat)
+                except Exception as e:
+                    print(
+                        f"  {benchmark.group:<12} {benchmark.name:<40} "
+                        f"failed: {e!r}"
+                    )
+                    continue
+
+                results.append(result.to_dict())
+                print(
+                    f"  {result.group:<12} {result.name:<40} "
+                    f"{min(result.times):10.4f}s"
+                )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Prints the ratio of the (min) times of two runs, new over old."""
+    old = _load_results(args.old)
+    new = _load_results(args.new)
+
+    print(f"{'benchmark':<60} {'old':>10} {'new':>10} {'ratio':>7}")
+    for key in sorted(old.keys() & new.keys()):
+        old_time, new_time = old[key], new[key]
+        ratio = new_time / old_time if old_time > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = " slower"
+        elif ratio < 1 - args.threshold:
+            flag = " faster"
+
+        name = f"{key[0]}/{key[1]}/{key[2]}"
+        print(
+            f"{name:<60} {old_time:10.4f} {new_time:10.4f} {ratio:7.2f}{flag}"
+        )
+
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"{'/'.join(key):<60} only in {'old' if key in old else 'new'}")
+
+    return 0
+
+
+def _load_results(path: str) -> Dict[Any, float]:
+    report = json.loads(Path(path).read_text())
+
+    return {
+        (result["group"], result["name"], result["size"]): result["min"]
+        for result in report["results"]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="benchmarks of the readers, preprocessors and comparators",
+    )
+    subparsers = parser.add_subparsers(dest="cmd", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument(
+        "-s",
+        dest="sizes",
+        nargs="+",
+        choices=list(SIZES),
+        default=["small"],
+        help="input sizes to run (default: small)",
+    )
+    run_parser.add_argument(
+        "-k",
+        dest="filter",
+        type=str,
+        help="only run the benchmarks whose name contains this string",
+    )
+    run_parser.add_argument(
+        "-r",
+        dest="repeat",
+        type=int,
+        default=3,
+        help="number of timed runs per benchmark (default: 3)",
+    )
+    run_parser.add_argument(
+        "-o", dest="output", type=str, help="json file to store the results"
+    )
+    run_parser.add_argument(
+        "--seed", type=int, default=42, help="seed of the synthetic trace"
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare the results of two runs"
+    )
+    compare_parser.add_argument("old", type=str, help="json of the old run")
+    compare_parser.add_argument("new", type=str, help="json of the new run")
+    compare_parser.add_argument(
+        "-t",
+        dest="threshold",
+        type=float,
+        default=0.1,
+        help="relative change to flag as slower/faster (default: 0.1)",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    result: int = args.func(args)
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
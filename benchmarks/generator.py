@@ -0,0 +1,136 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Columns of the instance usage CSVs, in the order of the demo input.
+PERCENTILES = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90] + list(range(91, 100))
+
+COLUMNS = (
+    [
+        "time",
+        "unique_id",
+        "collection_id",
+        "instance_index",
+        "priority",
+        "scheduling_class",
+        "machine_id",
+        "alloc_collection_id",
+        "alloc_instance_index",
+        "collection_type",
+        "avg_cpu_usage",
+        "avg_memory_usage",
+        "max_cpu_usage",
+        "max_memory_usage",
+        "random_sample_cpu_usage",
+        "assigned_memory",
+        "sample_rate",
+    ]
+    + [f"p{p}_cpu_usage" for p in PERCENTILES]
+    + ["memory_limit", "cpu_limit", "abstract_usage", "abstract_limit"]
+)
+
+# Usage is sampled every 5 minutes, with timestamps in microseconds.
+SAMPLE_PERIOD = 300_000_000
+
+
+def generate_trace(
+    output_dir: Path,
+    n_jobs: int,
+    n_tasks: int,
+    length: int,
+    seed: int = 42,
+) -> List[Path]:
+    """Writes a synthetic trace in the (structured) layout of the demo input:
+    `<output_dir>/<job_id>/<task_idx>-<start>-<end>.csv`.
+
+    The usage of each task is a daily pattern plus a mean-reverting random
+    walk, so that tasks of the same job look alike but are not identical.
+    Returns the paths of the written files.
+    """
+    rng = np.random.default_rng(seed)
+    files = []
+
+    for job in range(n_jobs):
+        job_id = 100_000_000_000 + job
+        job_dir = output_dir / str(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        job_level = rng.uniform(0.05, 0.5)
+        job_phase = rng.uniform(0, 2 * np.pi)
+
+        for task_idx in range(n_tasks):
+            usage = _generate_usage(rng, length, job_level, job_phase)
+            data = _generate_frame(rng, job_id, task_idx, usage)
+
+            start, end = data["time"].iloc[0], data["time"].iloc[-1]
+            file = job_dir / f"{task_idx}-{start}-{end}.csv"
+            data.to_csv(file, index=False)
+            files.append(file)
+
+    return files
+
+
+def _generate_usage(
+    rng: np.random.Generator, length: int, level: float, phase: float
+) -> np.ndarray:
+    steps_per_day = 24 * 60 * 60 * 1_000_000 // SAMPLE_PERIOD
+    t = np.arange(length)
+    daily = 0.5 * level * np.sin(2 * np.pi * t / steps_per_day + phase)
+
+    noise = np.empty(length)
+    noise[0] = 0.0
+    innovations = rng.normal(0, 0.02, length)
+    for i in range(1, length):
+        noise[i] = 0.95 * noise[i - 1] + innovations[i]
+
+    usage: np.ndarray = np.clip(level + daily + noise, 0.0, 1.0)
+
+    return usage
+
+
+def _generate_frame(
+    rng: np.random.Generator, job_id: int, task_idx: int, usage: np.ndarray
+) -> pd.DataFrame:
+    length = usage.shape[0]
+    start = SAMPLE_PERIOD * (1 + rng.integers(0, 12))
+
+    # Samples within each period spread around its average usage, and the
+    # percentiles of a period are sorted by construction.
+    samples = usage[:, None] * rng.lognormal(0, 0.3, (length, 32))
+    percentiles = np.percentile(np.clip(samples, 0, 1), PERCENTILES, axis=1)
+
+    memory = np.clip(usage * rng.uniform(0.5, 1.5), 0, 1)
+
+    data = {
+        "time": start + SAMPLE_PERIOD * np.arange(length, dtype=np.int64),
+        "unique_id": f"{job_id}-{task_idx}",
+        "collection_id": job_id,
+        "instance_index": task_idx,
+        "priority": 200,
+        "scheduling_class": 3,
+        "machine_id": int(rng.integers(1, 10**11)),
+        "alloc_collection_id": 0,
+        "alloc_instance_index": 0,
+        "collection_type": 0,
+        "avg_cpu_usage": usage,
+        "avg_memory_usage": memory,
+        "max_cpu_usage": np.clip(samples.max(axis=1), 0, 1),
+        "max_memory_usage": np.clip(memory * 1.1, 0, 1),
+        "random_sample_cpu_usage": np.clip(samples[:, 0], 0, 1),
+        "assigned_memory": 0.0,
+        "sample_rate": rng.uniform(0.98, 1.0, length),
+    }
+    for p, values in zip(PERCENTILES, percentiles):
+        data[f"p{p}_cpu_usage"] = values
+    data.update(
+        {
+            "memory_limit": 0.00390625,
+            "cpu_limit": 0.012344360351562,
+            "abstract_usage": 0.0,
+            "abstract_limit": 0.0,
+        }
+    )
+
+    return pd.DataFrame(data, columns=COLUMNS)
@@ -0,0 +1,681 @@
+import copy
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.generator import generate_trace
+from gtd import comparator as cmp
+from gtd import input as inp
+from gtd import preprocessor as pre
+from gtd.internal import Input, Output
+from gtd.utils import to_image_dtype
+
+COL = "avg_cpu_usage"
+
+
+class Size(NamedTuple):
+    n_jobs: int
+    n_tasks: int
+    length: int
+    image_size: int
+    step: int
+
+    @property
+    def n_items(self) -> int:
+        return self.n_jobs * self.n_tasks
+
+
+SIZES: Dict[str, Size] = {
+    # One day, a week and a month of 5 minute samples.
+    "small": Size(n_jobs=4, n_tasks=8, length=288, image_size=32, step=72),
+    "medium": Size(n_jobs=8, n_tasks=16, length=2016, image_size=64, step=288),
+    "large": Size(
+        n_jobs=16, n_tasks=32, length=8640, image_size=128, step=1440
+    ),
+}
+
+ALL_SIZES = tuple(SIZES)
+
+# Per pair (or per fraction) implementations that take minutes at scale.
+SLOW_SIZES = ("small", "medium")
+
+
+class Benchmark(NamedTuple):
+    group: str
+    name: str
+    # Kind of input (or, for readers, of input dir) the benchmarked component
+    # runs on (see `InputCache`).
+    kind: str
+    factory: Callable[[Size], Any]
+    sizes: Tuple[str, ...] = ALL_SIZES
+
+
+class BenchmarkResult(NamedTuple):
+    group: str
+    name: str
+    size: str
+    n_items: int
+    times: List[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "group": self.group,
+            "name": self.name,
+            "size": self.size,
+            "n_items": self.n_items,
+            "times": self.times,
+            "min": min(self.times),
+            "median": float(np.median(self.times)),
+        }
+
+
+def _reader(**kwargs: Any) -> Callable[[Size], Any]:
+    return lambda size: (
+        lambda input_dir: inp.CsvFullReader(
+            input_dir=input_dir, columns=["time", COL], **kwargs
+        )
+    )
+
+
+def _image_reader(cls: Any) -> Callable[[Size], Any]:
+    return lambda size: (lambda input_dir: cls(input_dir=input_dir))
+
+
+def _series(cls: Any, **kwargs: Any) -> Callable[[Size], Any]:
+    return lambda size: cls(name=cls.__name__, col=COL, **kwargs)
+
+
+def _plain(cls: Any, **kwargs: Any) -> Callable[[Size], Any]:
+    return lambda size: cls(name=cls.__name__, **kwargs)
+
+
+def _sax(cls: Any, **kwargs: Any) -> Callable[[Size], Any]:
+    return lambda size: cls(name=cls.__name__, n_bins=8, **kwargs)
+
+
+BENCHMARKS: List[Benchmark] = [
+    # Readers
+    Benchmark("reader", "CsvFullReader", "files", _reader()),
+    Benchmark(
+        "reader", "CsvFullReader[float32]", "files", _reader(dtype="float32")
+    ),
+    Benchmark(
+        "reader",
+        "ImageFullReader",
+        "image_files",
+        _image_reader(inp.ImageFullReader),
+    ),
+    Benchmark(
+        "reader",
+        "RGBImageFullReader",
+        "image_files",
+        _image_reader(inp.RGBImageFullReader),
+    ),
+    Benchmark(
+        "reader",
+        "ImageFractionReader",
+        "image_fraction_files",
+        _image_reader(inp.ImageFractionReader),
+    ),
+    # Preprocessors
+    Benchmark(
+        "preprocessor",
+        "TimeConfigurator",
+        "raw",
+        lambda s: pre.TimeConfigurator(
+            time_col="time", time_unit="us", freq="5min"
+        ),
+    ),
+    Benchmark(
+        "preprocessor",
+        "Padder",
+        "ragged",
+        lambda s: pre.Padder(freq="5min"),
+    ),
+    Benchmark("preprocessor", "Trimmer", "raw", lambda s: pre.Trimmer()),
+    Benchmark(
+        "preprocessor",
+        "Cropper",
+        "series",
+        lambda s: pre.Cropper(llim=0, ulim=s.length // 2),
+    ),
+    Benchmark(
+        "preprocessor",
+        "TaskNormalizer",
+        "trimmed",
+        lambda s: pre.TaskNormalizer(col=COL),
+    ),
+    Benchmark(
+        "preprocessor",
+        "TaskSlicer",
+        "series",
+        lambda s: pre.TaskSlicer(step=s.step),
+    ),
+    Benchmark(
+        "preprocessor",
+        "OutlierHandler",
+        "series",
+        lambda s: pre.OutlierHandler(col=COL, llim=0.05, ulim=0.95),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionAggregator",
+        "series",
+        lambda s: pre.FractionAggregator(col=COL, ts_to_px_ratio=4),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionGADFCreator",
+        "series",
+        lambda s: pre.FractionGADFCreator(col=COL, image_size=s.image_size),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionGADFCreator[float32]",
+        "series",
+        lambda s: pre.FractionGADFCreator(
+            col=COL, image_size=s.image_size, dtype="float32"
+        ),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionGASFCreator",
+        "series",
+        lambda s: pre.FractionGASFCreator(col=COL, image_size=s.image_size),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionMTFCreator",
+        "series",
+        lambda s: pre.FractionMTFCreator(col=COL, n_bins=8, size=s.image_size),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionImageCreator",
+        "aggregated",
+        lambda s: pre.FractionImageCreator(col=COL, image_size=s.image_size),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionIoUPreprocessor",
+        "line_images",
+        lambda s: pre.FractionIoUPreprocessor(epsilon=2),
+    ),
+    Benchmark(
+        "preprocessor",
+        "TaskSAXCreator",
+        "series",
+        lambda s: pre.TaskSAXCreator(
+            col=COL, n_bins=8, strategy="normal", n_segments=32
+        ),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionSAXCreator",
+        "fractions",
+        lambda s: pre.FractionSAXCreator(
+            col=COL, n_bins=8, strategy="normal", n_segments=8
+        ),
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionFingerprintGenerator",
+        "fractions",
+        lambda s: pre.FractionFingerprintGenerator(col=COL, mode="hash"),
+    ),
+    Benchmark(
+        "preprocessor",
+        "SpectrumCreator",
+        "series",
+        lambda s: pre.SpectrumCreator(col=COL),
+    ),
+    Benchmark(
+        "preprocessor",
+        "TaskROCKETCreator",
+        "series",
+        lambda s: pre.TaskROCKETCreator(col=COL, n_kernels=100),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "preprocessor",
+        "FractionROCKETCreator",
+        "fractions",
+        lambda s: pre.FractionROCKETCreator(col=COL, n_kernels=100),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "preprocessor",
+        "RWSCreator",
+        "series",
+        lambda s: pre.RWSCreator(col=COL, R=16),
+        ("small",),
+    ),
+    # Comparators of series
+    Benchmark(
+        "comparator",
+        "L1TaskComparator",
+        "series",
+        _series(cmp.L1TaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "L2TaskComparator",
+        "series",
+        _series(cmp.L2TaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MAETaskComparator",
+        "series",
+        _series(cmp.MAETaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MSETaskComparator",
+        "series",
+        _series(cmp.MSETaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MAPETaskComparator",
+        "series",
+        _series(cmp.MAPETaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "CosineTaskComparator",
+        "series",
+        _series(cmp.CosineTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "SSIMTaskComparator",
+        "series",
+        _series(cmp.SSIMTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "SDSIMTaskComparator",
+        "series",
+        _series(cmp.SDSIMTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "DTWL2TaskComparator",
+        "series",
+        _series(cmp.DTWL2TaskComparator),
+        ("small",),
+    ),
+    Benchmark(
+        "comparator",
+        "DTWL2TaskComparator[exact]",
+        "series",
+        _series(cmp.DTWL2TaskComparator, engine="exact", window=32),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MultiMetricTaskComparator",
+        "series",
+        _series(
+            cmp.MultiMetricTaskComparator,
+            metrics=["l1", "l2", "mae", "mse", "cosine"],
+        ),
+    ),
+    # Comparators of sliced series
+    Benchmark(
+        "comparator",
+        "L1TaskFractionComparator",
+        "fractions",
+        _series(cmp.L1TaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "L2TaskFractionComparator",
+        "fractions",
+        _series(cmp.L2TaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MAETaskFractionComparator",
+        "fractions",
+        _series(cmp.MAETaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MSETaskFractionComparator",
+        "fractions",
+        _series(cmp.MSETaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "MAPETaskFractionComparator",
+        "fractions",
+        _series(cmp.MAPETaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "CosineTaskFractionComparator",
+        "fractions",
+        _series(cmp.CosineTaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "SSIMTaskFractionComparator",
+        "fractions",
+        _series(cmp.SSIMTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "DTWL2TaskFractionComparator",
+        "fractions",
+        _series(cmp.DTWL2TaskFractionComparator),
+        ("small",),
+    ),
+    # Comparators of images
+    Benchmark(
+        "comparator",
+        "L1ImageTaskComparator",
+        "images",
+        _plain(cmp.L1ImageTaskComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "L2ImageTaskComparator",
+        "images",
+        _plain(cmp.L2ImageTaskComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MAEImageTaskComparator",
+        "images",
+        _plain(cmp.MAEImageTaskComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MSEImageTaskComparator",
+        "images",
+        _plain(cmp.MSEImageTaskComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MAPEImageTaskComparator",
+        "images",
+        _plain(cmp.MAPEImageTaskComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "SSIMImageTaskComparator",
+        "images",
+        _plain(cmp.SSIMImageTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "L1ImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.L1ImageTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "L1ImageTaskFractionComparatorV2",
+        "image_fractions",
+        _plain(cmp.L1ImageTaskFractionComparatorV2),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "L2ImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.L2ImageTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "L2ImageTaskFractionComparatorV2",
+        "image_fractions",
+        _plain(cmp.L2ImageTaskFractionComparatorV2),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MAEImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.MAEImageTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MSEImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.MSEImageTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "MAPEImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.MAPEImageTaskFractionComparator),
+        SLOW_SIZES,
+    ),
+    Benchmark(
+        "comparator",
+        "SSIMImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.SSIMImageTaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "SDSIMImageTaskFractionComparator",
+        "image_fractions",
+        _plain(cmp.SDSIMImageTaskFractionComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "IoUTaskComparator",
+        "iou_images",
+        _plain(cmp.IoUTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "IoUTaskFractionComparator",
+        "iou_image_fractions",
+        _plain(cmp.IoUTaskFractionComparator),
+    ),
+    # Comparators of SAX words
+    Benchmark(
+        "comparator",
+        "SAXMinDistTaskComparator",
+        "sax",
+        _sax(cmp.SAXMinDistTaskComparator),
+    ),
+    Benchmark(
+        "comparator",
+        "SAXMinDistTaskFractionComparator",
+        "sax_fractions",
+        _sax(cmp.SAXMinDistTaskFractionComparator),
+    ),
+]
+
+
+class InputCache:
+    """Generates the trace of a size once and derives each kind of input
+    (and of input dir) from it on first use."""
+
+    def __init__(self, size: Size, input_dir: Path, seed: int = 42):
+        self.size = size
+        self.input_dir = input_dir
+        self._inputs: Dict[str, Input] = {}
+        self._dirs: Dict[str, Path] = {"files": input_dir / "csv"}
+
+        generate_trace(
+            self._dirs["files"], size.n_jobs, size.n_tasks, size.length, seed
+        )
+
+    def get(self, kind: str) -> Input:
+        if kind not in self._inputs:
+            self._inputs[kind] = self._prepare(kind)
+
+        return self._inputs[kind]
+
+    def get_dir(self, kind: str) -> Path:
+        """Returns the dir of the CSV files (`files`), or of the PNG files of
+        the (GADF) images in the layout of the full (`image_files`) or the
+        fraction readers (`image_fraction_files`)."""
+        if kind not in self._dirs:
+            self._dirs[kind] = self._write_images(kind)
+
+        return self._dirs[kind]
+
+    def _write_images(self, kind: str) -> Path:
+        images_dir = self.input_dir / kind
+        if kind == "image_files":
+            for task in self.get("images").get_tasks():
+                path = images_dir / str(task.job_id) / f"{task.idx}.png"
+                _write_png(path, task.get_fraction_by_idx(0).data)
+        else:
+            for fraction in self.get("image_fractions").get_fractions():
+                task_dir = f"{fraction.job_id}-{fraction.task_idx}"
+                path = images_dir / task_dir / f"{fraction.idx}.png"
+                _write_png(path, fraction.data)
+
+        return images_dir
+
+    def _prepare(self, kind: str) -> Input:
+        size = self.size
+        steps: Dict[str, Tuple[str, Callable[[], Any]]] = {
+            "configured": (
+                "raw",
+                lambda: pre.TimeConfigurator(
+                    time_col="time", time_unit="us", freq="5min"
+                ),
+            ),
+            "trimmed": ("raw", lambda: pre.Trimmer()),
+            "series": ("trimmed", lambda: pre.TaskNormalizer(col=COL)),
+            "fractions": ("series", lambda: pre.TaskSlicer(step=size.step)),
+            "images": ("series", lambda: self._gadf()),
+            "image_fractions": ("fractions", lambda: self._gadf()),
+            "aggregated": ("series", lambda: self._aggregator(size.length)),
+            "aggregated_fractions": (
+                "fractions",
+                lambda: self._aggregator(size.step),
+            ),
+            "line_images": ("aggregated", lambda: self._image_creator()),
+            "line_image_fractions": (
+                "aggregated_fractions",
+                lambda: self._image_creator(),
+            ),
+            "iou_images": (
+                "line_images",
+                lambda: pre.FractionIoUPreprocessor(epsilon=2),
+            ),
+            "iou_image_fractions": (
+                "line_image_fractions",
+                lambda: pre.FractionIoUPreprocessor(epsilon=2),
+            ),
+            "sax": (
+                "series",
+                lambda: pre.TaskSAXCreator(
+                    col=COL, n_bins=8, strategy="normal", n_segments=32
+                ),
+            ),
+            "sax_fractions": (
+                "fractions",
+                lambda: pre.FractionSAXCreator(
+                    col=COL, n_bins=8, strategy="normal", n_segments=8
+                ),
+            ),
+        }
+
+        if kind == "raw":
+            return inp.CsvFullReader(
+                input_dir=self.get_dir("files"), columns=["time", COL]
+            ).read_input()
+
+        if kind == "ragged":
+            # Every other task is cut to half its length, to be padded again.
+            ragged = copy.deepcopy(self.get("configured"))
+            for i, task in enumerate(ragged.get_tasks()):
+                if i % 2 == 1:
+                    fraction = task.get_fraction_by_idx(0)
+                    fraction.data = fraction.data[: size.length // 2]
+
+            return ragged
+
+        source, step = steps[kind]
+        input_obj: Input = step().run(copy.deepcopy(self.get(source)))
+
+        return input_obj
+
+    def _gadf(self) -> Any:
+        return pre.FractionGADFCreator(col=COL, image_size=self.size.image_size)
+
+    def _aggregator(self, length: int) -> Any:
+        # Line images need at least one point per column.
+        ratio = max(1, length // self.size.image_size)
+
+        return pre.FractionAggregator(col=COL, ts_to_px_ratio=ratio)
+
+    def _image_creator(self) -> Any:
+        return pre.FractionImageCreator(
+            col=COL, image_size=self.size.image_size
+        )
+
+
+def _write_png(path: Path, image: np.ndarray) -> None:
+    # The (float) GADF values in [-1, 1] are stored as 8-bit gray levels.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(path), to_image_dtype(image, "uint8", (-1.0, 1.0)))
+
+
+def run_benchmark(
+    benchmark: Benchmark, inputs: InputCache, repeat: int
+) -> BenchmarkResult:
+    size = inputs.size
+    obj = benchmark.factory(size)
+
+    times = []
+    for _ in range(repeat):
+        if benchmark.group == "reader":
+            reader = obj(inputs.get_dir(benchmark.kind))
+            start = time.perf_counter()
+            reader.read_input()
+        elif benchmark.group == "preprocessor":
+            input_obj = copy.deepcopy(inputs.get(benchmark.kind))
+            start = time.perf_counter()
+            obj.run(input_obj)
+        else:
+            input_obj = inputs.get(benchmark.kind)
+            start = time.perf_counter()
+            obj.compare(input_obj, Output())
+
+        times.append(time.perf_counter() - start)
+
+    return BenchmarkResult(
+        group=benchmark.group,
+        name=benchmark.name,
+        size=[name for name, s in SIZES.items() if s == size][0],
+        n_items=size.n_items,
+        times=times,
+    )
+
+
+def select_benchmarks(
+    size_name: str, pattern: Optional[str] = None
+) -> List[Benchmark]:
+    return [
+        benchmark
+        for benchmark in BENCHMARKS
+        if size_name in benchmark.sizes
+        and (pattern is None or pattern.lower() in benchmark.name.lower())
+    ]
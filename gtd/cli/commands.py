@@ -6,6 +6,7 @@ from typing import Dict
 CommandInfo = namedtuple("CommandInfo", "module_path, class_name")
 
 commands_dict: Dict[str, CommandInfo] = {
+    "compare": CommandInfo("gtd.cli.compare", "CompareCommand"),
     "download": CommandInfo("gtd.cli.download", "DownloadCommand"),
     "export": CommandInfo("gtd.cli.export", "ExportCommand"),
     "ts": CommandInfo("gtd.cli.ts", "TsCommand"),
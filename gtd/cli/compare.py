@@ -0,0 +1,75 @@
+import argparse
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict
+
+from gtd.cli.commands import Command
+from gtd.comparator import TextProgressReporter
+from gtd.instrumentation import Instrumentation
+from gtd.internal import MatrixPartialOutput, Output
+from gtd.utils import import_class
+
+
+class CompareCommand(Command):
+    def run(self, args: argparse.Namespace) -> int:
+        reader_class = import_class("gtd.input", args.reader, "InputReader")
+        comparator_class = import_class(
+            "gtd.comparator", args.comparator, "Comparator"
+        )
+
+        print("Reading input...")
+        input_obj = reader_class(input_dir=Path(args.input)).read_input()
+
+        comparator_args: Dict[str, Any] = {
+            "name": args.comparator,
+            "workers": args.workers,
+        }
+        if args.block_size is not None:
+            comparator_args["block_size"] = args.block_size
+        if args.cache_dir is not None:
+            comparator_args["cache_dir"] = Path(args.cache_dir)
+        if args.checkpoint_dir is not None:
+            comparator_args["checkpoint_dir"] = Path(args.checkpoint_dir)
+            comparator_args["resume"] = args.resume
+        if args.col is not None:
+            comparator_args["col"] = args.col
+        if args.metrics is not None:
+            comparator_args["metrics"] = args.metrics
+        if args.progress:
+            comparator_args["progress"] = TextProgressReporter()
+
+        comparator = comparator_class(**comparator_args)
+
+        print("Comparing input...")
+        output_obj = Output()
+        instrumentation = None if args.profile is None else Instrumentation()
+        with instrumentation or nullcontext():
+            comparator.compare(input_obj, output_obj)
+
+        if instrumentation is not None:
+            print(instrumentation.format_summary())
+            instrumentation.save_trace(Path(args.profile))
+
+        print("Writing output...")
+        if args.metrics is None:
+            self._write_part(output_obj, args.comparator, Path(args.output))
+        else:
+            # Every metric is stored in its own part of the output.
+            output_path = Path(args.output)
+            for metric in args.metrics:
+                self._write_part(
+                    output_obj,
+                    comparator.get_part_name(metric),
+                    output_path.with_name(
+                        f"{output_path.stem}_{metric}{output_path.suffix}"
+                    ),
+                )
+
+        return 0
+
+    def _write_part(self, output_obj: Output, name: str, path: Path) -> None:
+        partial_output = output_obj.get_part_by_name(name)
+        if not isinstance(partial_output, MatrixPartialOutput):
+            raise ValueError(f"{name} has no matrix output!")
+
+        partial_output.to_frame().to_csv(path, index=False)
@@ -93,6 +93,126 @@ def add_export_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def add_compare_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "input",
+        metavar="input",
+        type=str,
+        help="input dir that contains the (preprocessed) time series files",
+    )
+
+    parser.add_argument(
+        "comparator",
+        metavar="comparator",
+        type=str,
+        help="name of the comparator class (e.g. L2TaskComparator)",
+    )
+
+    parser.add_argument(
+        "output",
+        metavar="output",
+        type=str,
+        help="output csv file to store the comparison results",
+    )
+
+    parser.add_argument(
+        "-r",
+        dest="reader",
+        metavar="READER",
+        type=str,
+        default="CsvFullReader",
+        help="name of the input reader class (default: CsvFullReader)",
+    )
+
+    parser.add_argument(
+        "-col",
+        dest="col",
+        metavar="COL",
+        type=str,
+        help="column to compare (required by numeric comparators)",
+    )
+
+    parser.add_argument(
+        "-metrics",
+        dest="metrics",
+        metavar="METRIC",
+        type=str,
+        nargs="+",
+        help=(
+            """
+            metrics of a multi-metric comparator (e.g. l1 l2 cosine), whose
+            results are written to <output>_<metric>.csv each
+            """
+        ),
+    )
+
+    parser.add_argument(
+        "-w",
+        dest="workers",
+        metavar="WORKERS",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1)",
+    )
+
+    parser.add_argument(
+        "-b",
+        dest="block_size",
+        metavar="BLOCK",
+        type=int,
+        help=(
+            """
+            number of items per side of the blocks of pairs that are handed
+            to the workers (default: a few blocks per worker, up to the
+            comparator's maximum block size)
+            """
+        ),
+    )
+
+    parser.add_argument(
+        "-c",
+        dest="cache_dir",
+        metavar="CACHE_DIR",
+        type=str,
+        help="dir of an on-disk cache of already compared pairs",
+    )
+
+    parser.add_argument(
+        "-checkpoint",
+        dest="checkpoint_dir",
+        metavar="CHECKPOINT_DIR",
+        type=str,
+        help="dir to checkpoint the compared pairs to",
+    )
+
+    parser.add_argument(
+        "-resume",
+        dest="resume",
+        action="store_true",
+        help="resume the comparison from the checkpoint dir",
+    )
+
+    parser.add_argument(
+        "-progress",
+        dest="progress",
+        action="store_true",
+        help="report the completed pairs, pairs per second and eta",
+    )
+
+    parser.add_argument(
+        "-p",
+        dest="profile",
+        metavar="PROFILE",
+        type=str,
+        help=(
+            """
+            json file to store a profile of the comparison (in the Chrome
+            trace-event format), whose per-stage timings are printed as well
+            """
+        ),
+    )
+
+
 def add_ts_subparsers(parser: argparse.ArgumentParser) -> None:
     subparsers = parser.add_subparsers(
         title="available ts subcommands", dest="ts_cmd_name"
@@ -273,6 +393,12 @@ def create_parser() -> argparse.ArgumentParser:
     add_db_connection_args_group(export_parser)
     add_export_args(export_parser)
 
+    # Create parser for the "compare" command
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare time series with one of the comparators"
+    )
+    add_compare_args(compare_parser)
+
     # Create parser for the "ts" command
     ts_parser = subparsers.add_parser(
         "ts", help="handle timeseries of instances (tasks + alloc instances)"
@@ -33,6 +33,14 @@ from .mse import (
     MSETaskComparator,
     MSETaskFractionComparator,
 )
+from .multi_metric import MultiMetricTaskComparator
+from .progress import (
+    CallbackProgressReporter,
+    Progress,
+    ProgressReporter,
+    TextProgressReporter,
+)
+from .sax import SAXMinDistTaskComparator, SAXMinDistTaskFractionComparator
 from .ssim import (
     SDSIMTaskComparator,
     SDSIMImageTaskFractionComparator,
@@ -43,6 +51,7 @@ from .ssim import (
 )
 
 __all__ = [
+    "CallbackProgressReporter",
     "CosineTaskComparator",
     "CosineTaskFractionComparator",
     "DTWL2TaskComparator",
@@ -71,10 +80,16 @@ __all__ = [
     "MSEImageTaskFractionComparator",
     "MSETaskComparator",
     "MSETaskFractionComparator",
+    "MultiMetricTaskComparator",
+    "Progress",
+    "ProgressReporter",
+    "SAXMinDistTaskComparator",
+    "SAXMinDistTaskFractionComparator",
     "SDSIMTaskComparator",
     "SDSIMImageTaskFractionComparator",
     "SSIMImageTaskComparator",
     "SSIMImageTaskFractionComparator",
     "SSIMTaskComparator",
     "SSIMTaskFractionComparator",
+    "TextProgressReporter",
 ]
@@ -0,0 +1,323 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any, List, Optional, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from gtd.internal import Fraction, Job, MatrixPartialOutput, Task
+
+DIGEST_SIZE = 16
+
+CACHE_FILE = "blocks.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS comparators (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    shape TEXT,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    comparator INTEGER NOT NULL,
+    digests1 BLOB NOT NULL,
+    digests2 BLOB NOT NULL,
+    mask BLOB NOT NULL,
+    "values" BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS block_digests (
+    comparator INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    block INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS block_digests_digest
+    ON block_digests (comparator, digest);
+CREATE TEMP TABLE IF NOT EXISTS requested (
+    digest BLOB PRIMARY KEY
+);
+"""
+
+
+def data_digest(data: Any) -> bytes:
+    """Returns a digest of the content of the data of a fraction."""
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    if isinstance(data, pd.DataFrame):
+        for col in data.columns:
+            values = np.ascontiguousarray(data[col].to_numpy())
+            hasher.update(str(col).encode())
+            hasher.update(str(values.dtype).encode())
+            if values.dtype == object:
+                hasher.update(repr(values.tolist()).encode())
+            else:
+                hasher.update(values.tobytes())
+    elif isinstance(data, np.ndarray):
+        hasher.update(str(data.dtype).encode())
+        hasher.update(str(data.shape).encode())
+        hasher.update(np.ascontiguousarray(data).tobytes())
+    else:
+        hasher.update(repr(data).encode())
+
+    return hasher.digest()
+
+
+def item_digest(item: Union[Job, Task, Fraction]) -> bytes:
+    """Returns a digest of the data of all fractions of a job/task/fraction.
+
+    Only the data is hashed, so that items which are renamed or moved to
+    another position keep hitting the cache.
+    """
+    if isinstance(item, Fraction):
+        return data_digest(item.data)
+
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for fraction in item.get_fractions():
+        hasher.update(item_digest(fraction))
+
+    return hasher.digest()
+
+
+def digest_array(digests: List[bytes]) -> np.ndarray:
+    """Packs digests into a fixed-width array that can be sorted and searched
+    (and stored) as a whole."""
+    return np.array(digests, dtype=f"S{DIGEST_SIZE}")
+
+
+class ComparatorCache:
+    """On-disk store of the pair values of comparators.
+
+    Every compared block is stored as a single row, keyed by the comparator
+    key (class and parameters), with the digests of its rows and columns,
+    its mask and the values of its masked pairs. The blocks that a row digest
+    belongs to are indexed, so that only the blocks of the requested items
+    are read. Once the store grows beyond `max_size` bytes, the blocks of the
+    least recently used comparator keys are evicted first.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_size = max_size
+        self._conn = sqlite3.connect(str(cache_dir / CACHE_FILE))
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ComparatorCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_comparator_id(self, key: str) -> int:
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO comparators (key, accessed) VALUES (?, ?)
+                ON CONFLICT (key) DO UPDATE SET accessed = excluded.accessed
+                """,
+                (key, time.time()),
+            )
+            (comparator_id,) = self._conn.execute(
+                "SELECT id FROM comparators WHERE key = ?", (key,)
+            ).fetchone()
+
+        return int(comparator_id)
+
+    def load(
+        self,
+        comparator_id: int,
+        digests: np.ndarray,
+        partial_output: MatrixPartialOutput,
+        symmetric: bool,
+    ) -> np.ndarray:
+        """Fills `partial_output` with the cached pairs of the items, whose
+        digests are given as a `digest_array`.
+
+        Returns an (n, n) mask of the pairs that were found.
+        """
+        n = digests.shape[0]
+        found = np.zeros((n, n), dtype=bool)
+
+        row = self._conn.execute(
+            "SELECT shape FROM comparators WHERE id = ?", (comparator_id,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return found
+
+        shape = tuple(json.loads(row[0]))
+
+        # Items with equal digests are looked up once, at their first
+        # position, and copied to the other positions afterwards.
+        unique, first = np.unique(digests, return_index=True)
+
+        with self._conn:
+            self._conn.execute("DELETE FROM requested")
+            self._conn.executemany(
+                "INSERT INTO requested VALUES (?)",
+                [(digest,) for digest in unique.tolist()],
+            )
+
+        cursor = self._conn.execute(
+            """
+            SELECT digests1, digests2, mask, "values" FROM blocks
+            WHERE id IN (
+                SELECT block_digests.block FROM requested
+                CROSS JOIN block_digests
+                WHERE block_digests.comparator = ?
+                AND block_digests.digest = requested.digest
+            )
+            """,
+            (comparator_id,),
+        )
+        for digests1, digests2, mask_bytes, values_bytes in cursor:
+            rows = _find(unique, first, digests1)
+            cols = _find(unique, first, digests2)
+
+            mask = np.unpackbits(
+                np.frombuffer(mask_bytes, dtype=np.uint8),
+                count=rows.shape[0] * cols.shape[0],
+            ).reshape(rows.shape[0], cols.shape[0])
+            pair_rows, pair_cols = np.nonzero(mask)
+            values = np.frombuffer(values_bytes, dtype=np.float64).reshape(
+                (pair_rows.shape[0],) + shape
+            )
+
+            i, j = rows[pair_rows], cols[pair_cols]
+            hit = (i >= 0) & (j >= 0) & (i != j)
+            if not hit.any():
+                continue
+
+            i, j, values = i[hit], j[hit], values[hit]
+            if symmetric:
+                i, j = np.concatenate([i, j]), np.concatenate([j, i])
+                values = np.concatenate([values, values])
+
+            if partial_output.values is None:
+                partial_output.allocate(shape)
+
+            assert partial_output.values is not None
+            partial_output.values[i, j] = values
+            found[i, j] = True
+
+        if partial_output.values is not None and unique.shape[0] < n:
+            _copy_duplicates(digests, unique, first, partial_output, found)
+
+        return found
+
+    def store(
+        self,
+        comparator_id: int,
+        digests1: np.ndarray,
+        digests2: np.ndarray,
+        values: np.ndarray,
+        mask: np.ndarray,
+    ) -> None:
+        """Stores the masked pairs of a block of values."""
+        values = np.ascontiguousarray(values[mask], dtype=np.float64)
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE comparators SET shape = ? WHERE id = ?",
+                (json.dumps(values.shape[1:]), comparator_id),
+            )
+            cursor = self._conn.execute(
+                "INSERT INTO blocks VALUES (NULL, ?, ?, ?, ?, ?)",
+                (
+                    comparator_id,
+                    digests1.tobytes(),
+                    digests2.tobytes(),
+                    np.packbits(mask).tobytes(),
+                    values.tobytes(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO block_digests VALUES (?, ?, ?)",
+                [
+                    (comparator_id, digest, cursor.lastrowid)
+                    for digest in np.unique(digests1).tolist()
+                ],
+            )
+
+    def size(self) -> int:
+        (size,) = self._conn.execute("""
+            SELECT COALESCE(SUM(
+                LENGTH(digests1) + LENGTH(digests2) + LENGTH(mask)
+                + LENGTH("values")
+            ), 0) FROM blocks
+            """).fetchone()
+
+        return int(size)
+
+    def evict(self) -> None:
+        """Evicts least recently used blocks until the store fits `max_size`."""
+        excess = self.size() - self.max_size
+        if excess <= 0:
+            return
+
+        cursor = self._conn.execute("""
+            SELECT blocks.id, LENGTH(digests1) + LENGTH(digests2)
+                + LENGTH(mask) + LENGTH("values")
+            FROM blocks
+            JOIN comparators ON blocks.comparator = comparators.id
+            ORDER BY comparators.accessed, blocks.id
+            """)
+
+        evicted = []
+        for block_id, size in cursor:
+            if excess <= 0:
+                break
+
+            evicted.append((block_id,))
+            excess -= size
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM blocks WHERE id = ?", evicted)
+            self._conn.executemany(
+                "DELETE FROM block_digests WHERE block = ?", evicted
+            )
+            self._conn.execute("""
+                DELETE FROM comparators WHERE id NOT IN (
+                    SELECT DISTINCT comparator FROM blocks
+                )
+                """)
+
+
+def _find(unique: np.ndarray, first: np.ndarray, digests: bytes) -> np.ndarray:
+    """Returns the positions of the (packed) digests among the requested
+    ones, or -1 for digests that were not requested."""
+    packed = np.frombuffer(digests, dtype=unique.dtype)
+    idxs = np.minimum(np.searchsorted(unique, packed), unique.shape[0] - 1)
+
+    return np.where(unique[idxs] == packed, first[idxs], -1)
+
+
+def _copy_duplicates(
+    digests: np.ndarray,
+    unique: np.ndarray,
+    first: np.ndarray,
+    partial_output: MatrixPartialOutput,
+    found: np.ndarray,
+) -> None:
+    # Pairs of equal items are cached as any others, only the pair of an
+    # item with a copy of itself (at the source position) is compared again.
+    assert partial_output.values is not None
+    values = partial_output.values
+
+    sources = first[np.searchsorted(unique, digests)]
+    for pos in np.nonzero(sources != np.arange(digests.shape[0]))[0]:
+        source = sources[pos]
+        values[pos], found[pos] = values[source], found[source]
+        values[:, pos], found[:, pos] = values[:, source], found[:, source]
+        found[pos, pos] = False
@@ -1,34 +1,47 @@
 import math
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from fastdtw import fastdtw
+from scipy.ndimage import maximum_filter1d, minimum_filter1d, uniform_filter
+from scipy.stats import norm
 from skimage.metrics import structural_similarity
 
+# Upper bound of the elements of the temporary arrays that the batched
+# calculators allocate (32 MiB of float64).
+MAX_BATCH_ELEMS = 1 << 22
+
+# Side of the (uniform) SSIM window, as in `structural_similarity`.
+SSIM_WIN_SIZE = 7
+
+# Metrics that `multi_metric_matrix` calculates in a single pass.
+MULTI_METRICS = ("l1", "l2", "mae", "mse", "cosine")
+
 
 def l1(data1: pd.Series, data2: pd.Series) -> float:
-    dist: float = sum([abs(x - y) for x, y in zip(data1, data2)])
+    diff = _diff(data1, data2)
+    dist = float(np.sum(np.abs(diff)))
 
     return dist
 
 
 def l1_img(data1: np.ndarray, data2: np.ndarray) -> float:
-    diff = np.subtract(data1, data2)
-    acc_dist: float = np.sum(np.abs(diff))
+    diff = _img_diff(data1, data2)
+    acc_dist = float(np.sum(np.abs(diff), dtype=np.float64))
 
     return acc_dist
 
 
 def l2(data1: pd.Series, data2: pd.Series) -> float:
-    dist = sum([abs(x - y) ** 2 for x, y in zip(data1, data2)])
+    diff = _diff(data1, data2)
+    dist = float(np.dot(diff, diff))
 
     return math.sqrt(dist)
 
 
 def l2_img(data1: np.ndarray, data2: np.ndarray) -> float:
-    diff = np.subtract(data1, data2)
-    acc_dist: float = np.sum(diff**2)
+    acc_dist = _img_sq_sum(_img_diff(data1, data2))
 
     return math.sqrt(acc_dist)
 
@@ -46,31 +59,32 @@ def mae_img(data1: np.ndarray, data2: np.ndarray) -> float:
 
 
 def mse(data1: pd.Series, data2: pd.Series) -> float:
-    dists = [abs(x - y) ** 2 for x, y in zip(data1, data2)]
-    dist: float = sum(dists) / len(dists)
+    diff = _diff(data1, data2)
+    dist: float = float(np.dot(diff, diff)) / diff.shape[0]
 
     return dist
 
 
 def mse_img(data1: np.ndarray, data2: np.ndarray) -> float:
     h, w = data1.shape
-    diff = np.subtract(data1, data2)
-    acc_dist: float = np.sum(diff**2)
+    acc_dist = _img_sq_sum(_img_diff(data1, data2))
 
     return acc_dist / (float(h * w))
 
 
 def mape_img(data1: np.ndarray, data2: np.ndarray) -> float:
+    diff = _img_diff(data1, data2)
     dist: float = (
         np.mean(
             np.abs(
                 np.divide(
-                    (data1 - data2),
+                    diff,
                     data1,
-                    out=np.zeros_like(data1 - data2),
+                    out=np.zeros(diff.shape, dtype=_img_float_type(diff)),
                     where=data1 != 0,
                 )
-            )
+            ),
+            dtype=np.float64,
         )
         * 100
     )
@@ -86,11 +100,94 @@ def mape(data1: pd.Series, data2: pd.Series) -> float:
 
 
 def ssim_img(data1: np.ndarray, data2: np.ndarray) -> float:
-    mssim = structural_similarity(data1, data2)
+    mssim = structural_similarity(
+        data1, data2, data_range=ssim_data_range(data1)
+    )
 
     return float(mssim)
 
 
+def ssim_data_range(data: np.ndarray) -> float:
+    """Data range of SSIM, taken from the dtype of the data like in older
+    scikit-image versions ([-1, 1] for floating point data)."""
+    if np.issubdtype(data.dtype, np.integer):
+        info = np.iinfo(data.dtype)
+        return float(info.max) - float(info.min)
+
+    return 2.0
+
+
+def ssim_stats(
+    data: np.ndarray, win_size: int = SSIM_WIN_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Data, local means and local variances of a stack of (n, ...) images
+    (or series), i.e. the per-image terms of SSIM."""
+    # Same working precision as `structural_similarity`: float32 images stay
+    # float32, everything else is float64.
+    float_type = (
+        np.float32 if data.dtype in (np.float16, np.float32) else np.float64
+    )
+    data = data.astype(float_type, copy=False)
+    size, cov_norm = _ssim_filter(data.ndim - 1, win_size)
+
+    means = uniform_filter(data, size=size)
+    variances = cov_norm * (uniform_filter(data * data, size=size) - means**2)
+
+    return data, means, variances
+
+
+def ssim_matrix(
+    stats1: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    stats2: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    data_range: float,
+    mask: Optional[np.ndarray] = None,
+    win_size: int = SSIM_WIN_SIZE,
+) -> np.ndarray:
+    """Pairwise SSIM between two stacks of images, given their `ssim_stats`.
+
+    Same as `structural_similarity` with its default (uniform filter)
+    settings. Only the covariances of the pairs are left to compute, for the
+    pairs selected by `mask` (the rest are 0).
+    """
+    data1, means1, vars1 = stats1
+    data2, means2, vars2 = stats2
+
+    dists = np.zeros((data1.shape[0], data2.shape[0]))
+    if mask is None:
+        mask = np.ones(dists.shape, dtype=bool)
+
+    size, cov_norm = _ssim_filter(data1.ndim - 1, win_size)
+    c1 = (0.01 * data_range) ** 2
+    c2 = (0.03 * data_range) ** 2
+
+    # to avoid edge effects will ignore filter radius strip around edges
+    pad = (win_size - 1) // 2
+    crop = (slice(None),) + (slice(pad, -pad or None),) * (data1.ndim - 1)
+
+    rows, cols = np.nonzero(mask)
+
+    step = _row_step(int(np.prod(data1.shape[1:])))
+    for start in range(0, rows.shape[0], step):
+        batch_rows = rows[start : start + step]
+        batch_cols = cols[start : start + step]
+
+        ux, uy = means1[batch_rows], means2[batch_cols]
+        vx, vy = vars1[batch_rows], vars2[batch_cols]
+
+        uxy = uniform_filter(data1[batch_rows] * data2[batch_cols], size=size)
+        vxy = cov_norm * (uxy - ux * uy)
+
+        ssim_map = ((2 * ux * uy + c1) * (2 * vxy + c2)) / (
+            (ux**2 + uy**2 + c1) * (vx + vy + c2)
+        )
+
+        dists[batch_rows, batch_cols] = (
+            ssim_map[crop].reshape(ssim_map.shape[0], -1).mean(axis=1)
+        )
+
+    return dists
+
+
 def ssim(data1: pd.Series, data2: pd.Series) -> float:
     data1_tmp = data1.to_numpy(copy=True)
     data2_tmp = data2.to_numpy(copy=True)
@@ -118,46 +215,480 @@ def cosine(data1: pd.Series, data2: pd.Series) -> float:
 
 
 def iou(data1: np.ndarray, data2: np.ndarray) -> float:
-    columns = data2.shape[1]
-
-    IoU: List[float] = []
-    for i in range(columns):
-        # Get column cells
-        column_gt = data1[:, i]
-        column_pred = data2[:, i]
-
-        # Get the rows whose value is grey
-        rows_gt = [i for i, _ in enumerate(column_gt) if _ == 127]
-        rows_pred = [i for i, _ in enumerate(column_pred) if _ == 127]
-
-        # determine the y-coordinates of the intersection rectangle
-        yA = max(min(rows_gt), min(rows_pred))
-        yB = min(max(rows_gt), max(rows_pred))
-
-        # compute the area of intersection rectangle
-        interArea = max((yB - yA), 0)
-        if interArea == 0:
-            IoU.append(0)
-            continue
-
-        # compute the area of both the prediction and ground-truth
-        # rectangles
-        boxGt = abs(max(rows_gt) - min(rows_gt))
-        boxPred = abs(max(rows_pred) - min(rows_pred))
-
-        # compute the intersection over union by taking the intersection
-        # area and dividing it by the sum of prediction + ground-truth
-        # areas - the intersection area
-        iou = interArea / float(boxGt + boxPred - interArea)
-        IoU.append(iou)
-
-    # return the intersection over union value
-    dist: float = sum(IoU) / len(IoU)
+    return float(iou_batch(data1, data2))
+
+
+def iou_batch(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Mean IoU of the grey (127) bands of the columns of two images, or of
+    two stacked batches of (..., H, W) images."""
+    return iou_from_bands(*iou_bands(data1), *iou_bands(data2))
+
+
+def iou_bands(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First and last grey row of each column of (..., H, W) images."""
+    grey = data == 127
+    if not grey.any(axis=-2).all():
+        raise ValueError("Every image column should contain a grey pixel.")
+
+    # argmax returns the first True of each column, and of the flipped
+    # columns for the last one.
+    first = np.argmax(grey, axis=-2)
+    last = grey.shape[-2] - 1 - np.argmax(grey[..., ::-1, :], axis=-2)
+
+    return first, last
+
+
+def iou_from_bands(
+    first1: np.ndarray,
+    last1: np.ndarray,
+    first2: np.ndarray,
+    last2: np.ndarray,
+) -> np.ndarray:
+    """Mean IoU over the last axis of two sets of (..., W) grey bands."""
+    # determine the y-coordinates of the intersection rectangles
+    y_a = np.maximum(first1, first2)
+    y_b = np.minimum(last1, last2)
+
+    # compute the area of the intersection rectangles
+    inter_area = np.maximum(y_b - y_a, 0)
+
+    # compute the intersection over union by taking the intersection
+    # area and dividing it by the sum of prediction + ground-truth
+    # areas - the intersection area
+    union_area = (last1 - first1) + (last2 - first2) - inter_area
+    ious = np.divide(
+        inter_area,
+        union_area,
+        out=np.zeros(inter_area.shape),
+        where=inter_area > 0,
+    )
+
+    dist: np.ndarray = ious.mean(axis=-1)
+
     return dist
 
 
+def iou_matrix(
+    bands1: Tuple[np.ndarray, np.ndarray],
+    bands2: Tuple[np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """Pairwise IoU between the (n, W) and (m, W) grey bands of two sets of
+    images (see `iou_bands`)."""
+    first1, last1 = bands1
+    first2, last2 = bands2
+
+    dists = np.empty((first1.shape[0], first2.shape[0]))
+
+    step = _row_step(first2.shape[0] * first1.shape[1])
+    for start in range(0, first1.shape[0], step):
+        stop = start + step
+        dists[start:stop] = iou_from_bands(
+            first1[start:stop, None, :],
+            last1[start:stop, None, :],
+            first2[None, :, :],
+            last2[None, :, :],
+        )
+
+    return dists
+
+
 def dtwl2(data1: pd.Series, data2: pd.Series) -> float:
     dist: float = 0.0
     dist, _ = fastdtw(data1, data2, dist=2)
 
     return dist
+
+
+def dtw(
+    data1: np.ndarray,
+    data2: np.ndarray,
+    window: Optional[int] = None,
+    max_dist: float = math.inf,
+) -> float:
+    """Exact DTW distance between two series.
+
+    Same local cost as `dtwl2` (the L2 norm of the difference of two samples),
+    but without fastdtw's approximation. See `dtw_batch` for the parameters.
+    """
+    dists = dtw_batch(
+        np.asarray(data1, dtype=np.float64).reshape(1, -1),
+        np.asarray(data2, dtype=np.float64).reshape(1, -1),
+        window=window,
+        max_dist=max_dist,
+    )
+
+    return float(dists[0])
+
+
+def dtw_matrix(
+    data1: np.ndarray,
+    data2: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    window: Optional[int] = None,
+) -> np.ndarray:
+    """Pairwise exact DTW distances between the rows of (n, T1) and (m, T2)
+    arrays. Only the pairs selected by `mask` are computed, the rest are 0."""
+    dists = np.zeros((data1.shape[0], data2.shape[0]))
+    if mask is None:
+        mask = np.ones(dists.shape, dtype=bool)
+
+    rows, cols = np.nonzero(mask)
+
+    step = _row_step(data1.shape[1] + data2.shape[1])
+    for start in range(0, rows.shape[0], step):
+        batch_rows = rows[start : start + step]
+        batch_cols = cols[start : start + step]
+
+        dists[batch_rows, batch_cols] = dtw_batch(
+            data1[batch_rows], data2[batch_cols], window=window
+        )
+
+    return dists
+
+
+def dtw_batch(
+    data1: np.ndarray,
+    data2: np.ndarray,
+    window: Optional[int] = None,
+    max_dist: float = math.inf,
+) -> np.ndarray:
+    """Exact DTW distances between the rows of (P, n) and (P, m) arrays.
+
+    The cost matrices of all P pairs are filled together, one anti-diagonal
+    (i + j = k) at a time, since each cell only depends on the two previous
+    anti-diagonals.
+
+    `window` is the radius of the Sakoe-Chiba band (it is widened to |n - m|
+    if needed so that the end of the series can be reached). Pairs whose
+    distance is bound to exceed `max_dist` are abandoned early and get `inf`.
+    """
+    p, n = data1.shape
+    m = data2.shape[1]
+
+    w = max(n, m) if window is None else max(window, abs(n - m))
+
+    # Anti-diagonals are indexed by i and shifted by one, so that index 0 is
+    # an `inf` border for the cells with i = 0.
+    buffers = [np.full((p, n + 1), np.inf) for _ in range(3)]
+    ranges = [(0, -1)] * 3
+
+    dists = np.full(p, np.inf)
+    active = np.arange(p)
+    for k in range(n + m - 1):
+        prev2, prev1, cur = buffers
+        range2, range1, _ = ranges
+
+        lo = max(0, k - m + 1, -((w - k) // 2))
+        hi = min(k, n - 1, (k + w) // 2)
+
+        # Reset the cells that the reused buffer held two diagonals ago.
+        cur[:, range2[0] + 1 : range2[1] + 2] = np.inf
+
+        cost = np.abs(
+            data1[:, lo : hi + 1] - data2[:, k - hi : k - lo + 1][:, ::-1]
+        )
+        if k == 0:
+            cur[:, 1] = cost[:, 0]
+        else:
+            acc = np.minimum(prev1[:, lo : hi + 1], prev1[:, lo + 1 : hi + 2])
+            np.minimum(acc, prev2[:, lo : hi + 1], out=acc)
+            cur[:, lo + 1 : hi + 2] = cost + acc
+
+        buffers = [prev1, cur, prev2]
+        ranges = [range1, (lo, hi), range2]
+
+        # Every warping path crosses diagonal k or k + 1, and the cost only
+        # grows along a path, so the minimum of these is a lower bound.
+        if max_dist < math.inf and k > 0:
+            bound = np.concatenate(
+                [
+                    prev1[:, range1[0] + 1 : range1[1] + 2],
+                    cur[:, lo + 1 : hi + 2],
+                ],
+                axis=1,
+            ).min(axis=1)
+            keep = bound <= max_dist
+            if not keep.all():
+                active = active[keep]
+                data1, data2 = data1[keep], data2[keep]
+                buffers = [buf[keep] for buf in buffers]
+
+                if active.shape[0] == 0:
+                    return dists
+
+    dists[active] = buffers[1][:, n]
+    dists[dists > max_dist] = np.inf
+
+    return dists
+
+
+def l1_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Pairwise L1 distances between the rows of (n, T) and (m, T) arrays."""
+    dists = np.empty((data1.shape[0], data2.shape[0]))
+
+    # Broadcast blocks of rows, so that the (rows, m, T) differences fit in
+    # the batch size.
+    step = _row_step(data2.shape[0] * data1.shape[1])
+    for start in range(0, data1.shape[0], step):
+        diff = data1[start : start + step, None, :] - data2[None, :, :]
+        np.abs(diff, out=diff)
+        dists[start : start + step] = diff.sum(axis=2)
+
+    return dists
+
+
+def l2_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Pairwise L2 distances between the rows of (n, T) and (m, T) arrays."""
+    dists: np.ndarray = np.sqrt(_sq_l2_matrix(data1, data2))
+
+    return dists
+
+
+def mae_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Pairwise MAE between the rows of (n, T) and (m, T) arrays."""
+    dists: np.ndarray = l1_matrix(data1, data2) / data1.shape[1]
+
+    return dists
+
+
+def mse_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Pairwise MSE between the rows of (n, T) and (m, T) arrays."""
+    dists: np.ndarray = _sq_l2_matrix(data1, data2) / data1.shape[1]
+
+    return dists
+
+
+def cosine_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    """Pairwise cosine distances between the rows of (n, T) and (m, T)
+    arrays."""
+    norms1 = np.linalg.norm(data1, axis=1)
+    norms2 = np.linalg.norm(data2, axis=1)
+
+    cosine_sim = (data1 @ data2.T) / np.outer(norms1, norms2)
+
+    dists: np.ndarray = 1 - cosine_sim
+
+    return dists
+
+
+def multi_metric_matrix(
+    data1: np.ndarray, data2: np.ndarray, metrics: List[str]
+) -> np.ndarray:
+    """Pairwise distances of several metrics between the rows of (n, T) and
+    (m, T) arrays.
+
+    The terms the metrics have in common (absolute differences, the matrix
+    product and the norms of the rows) are calculated once. Returns an
+    (n, m, len(metrics)) array.
+    """
+    unknown = set(metrics) - set(MULTI_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}!")
+
+    n_values = data1.shape[1]
+    dists: Dict[str, np.ndarray] = {}
+
+    if "l1" in metrics or "mae" in metrics:
+        dists["l1"] = l1_matrix(data1, data2)
+        dists["mae"] = dists["l1"] / n_values
+
+    if {"l2", "mse", "cosine"} & set(metrics):
+        sq_norms1 = np.einsum("ij,ij->i", data1, data1)
+        sq_norms2 = np.einsum("ij,ij->i", data2, data2)
+        dot = data1 @ data2.T
+
+        sq_dists = sq_norms1[:, None] + sq_norms2[None, :] - 2 * dot
+        np.maximum(sq_dists, 0, out=sq_dists)
+
+        dists["l2"] = np.sqrt(sq_dists)
+        dists["mse"] = sq_dists / n_values
+        dists["cosine"] = 1 - dot / np.sqrt(np.outer(sq_norms1, sq_norms2))
+
+    return np.stack([dists[metric] for metric in metrics], axis=-1)
+
+
+def dtw_envelope(
+    data: np.ndarray, window: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper LB_Keogh envelopes of the rows of an (n, T) array.
+
+    Each envelope point is the min/max of the series within the Sakoe-Chiba
+    `window` around it (the whole series if there is no window).
+    """
+    size = 2 * (data.shape[1] if window is None else window) + 1
+
+    lower = minimum_filter1d(data, size=size, axis=1, mode="nearest")
+    upper = maximum_filter1d(data, size=size, axis=1, mode="nearest")
+
+    return lower, upper
+
+
+def lb_kim(query: np.ndarray, data: np.ndarray) -> np.ndarray:
+    """LB_Kim lower bound of the DTW distances of a query to the rows of an
+    (n, T) array.
+
+    The first and the last points of two series are always matched to each
+    other, so their costs are part of every warping path.
+    """
+    bound: np.ndarray = np.abs(data[:, 0] - query[0])
+    if query.shape[0] > 1:
+        bound += np.abs(data[:, -1] - query[-1])
+
+    return bound
+
+
+def lb_keogh(
+    query: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> np.ndarray:
+    """LB_Keogh lower bound of the DTW distances of a query to the series
+    whose envelopes are given (see `dtw_envelope`).
+
+    Every query point is matched to some point within the window, so it costs
+    at least its distance from the envelope. All series must have the length
+    of the query.
+    """
+    above = np.maximum(query - upper, 0)
+    below = np.maximum(lower - query, 0)
+
+    bound: np.ndarray = np.sum(above + below, axis=-1)
+
+    return bound
+
+
+def sax_codes(words: np.ndarray) -> np.ndarray:
+    """Maps the letters of SAX words ('a', 'b', ...) to symbol indices."""
+    letters = np.ascontiguousarray(np.asarray(words).astype("U1"))
+    codes: np.ndarray = letters.view(np.uint32).astype(np.intp) - ord("a")
+
+    return codes
+
+
+def sax_dist_table(n_bins: int) -> np.ndarray:
+    """Returns the (n_bins, n_bins) MINDIST lookup table of symbol pairs.
+
+    The breakpoints are the quantiles of N(0, 1), as for SAX words of the
+    "normal" strategy. Adjacent symbols have a distance of 0, others the gap
+    between the breakpoints that separate them.
+    """
+    breakpoints = norm.ppf(np.arange(1, n_bins) / n_bins)
+
+    symbols = np.arange(n_bins)
+    low = np.minimum(symbols[:, None], symbols[None, :])
+    high = np.maximum(symbols[:, None], symbols[None, :])
+
+    # Clipped indices only matter where the symbols are adjacent anyway.
+    gaps = (
+        breakpoints[np.clip(high - 1, 0, n_bins - 2)]
+        - breakpoints[np.clip(low, 0, n_bins - 2)]
+    )
+    table: np.ndarray = np.where(high - low > 1, gaps, 0.0)
+
+    return table
+
+
+def sax_mindist(
+    codes1: np.ndarray,
+    codes2: np.ndarray,
+    table: np.ndarray,
+    series_length: Optional[float] = None,
+) -> float:
+    """MINDIST between two SAX words of the same length.
+
+    It lower bounds the Euclidean distance of the z-normalized series of
+    `series_length` values the words were created from (the word length
+    if they were not reduced with PAA).
+    """
+    n_segments = codes1.shape[-1]
+    scale = (series_length or n_segments) / n_segments
+
+    return float(np.sqrt(scale * np.sum(np.square(table[codes1, codes2]))))
+
+
+def sax_mindist_matrix(
+    codes1: np.ndarray,
+    codes2: np.ndarray,
+    table: np.ndarray,
+    series_length: Optional[float] = None,
+) -> np.ndarray:
+    """Pairwise MINDIST between the SAX words of (n, w) and (m, w) arrays."""
+    n_segments = codes1.shape[1]
+    scale = (series_length or n_segments) / n_segments
+    sq_table = np.square(table)
+
+    dists = np.empty((codes1.shape[0], codes2.shape[0]))
+    step = _row_step(codes2.shape[0] * n_segments)
+    for start in range(0, codes1.shape[0], step):
+        sq_dists = sq_table[codes1[start : start + step, None, :], codes2]
+        dists[start : start + step] = sq_dists.sum(axis=2)
+
+    mindists: np.ndarray = np.sqrt(scale * dists)
+
+    return mindists
+
+
+def _sq_l2_matrix(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    # |x - y|^2 = |x|^2 + |y|^2 - 2 x.y, where x.y comes from a single matrix
+    # product. Cancellation can make it slightly negative for (almost) equal
+    # rows, hence the clipping.
+    sq_norms1 = np.einsum("ij,ij->i", data1, data1)
+    sq_norms2 = np.einsum("ij,ij->i", data2, data2)
+
+    sq_dists: np.ndarray = (
+        sq_norms1[:, None] + sq_norms2[None, :] - 2 * (data1 @ data2.T)
+    )
+    np.maximum(sq_dists, 0, out=sq_dists)
+
+    return sq_dists
+
+
+def _ssim_filter(ndim: int, win_size: int) -> Tuple[Tuple[int, ...], float]:
+    # Filter each image of the stack on its own axes only, and use the sample
+    # covariance over the window.
+    size = (1,) + (win_size,) * ndim
+    n_px = win_size**ndim
+
+    return size, n_px / (n_px - 1)
+
+
+def _row_step(row_elems: int) -> int:
+    return max(1, MAX_BATCH_ELEMS // max(row_elems, 1))
+
+
+def _img_diff(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    # The difference of unsigned images wraps around, so it is taken in the
+    # smallest signed type that holds it (int16 for uint8) instead.
+    dtype = np.result_type(data1, data2)
+    if np.issubdtype(dtype, np.unsignedinteger):
+        dtype = np.promote_types(dtype, np.int8)
+
+    diff: np.ndarray = np.subtract(data1, data2, dtype=dtype)
+
+    return diff
+
+
+def _img_sq_sum(diff: np.ndarray) -> float:
+    # Squares of small types overflow (or lose precision), so they are taken
+    # in floating point; the sum is accumulated in float64 either way.
+    squares = np.square(diff, dtype=_img_float_type(diff))
+
+    return float(np.sum(squares, dtype=np.float64))
+
+
+def _img_float_type(data: np.ndarray) -> type:
+    # float32 keeps the precision of float32 data, as well as of the small
+    # integer types, whose values (and squares of uint8 differences) it
+    # represents exactly.
+    if data.dtype in (np.float16, np.float32, np.int8, np.uint8, np.int16):
+        return np.float32
+
+    return np.float64
+
+
+def _diff(data1: pd.Series, data2: pd.Series) -> np.ndarray:
+    # Like `zip`, only the common prefix of the two series is compared.
+    n = min(len(data1), len(data2))
+
+    arr1 = np.ascontiguousarray(data1, dtype=np.float64)[:n]
+    arr2 = np.ascontiguousarray(data2, dtype=np.float64)[:n]
+
+    return np.subtract(arr1, arr2)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+
+BLOCKS_PATTERN = "blocks-*.npz"
+
+
+def _write_atomic(path: Path, write: Callable[[Any], None]) -> None:
+    """Writes a file through a temporary file in the same dir that replaces
+    it only once it is complete, so that a crash never leaves a partial
+    file behind."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ComparatorCheckpoint:
+    """Checkpoint of the compared blocks of a comparison in a local dir.
+
+    The blocks are buffered and written to a new `blocks-<n>.npz` file at
+    most once every `interval` seconds. The manifest identifies the
+    comparison (comparator key, block size and ids), so that only a
+    checkpoint of the same comparison is resumed.
+    """
+
+    def __init__(self, checkpoint_dir: Path, key: str, interval: float):
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        self.checkpoint_dir = checkpoint_dir
+        self.key = key
+        self.interval = interval
+
+        self._pending: List[Tuple[int, int, np.ndarray, np.ndarray]] = []
+        self._last = time.monotonic()
+        self._next_idx = 0
+
+    @staticmethod
+    def get_key(comparator_key: str, block_size: int, ids: List[Any]) -> str:
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr(ids).encode())
+
+        return f"{comparator_key}|{block_size}|{hasher.hexdigest()}"
+
+    def restore(self) -> List[Tuple[int, int, np.ndarray, np.ndarray]]:
+        """Returns the (row, col, mask, values) of the checkpointed blocks.
+
+        Raises a ValueError if the checkpoint belongs to another comparison.
+        """
+        if not (self.checkpoint_dir / MANIFEST_FILE).exists():
+            self._write_manifest()
+            return []
+
+        self._check_key()
+
+        blocks = []
+        for path in self._get_block_files():
+            with np.load(path) as data:
+                for i in range(int(data["count"])):
+                    blocks.append(
+                        (
+                            int(data[f"row_{i}"]),
+                            int(data[f"col_{i}"]),
+                            data[f"mask_{i}"],
+                            data[f"values_{i}"],
+                        )
+                    )
+
+            self._next_idx = max(self._next_idx, _get_file_idx(path) + 1)
+
+        return blocks
+
+    def reset(self) -> None:
+        """Drops a previous checkpoint of the comparison to start over.
+
+        Raises a ValueError if the checkpoint belongs to another comparison,
+        which is left untouched.
+        """
+        if (self.checkpoint_dir / MANIFEST_FILE).exists():
+            self._check_key()
+
+        self.clear()
+        self._write_manifest()
+
+    def add(
+        self, row: int, col: int, mask: np.ndarray, values: np.ndarray
+    ) -> None:
+        self._pending.append((row, col, mask, values))
+
+        if time.monotonic() - self._last >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last = time.monotonic()
+        if not self._pending:
+            return
+
+        arrays: Dict[str, Any] = {"count": len(self._pending)}
+        for i, (row, col, mask, values) in enumerate(self._pending):
+            arrays[f"row_{i}"] = row
+            arrays[f"col_{i}"] = col
+            arrays[f"mask_{i}"] = mask
+            arrays[f"values_{i}"] = values
+
+        path = self.checkpoint_dir / f"blocks-{self._next_idx:06d}.npz"
+        _write_atomic(path, lambda file: np.savez(file, **arrays))
+
+        self._next_idx += 1
+        self._pending = []
+
+    def clear(self) -> None:
+        """Removes the checkpoint, e.g. once the comparison is complete."""
+        for path in self._get_block_files():
+            path.unlink()
+
+        (self.checkpoint_dir / MANIFEST_FILE).unlink(missing_ok=True)
+        self._pending = []
+        self._next_idx = 0
+
+    def _check_key(self) -> None:
+        manifest_path = self.checkpoint_dir / MANIFEST_FILE
+        manifest: Dict[str, Any] = json.loads(manifest_path.read_text())
+        if manifest["key"] != self.key:
+            raise ValueError(
+                f"{self.checkpoint_dir} is a checkpoint of another comparison!"
+            )
+
+    def _write_manifest(self) -> None:
+        manifest = json.dumps({"key": self.key}).encode()
+        _write_atomic(
+            self.checkpoint_dir / MANIFEST_FILE,
+            lambda file: file.write(manifest),
+        )
+
+    def _get_block_files(self) -> List[Path]:
+        return sorted(self.checkpoint_dir.glob(BLOCKS_PATTERN))
+
+
+def _get_file_idx(path: Path) -> int:
+    return int(path.stem.split("-")[1])
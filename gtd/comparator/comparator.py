@@ -1,109 +1,733 @@
+import math
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, Tuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
+import numpy as np
+from pydantic import PrivateAttr
 from pydantic.generics import GenericModel
 
+from gtd.comparator.cache import ComparatorCache, digest_array, item_digest
+from gtd.comparator.checkpoint import ComparatorCheckpoint
+from gtd.comparator.progress import ProgressReporter
+from gtd.instrumentation import instrument_methods
 from gtd.internal import (
     Fraction,
     FractionResult,
     Input,
     Job,
     JobResult,
+    MatrixPartialOutput,
     Output,
     PartialOutput,
     Result,
     Task,
     TaskResult,
 )
+from gtd.internal.output import AnyPartialOutput
+from gtd.internal.partial_result import PartialResult
 from gtd.internal.types import ValueT
 
+# Blocks that are made per worker if no block size is given, so that the
+# workers stay busy even if the blocks take different times. They are never
+# made smaller than MIN_BLOCK_SIZE items per side for it, though.
+BLOCKS_PER_WORKER = 4
+MIN_BLOCK_SIZE = 32
 
-class Comparator(GenericModel, ABC):
-    name: str
 
-    @abstractmethod
-    def compare(self, input_obj: Input, output_obj: Output) -> None:
-        pass
+class Block(NamedTuple):
+    row: int
+    col: int
+    mask: np.ndarray
 
-    @abstractmethod
-    def _init_output_structure(self, input_obj: Input) -> PartialOutput:
-        pass
+    def slice(self, items: List[Any]) -> Tuple[List[Any], List[Any]]:
+        rows, cols = self.mask.shape
+        return (
+            items[self.row : self.row + rows],
+            items[self.col : self.col + cols],
+        )
 
 
-class JobComparator(Comparator, Generic[ValueT]):
-    def compare(self, input_obj: Input, output_obj: Output) -> None:
-        partial_output = self._init_output_structure(input_obj)
+def _compare_block(
+    comparator: "Comparator",
+    items1: List[Any],
+    items2: List[Any],
+    mask: np.ndarray,
+) -> Optional[np.ndarray]:
+    return comparator._compare_block(items1, items2, mask)
 
-        for job1 in input_obj.get_jobs():
-            for job2 in input_obj.get_jobs():
-                if job1 == job2:
-                    continue
 
-                dist = self._compare(job1, job2)
+class Comparator(GenericModel, ABC):
+    name: str
 
-                partial_output.get_result_by_id(
-                    job1.id
-                ).get_partial_result_by_id(job2.id).value = dist
+    # Symmetric comparators satisfy `_compare(a, b) == _compare(b, a)`, so only
+    # one direction of every pair is calculated and mirrored to the other one.
+    symmetric: ClassVar[bool] = False
+
+    # Type of the sparse results of `compare_pairs`.
+    _result_class: ClassVar[Type[PartialResult]]
+
+    # The pair space is tiled into `block_size` x `block_size` blocks, which
+    # are compared in a pool of `workers` processes (in-process if 1). Unless
+    # it is given, the block size is chosen to make a few blocks per worker,
+    # of at most `max_block_size` items per side to bound their memory.
+    workers: int = 1
+    block_size: Optional[int] = None
+    max_block_size: ClassVar[int] = 256
+
+    # Pair values can be kept in an on-disk cache of at most `cache_size`
+    # bytes, so that only the pairs that are not in there are compared.
+    cache_dir: Optional[Path] = None
+    cache_size: int = 1 << 30
+
+    # The compared blocks can be checkpointed to `checkpoint_dir` at most once
+    # every `checkpoint_interval` seconds, so that a killed comparison can be
+    # continued with `resume` instead of starting over.
+    checkpoint_dir: Optional[Path] = None
+    checkpoint_interval: float = 60.0
+    resume: bool = False
+
+    # Reports the completed pairs as the blocks are merged, also when they are
+    # compared by workers.
+    progress: Optional[ProgressReporter] = None
+
+    # Input that is being compared and the matrices of the columns of its
+    # columnar store. They are not shipped to the workers, which only get the
+    # items of their blocks.
+    _input: Optional[Input] = PrivateAttr(default=None)
+    _matrices: Dict[str, Optional[np.ndarray]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    # Fields that only affect how the values are calculated, not the values.
+    _runtime_fields: ClassVar[Set[str]] = {
+        "name",
+        "workers",
+        "block_size",
+        "cache_dir",
+        "cache_size",
+        "checkpoint_dir",
+        "checkpoint_interval",
+        "resume",
+        "progress",
+    }
+
+    # Methods that are recorded while an `Instrumentation` is active, by
+    # whether their memory usage is tracked as well.
+    _instrumented: ClassVar[Dict[str, bool]] = {
+        "compare": True,
+        "compare_incremental": True,
+        "compare_pairs": True,
+        "_compare_block": False,
+        "_compare": False,
+    }
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, cls._instrumented)
 
+    def compare(self, input_obj: Input, output_obj: Output) -> None:
+        items = self._get_items(input_obj)
+        partial_output = self._init_output_structure(input_obj)
+
+        blocks = self._get_blocks(len(items))
+        with self._comparing(input_obj):
+            self._compare_into(items, blocks, partial_output)
+
+        self._store_output(output_obj, partial_output)
+
+    def compare_incremental(
+        self, input_obj: Input, output_obj: Output, new_ids: List[Any]
+    ) -> None:
+        """Extends the part of an earlier `compare` with new items in place.
+
+        Only the pairs that involve one of the `new_ids` are compared; all the
+        other items of `input_obj` must already be part of the output, and all
+        the items of the output must still be part of `input_obj`.
+        """
+        partial_output = self._load_output(output_obj)
+        if partial_output is None:
+            self.compare(input_obj, output_obj)
+            return
+
+        if not isinstance(partial_output, MatrixPartialOutput):
+            raise ValueError(f"{self.name} has no matrix output!")
+
+        items_by_id = {
+            self._get_id(item): item for item in self._get_items(input_obj)
+        }
+
+        old_ids = set(partial_output.ids)
+        added_ids = [id for id in new_ids if id not in old_ids]
+        unknown_ids = [id for id in added_ids if id not in items_by_id]
+        if unknown_ids:
+            raise ValueError(f"{unknown_ids} are not part of the input!")
+
+        missing_ids = items_by_id.keys() - old_ids - set(added_ids)
+        if missing_ids:
+            raise ValueError(f"{sorted(missing_ids)} are not in new_ids!")
+
+        removed_ids = [id for id in partial_output.ids if id not in items_by_id]
+        if removed_ids:
+            raise ValueError(f"{removed_ids} are no longer part of the input!")
+
+        n_old = len(partial_output.ids)
+        partial_output.add_ids(added_ids)
+        items = [items_by_id[id] for id in partial_output.ids]
+
+        # Only blocks that reach into the rows/columns of the new items are
+        # compared, and within them only the pairs with a new item.
+        is_new = np.arange(len(items)) >= n_old
+        blocks = []
+        for block in self._get_blocks(len(items)):
+            rows, cols = block.mask.shape
+            mask = block.mask & (
+                is_new[block.row : block.row + rows, None]
+                | is_new[None, block.col : block.col + cols]
+            )
+            if mask.any():
+                blocks.append(block._replace(mask=mask))
+
+        with self._comparing(input_obj):
+            self._compare_into(items, blocks, partial_output)
+        self._store_output(output_obj, partial_output)
+
+    def compare_pairs(
+        self,
+        input_obj: Input,
+        output_obj: Output,
+        pairs: List[Tuple[Any, Any]],
+    ) -> None:
+        """Compares only the given (baseline, compared) pairs of ids, e.g. the
+        candidate pairs of an index, and stores them in a sparse
+        `PartialOutput`.
+
+        For symmetric comparators each pair is stored in both directions.
+        """
+        items = self._get_items(input_obj)
+        ids = [self._get_id(item) for item in items]
+
+        # Pairs that share a baseline are compared as a single (1, m) block.
+        cols_by_row: Dict[int, Set[int]] = {}
+        for baseline, compared in pairs:
+            row = self._get_ordinal(input_obj, baseline)
+            col = self._get_ordinal(input_obj, compared)
+            if row == col:
+                continue
+            if self.symmetric and col < row:
+                row, col = col, row
+
+            cols_by_row.setdefault(row, set()).add(col)
+
+        if self.progress is not None:
+            self.progress.start(sum(map(len, cols_by_row.values())))
+
+        results: Dict[Any, Result] = {}
+        with self._comparing(input_obj):
+            for row, col_set in cols_by_row.items():
+                cols = sorted(col_set)
+                values = self._compare_block(
+                    [items[row]],
+                    [items[col] for col in cols],
+                    np.ones((1, len(cols)), dtype=bool),
+                )
+                assert values is not None
+
+                for col, value in zip(cols, values[0]):
+                    self._add_result(results, ids[row], ids[col], value)
+                    if self.symmetric:
+                        self._add_result(results, ids[col], ids[row], value)
+
+                if self.progress is not None:
+                    self.progress.advance(len(cols))
+
+        if self.progress is not None:
+            self.progress.finish()
+
+        output_obj.parts[self.name] = PartialOutput.construct(
+            name=self.name, results=results
+        )
+
+    def _add_result(
+        self,
+        results: Dict[Any, Result],
+        baseline: Any,
+        compared: Any,
+        value: Any,
+    ) -> None:
+        if baseline not in results:
+            results[baseline] = Result.construct(baseline=baseline, compared={})
+
+        value = value.tolist() if np.ndim(value) else float(value)
+        results[baseline].compared[compared] = self._result_class.construct(
+            id_=compared, value=value
+        )
+
+    def _store_output(
+        self, output_obj: Output, partial_output: MatrixPartialOutput
+    ) -> None:
         output_obj.parts[self.name] = partial_output
 
-    def _init_output_structure(self, input_obj: Input) -> PartialOutput:
-        results: Dict[int, Result] = {}
-        for job1 in input_obj.get_jobs():
+    @contextmanager
+    def _comparing(self, input_obj: Input) -> Iterator[None]:
+        self._input = input_obj
+        try:
+            yield
+        finally:
+            self._input = None
+            self._matrices = {}
+
+    def _load_output(self, output_obj: Output) -> Optional[AnyPartialOutput]:
+        return output_obj.parts.get(self.name)
+
+    def _compare_into(
+        self,
+        items: List[Any],
+        blocks: List[Block],
+        partial_output: MatrixPartialOutput,
+    ) -> None:
+        checkpoint = None
+        if self.checkpoint_dir is not None:
+            key = ComparatorCheckpoint.get_key(
+                self._cache_key(),
+                self._get_block_size(len(items)),
+                partial_output.ids,
+            )
+            checkpoint = ComparatorCheckpoint(
+                self.checkpoint_dir, key, self.checkpoint_interval
+            )
+            if self.resume:
+                blocks = self._restore_checkpoint(
+                    checkpoint, blocks, partial_output
+                )
+            else:
+                checkpoint.reset()
+
+        if self.cache_dir is None:
+            for block, values in self._compare_blocks(items, blocks):
+                self._merge_compared(partial_output, block, values, checkpoint)
+        else:
+            self._compare_cached(items, blocks, partial_output, checkpoint)
+
+        if checkpoint is not None:
+            checkpoint.clear()
+
+    def _restore_checkpoint(
+        self,
+        checkpoint: ComparatorCheckpoint,
+        blocks: List[Block],
+        partial_output: MatrixPartialOutput,
+    ) -> List[Block]:
+        """Merges the checkpointed blocks and returns the remaining blocks."""
+        done: Dict[Tuple[int, int], np.ndarray] = {}
+        for row, col, mask, values in checkpoint.restore():
+            self._merge_block(partial_output, Block(row, col, mask), values)
+
+            if (row, col) in done:
+                done[(row, col)] |= mask
+            else:
+                done[(row, col)] = mask.copy()
+
+        remaining = []
+        for block in blocks:
+            block_done = done.get((block.row, block.col))
+            if block_done is None:
+                remaining.append(block)
+                continue
+
+            mask = block.mask & ~block_done
+            if mask.any():
+                remaining.append(block._replace(mask=mask))
+
+        return remaining
+
+    def _merge_compared(
+        self,
+        partial_output: MatrixPartialOutput,
+        block: Block,
+        values: Optional[np.ndarray],
+        checkpoint: Optional[ComparatorCheckpoint],
+    ) -> None:
+        self._merge_block(partial_output, block, values)
+        if checkpoint is not None and values is not None:
+            checkpoint.add(block.row, block.col, block.mask, values)
+
+    def _compare_cached(
+        self,
+        items: List[Any],
+        blocks: List[Block],
+        partial_output: MatrixPartialOutput,
+        checkpoint: Optional[ComparatorCheckpoint],
+    ) -> None:
+        assert self.cache_dir is not None
+
+        digests = digest_array([item_digest(item) for item in items])
+        with ComparatorCache(self.cache_dir, self.cache_size) as cache:
+            comparator_id = cache.get_comparator_id(self._cache_key())
+            found = cache.load(
+                comparator_id, digests, partial_output, self.symmetric
+            )
 
-            compared: Dict[int, JobResult] = {}
-            for job2 in input_obj.get_jobs():
-                if job1 == job2:
+            missing_blocks = []
+            for block in blocks:
+                rows, cols = block.mask.shape
+                block_found = found[
+                    block.row : block.row + rows, block.col : block.col + cols
+                ]
+                mask = block.mask & ~block_found
+                if mask.any():
+                    missing_blocks.append(block._replace(mask=mask))
+
+            for block, values in self._compare_blocks(items, missing_blocks):
+                self._merge_compared(partial_output, block, values, checkpoint)
+                if values is not None:
+                    rows, cols = block.mask.shape
+                    cache.store(
+                        comparator_id,
+                        digests[block.row : block.row + rows],
+                        digests[block.col : block.col + cols],
+                        values,
+                        block.mask,
+                    )
+
+            cache.evict()
+
+    def _cache_key(self) -> str:
+        """Identifies the comparator class and the parameters of its values."""
+        cls = type(self)
+        params = self.json(exclude=self._runtime_fields, sort_keys=True)
+
+        return f"{cls.__module__}.{cls.__qualname__}:{params}"
+
+    def _init_output_structure(self, input_obj: Input) -> MatrixPartialOutput:
+        ids = [self._get_id(item) for item in self._get_items(input_obj)]
+
+        return MatrixPartialOutput.construct(name=self.name, ids=ids)
+
+    def _get_block_size(self, n: int) -> int:
+        if self.block_size is not None:
+            return self.block_size
+
+        if self.workers == 1:
+            return self.max_block_size
+
+        # Number of blocks per side that makes at least BLOCKS_PER_WORKER
+        # blocks per worker, counting only the upper triangle of symmetric
+        # comparators.
+        target = BLOCKS_PER_WORKER * self.workers
+        if self.symmetric:
+            sides = math.ceil((math.sqrt(8 * target + 1) - 1) / 2)
+        else:
+            sides = math.ceil(math.sqrt(target))
+
+        size = max(math.ceil(n / sides), MIN_BLOCK_SIZE)
+
+        return min(size, self.max_block_size)
+
+    def _get_blocks(self, n: int) -> List[Block]:
+        block_size = self._get_block_size(n)
+
+        blocks = []
+        for row in range(0, n, block_size):
+            for col in range(0, n, block_size):
+                if self.symmetric and col < row:
                     continue
 
-                compared[job2.id] = JobResult(id_=job2.id, value=0.0)
+                rows = min(block_size, n - row)
+                cols = min(block_size, n - col)
+
+                # Pairs of an item with itself are never compared, and for
+                # symmetric comparators only the upper triangle is needed.
+                mask = np.ones((rows, cols), dtype=bool)
+                if row == col and self.symmetric:
+                    mask = np.triu(mask, k=1)
+                elif row == col:
+                    np.fill_diagonal(mask, False)
+
+                if mask.any():
+                    blocks.append(Block(row=row, col=col, mask=mask))
+
+        return blocks
+
+    def _compare_blocks(
+        self, items: List[Any], blocks: List[Block]
+    ) -> Iterator[Tuple[Block, Optional[np.ndarray]]]:
+        progress = self.progress
+        if progress is None:
+            yield from self._run_blocks(items, blocks)
+            return
+
+        progress.start(sum(int(block.mask.sum()) for block in blocks))
+        for block, values in self._run_blocks(items, blocks):
+            progress.advance(int(block.mask.sum()))
+            yield block, values
+
+        progress.finish()
+
+    def _run_blocks(
+        self, items: List[Any], blocks: List[Block]
+    ) -> Iterator[Tuple[Block, Optional[np.ndarray]]]:
+        if self.workers == 1:
+            for block in blocks:
+                yield block, self._compare_block(
+                    *block.slice(items), block.mask
+                )
 
-            results[job1.id] = Result(baseline=job1.id, compared=compared)
+            return
+
+        # Only a bounded number of blocks is in flight at any time, so that the
+        # items shipped to the workers do not pile up in memory.
+        pending = iter(blocks)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures: Dict[Future, Block] = {}
+            while True:
+                for block in pending:
+                    future = executor.submit(
+                        _compare_block, self, *block.slice(items), block.mask
+                    )
+                    futures[future] = block
+                    if len(futures) >= 2 * self.workers:
+                        break
+
+                if not futures:
+                    return
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures.pop(future), future.result()
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # The reporter stays in the parent process, which tracks the blocks
+        # of the workers, and so does the compared input.
+        state: Dict[Any, Any] = super().__getstate__()
+        state["__dict__"] = {**state["__dict__"], "progress": None}
+        state["__private_attribute_values__"] = {
+            **state["__private_attribute_values__"],
+            "_input": None,
+            "_matrices": {},
+        }
+
+        return state
+
+    def _compare_block(
+        self, items1: List[Any], items2: List[Any], mask: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """Compares the pairs of a block that are selected by `mask`.
+
+        Returns an array of the block's shape (followed by the shape of the
+        values) whose unselected cells are left to zero.
+        """
+        values: Optional[np.ndarray] = None
+        for i, j in zip(*np.nonzero(mask)):
+            dist = self._compare(items1[i], items2[j])
+
+            if values is None:
+                values = np.zeros(mask.shape + np.shape(dist))
+            values[i, j] = dist
+
+        return values
+
+    def _merge_block(
+        self,
+        partial_output: MatrixPartialOutput,
+        block: Block,
+        values: Optional[np.ndarray],
+    ) -> None:
+        if values is None:
+            return
+
+        partial_output.set_block(block.row, block.col, values, block.mask)
+        if self.symmetric:
+            partial_output.set_block(
+                block.col, block.row, values.swapaxes(0, 1), block.mask.T
+            )
 
-        return PartialOutput(name=self.name, results=results)
+    @abstractmethod
+    def _get_items(self, input_obj: Input) -> List[Any]:
+        pass
 
     @abstractmethod
-    def _compare(self, job1: Job, job2: Job) -> ValueT:
+    def _get_id(self, item: Any) -> Any:
         pass
 
+    @abstractmethod
+    def _get_ordinal(self, input_obj: Input, id: Any) -> int:
+        """Returns the position of the item with `id` in `_get_items`."""
+        pass
 
-class TaskComparator(Comparator, Generic[ValueT]):
-    def compare(self, input_obj: Input, output_obj: Output) -> None:
-        partial_output = self._init_output_structure(input_obj)
+    @abstractmethod
+    def _compare(self, item1: Any, item2: Any) -> Any:
+        pass
 
-        for task1 in input_obj.get_tasks():
-            for task2 in input_obj.get_tasks():
-                if task1 == task2:
-                    continue
 
-                dist = self._compare(task1, task2)
+class JobComparator(Comparator, Generic[ValueT]):
+    _result_class = JobResult
 
-                partial_output.get_result_by_id(
-                    (task1.job_id, task1.idx)
-                ).get_partial_result_by_id(
-                    (task2.job_id, task2.idx)
-                ).value = dist
+    def _get_items(self, input_obj: Input) -> List[Job]:
+        return list(input_obj.get_jobs())
 
-        output_obj.parts[self.name] = partial_output
+    def _get_id(self, job: Job) -> int:
+        return job.id
 
-    def _init_output_structure(self, input_obj: Input) -> PartialOutput:
-        results: Dict[Tuple[int, int], Result] = {}
-        for task1 in input_obj.get_tasks():
+    def _get_ordinal(self, input_obj: Input, id: int) -> int:
+        return input_obj.get_job_ordinal(id)
 
-            compared: Dict[Tuple[int, int], TaskResult] = {}
-            for task2 in input_obj.get_tasks():
-                if task1 == task2:
-                    continue
+    @abstractmethod
+    def _compare(self, job1: Job, job2: Job) -> ValueT:
+        pass
 
-                compared[(task2.job_id, task2.idx)] = TaskResult(
-                    id_=(task2.job_id, task2.idx), value=0.0
-                )
 
-            results[(task1.job_id, task1.idx)] = Result(
-                baseline=(task1.job_id, task1.idx), compared=compared
+class TaskComparator(Comparator, Generic[ValueT]):
+    _result_class = TaskResult
+
+    def _get_items(self, input_obj: Input) -> List[Task]:
+        return list(input_obj.get_tasks())
+
+    def _get_id(self, task: Task) -> Tuple[int, int]:
+        return (task.job_id, task.idx)
+
+    def _get_ordinal(self, input_obj: Input, id: Tuple[int, int]) -> int:
+        return input_obj.get_task_ordinal(*id)
+
+    def _get_store_matrix(self, col: str) -> Optional[np.ndarray]:
+        """Returns `col` of all fractions of the compared input as an (n, T)
+        float64 array, if the input has a columnar store."""
+        input_obj = self._input
+        if input_obj is None or input_obj.get_columnar_store() is None:
+            return None
+
+        if col not in self._matrices:
+            try:
+                matrix = input_obj.as_matrix(col)
+            except ValueError:
+                self._matrices[col] = None
+            else:
+                self._matrices[col] = matrix.astype(np.float64, copy=False)
+
+        return self._matrices[col]
+
+    def _slice_store_matrix(
+        self, tasks: List[Task], col: str, fraction_idxs: List[int]
+    ) -> Optional[np.ndarray]:
+        """Takes the rows of the fractions of the tasks from the matrix of the
+        columnar store, as an (n, F, T) view if they are consecutive."""
+        matrix = self._get_store_matrix(col)
+        if matrix is None:
+            return None
+
+        assert self._input is not None
+        try:
+            rows = np.array(
+                [
+                    [
+                        self._input.get_fraction_ordinal(
+                            task.job_id, task.idx, i
+                        )
+                        for i in fraction_idxs
+                    ]
+                    for task in tasks
+                ],
+                dtype=np.int64,
+            )
+        except KeyError:
+            # Tasks that are not part of the input, e.g. a query.
+            return None
+
+        start = int(rows.flat[0])
+        if (rows.ravel() == np.arange(start, start + rows.size)).all():
+            return matrix[start : start + rows.size].reshape(
+                rows.shape + matrix.shape[1:]
             )
 
-        return PartialOutput(name=self.name, results=results)
+        return matrix[rows]
+
+    def _stack_col(
+        self, tasks: List[Task], col: str, fraction_idx: int = 0
+    ) -> np.ndarray:
+        """Stacks `col` of a fraction of each task in an (n, T) array.
+
+        If the compared input has a columnar store, this is a slice of its
+        matrix instead."""
+        data = self._slice_store_matrix(tasks, col, [fraction_idx])
+        if data is not None:
+            return data[:, 0]
+
+        return np.stack(
+            [
+                task.get_fraction_by_idx(fraction_idx)
+                .data[col]
+                .to_numpy(dtype=np.float64)
+                for task in tasks
+            ]
+        )
+
+    def _stack_fraction_cols(self, tasks: List[Task], col: str) -> np.ndarray:
+        """Stacks `col` of all fractions of each task in an (n, F, T) array."""
+        n_fractions = len(tasks[0].fractions)
+        if all(len(task.fractions) == n_fractions for task in tasks):
+            data = self._slice_store_matrix(
+                tasks, col, list(range(n_fractions))
+            )
+            if data is not None:
+                return data
+
+        return np.stack(
+            [
+                np.stack(
+                    [
+                        task.get_fraction_by_idx(i)
+                        .data[col]
+                        .to_numpy(dtype=np.float64)
+                        for i in range(len(task.fractions))
+                    ]
+                )
+                for task in tasks
+            ]
+        )
+
+    def _compare_fraction_cols(
+        self,
+        tasks1: List[Task],
+        tasks2: List[Task],
+        col: str,
+        calculator: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        """Applies a batched calculator to each fraction index of the tasks.
+
+        Returns an (n, m, F) array.
+        """
+        data1 = self._stack_fraction_cols(tasks1, col)
+        data2 = self._stack_fraction_cols(tasks2, col)
+
+        assert data1.shape[1] == data2.shape[1]
+
+        return np.stack(
+            [
+                calculator(data1[:, i], data2[:, i])
+                for i in range(data1.shape[1])
+            ],
+            axis=-1,
+        )
 
     @abstractmethod
     def _compare(self, task1: Task, task2: Task) -> ValueT:
@@ -111,42 +735,16 @@ class TaskComparator(Comparator, Generic[ValueT]):
 
 
 class FractionComparator(Comparator, Generic[ValueT]):
-    def compare(self, input_obj: Input, output_obj: Output) -> None:
-        partial_output = self._init_output_structure(input_obj)
+    _result_class = FractionResult
 
-        for fr1 in input_obj.get_fractions():
-            for fr2 in input_obj.get_fractions():
-                if fr1 == fr2:
-                    continue
-
-                dist = self._compare(fr1, fr2)
+    def _get_items(self, input_obj: Input) -> List[Fraction]:
+        return list(input_obj.get_fractions())
 
-                partial_output.get_result_by_id(
-                    (fr1.job_id, fr1.task_idx, fr1.idx)
-                ).get_partial_result_by_id(
-                    (fr2.job_id, fr2.task_idx, fr2.idx)
-                ).value = dist
-
-        output_obj.parts[self.name] = partial_output
-
-    def _init_output_structure(self, input_obj: Input) -> PartialOutput:
-        results: Dict[Tuple[int, int, int], Result] = {}
-        for fr1 in input_obj.get_fractions():
-
-            compared: Dict[Tuple[int, int, int], FractionResult] = {}
-            for fr2 in input_obj.get_fractions():
-                if fr1 == fr2:
-                    continue
-
-                compared[(fr2.job_id, fr2.task_idx, fr2.idx)] = FractionResult(
-                    id_=(fr2.job_id, fr2.task_idx, fr2.idx), value=0.0
-                )
-
-            results[(fr1.job_id, fr1.task_idx, fr1.idx)] = Result(
-                baseline=(fr1.job_id, fr1.task_idx, fr1.idx), compared=compared
-            )
+    def _get_id(self, fraction: Fraction) -> Tuple[int, int, int]:
+        return (fraction.job_id, fraction.task_idx, fraction.idx)
 
-        return PartialOutput(name=self.name, results=results)
+    def _get_ordinal(self, input_obj: Input, id: Tuple[int, int, int]) -> int:
+        return input_obj.get_fraction_ordinal(*id)
 
     @abstractmethod
     def _compare(self, fraction1: Fraction, fraction2: Fraction) -> ValueT:
@@ -1,12 +1,16 @@
 from typing import List
 
-from gtd.comparator.calculators import cosine
+import numpy as np
+
+from gtd.comparator.calculators import cosine, cosine_matrix
 from gtd.comparator.comparator import TaskComparator
 from gtd.internal import Task
 
 
 class CosineTaskComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -16,9 +20,18 @@ class CosineTaskComparator(TaskComparator):
 
         return cosine(data1[self.col], data2[self.col])
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return cosine_matrix(
+            self._stack_col(tasks1, self.col), self._stack_col(tasks2, self.col)
+        )
+
 
 class CosineTaskFractionComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
@@ -34,3 +47,10 @@ class CosineTaskFractionComparator(TaskComparator):
             dists.append(cosine(fr1.data[self.col], fr2.data[self.col]))
 
         return dists
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return self._compare_fraction_cols(
+            tasks1, tasks2, self.col, cosine_matrix
+        )
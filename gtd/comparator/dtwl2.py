@@ -1,12 +1,32 @@
-from typing import List
+from typing import List, Literal, Optional, Tuple
 
-from gtd.comparator.calculators import dtwl2
+import numpy as np
+
+from gtd.comparator.calculators import (
+    dtw,
+    dtw_batch,
+    dtw_envelope,
+    dtw_matrix,
+    dtwl2,
+    lb_keogh,
+    lb_kim,
+)
 from gtd.comparator.comparator import TaskComparator
-from gtd.internal import Task
+from gtd.internal import Input, Task
 
 
 class DTWL2TaskComparator(TaskComparator):
     col: str
+    # "fastdtw" approximates the distance, "exact" computes it with the built-in
+    # (banded, batched) DTW engine.
+    engine: Literal["fastdtw", "exact"] = "fastdtw"
+    window: Optional[int] = None
+
+    @property
+    def symmetric(self) -> bool:  # type: ignore[override]
+        # FastDTW's path search depends on the order of the series, so only
+        # the exact distance is symmetric.
+        return self.engine == "exact"
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -14,11 +34,145 @@ class DTWL2TaskComparator(TaskComparator):
 
         assert data1.shape[0] == data2.shape[0]
 
+        if self.engine == "exact":
+            return dtw(data1[self.col], data2[self.col], window=self.window)
+
         return dtwl2(data1[self.col], data2[self.col])
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> Optional[np.ndarray]:
+        if self.engine != "exact":
+            return super()._compare_block(tasks1, tasks2, mask)
+
+        return dtw_matrix(
+            self._stack_col(tasks1, self.col),
+            self._stack_col(tasks2, self.col),
+            mask=mask,
+            window=self.window,
+        )
+
+    def query(
+        self, input_obj: Input, task: Task, k: int
+    ) -> List[Tuple[Tuple[int, int], float]]:
+        """Finds the k tasks of the input that are the closest to `task`.
+
+        Returns their ids and (exact) DTW distances, closest first. The task
+        itself is skipped if it is part of the input.
+        """
+        tasks = self._get_items(input_obj)
+        with self._comparing(input_obj):
+            data = self._stack_col(tasks, self.col)
+            query = self._stack_col([task], self.col)[0]
+        lower, upper = dtw_envelope(data, self.window)
+
+        try:
+            own = input_obj.get_task_ordinal(task.job_id, task.idx)
+        except KeyError:
+            own = -1
+        positions = [i for i in range(len(tasks)) if i != own]
+
+        idxs, dists = self._knn(query, data, lower, upper, positions, k)
+
+        return [
+            (self._get_id(tasks[i]), float(dist))
+            for i, dist in zip(idxs, dists)
+        ]
+
+    def knn_matrix(
+        self, input_obj: Input, k: int
+    ) -> Tuple[List[Tuple[int, int]], np.ndarray, np.ndarray]:
+        """Finds the k nearest neighbours of every task of the input.
+
+        Returns the task ids and two (n, k) arrays with the positions (in the
+        ids) and the DTW distances of the neighbours of each task, closest
+        first. Tasks with fewer than k neighbours are padded with -1/inf.
+        """
+        tasks = self._get_items(input_obj)
+        with self._comparing(input_obj):
+            data = self._stack_col(tasks, self.col)
+        lower, upper = dtw_envelope(data, self.window)
+
+        n = len(tasks)
+        knn_idxs = np.full((n, k), -1, dtype=np.int64)
+        knn_dists = np.full((n, k), np.inf)
+        for i in range(n):
+            positions = [j for j in range(n) if j != i]
+
+            idxs, dists = self._knn(data[i], data, lower, upper, positions, k)
+
+            knn_idxs[i, : idxs.shape[0]] = idxs
+            knn_dists[i, : dists.shape[0]] = dists
+
+        return [self._get_id(task) for task in tasks], knn_idxs, knn_dists
+
+    def _knn(
+        self,
+        query: np.ndarray,
+        data: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        positions: List[int],
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = np.asarray(positions, dtype=np.int64)
+
+        assert data.shape[1] == query.shape[0]
+
+        # Cheap lower bounds of all candidates, used to visit the candidates
+        # from the most to the least promising one and to skip the ones that
+        # can't beat the current k-th distance.
+        query_lower, query_upper = dtw_envelope(query[None, :], self.window)
+        bounds = np.maximum.reduce(
+            [
+                lb_kim(query, data[candidates]),
+                lb_keogh(query, lower[candidates], upper[candidates]),
+                lb_keogh(data[candidates], query_lower, query_upper),
+            ]
+        )
+
+        order = np.argsort(bounds, kind="stable")
+        candidates, bounds = candidates[order], bounds[order]
+
+        best_idxs = np.empty(0, dtype=np.int64)
+        best_dists = np.empty(0)
+        threshold = np.inf
+
+        batch_size = max(k, 16)
+        for start in range(0, candidates.shape[0], batch_size):
+            batch = candidates[start : start + batch_size]
+            batch = batch[bounds[start : start + batch_size] <= threshold]
+            if batch.shape[0] == 0:
+                break
+
+            dists = dtw_batch(
+                np.broadcast_to(query, (batch.shape[0], query.shape[0])),
+                data[batch],
+                window=self.window,
+                max_dist=threshold,
+            )
+
+            best_idxs = np.concatenate([best_idxs, batch])
+            best_dists = np.concatenate([best_dists, dists])
+
+            top = np.argsort(best_dists, kind="stable")[:k]
+            top = top[np.isfinite(best_dists[top])]
+            best_idxs, best_dists = best_idxs[top], best_dists[top]
+
+            if best_dists.shape[0] == k:
+                threshold = best_dists[-1]
+
+        return best_idxs, best_dists
+
 
 class DTWL2TaskFractionComparator(TaskComparator):
     col: str
+    engine: Literal["fastdtw", "exact"] = "fastdtw"
+    window: Optional[int] = None
+
+    @property
+    def symmetric(self) -> bool:  # type: ignore[override]
+        return self.engine == "exact"
 
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
@@ -31,6 +185,28 @@ class DTWL2TaskFractionComparator(TaskComparator):
             fr1 = task1.get_fraction_by_idx(i)
             fr2 = task2.get_fraction_by_idx(i)
 
-            dists.append(dtwl2(fr1.data[self.col], fr2.data[self.col]))
+            if self.engine == "exact":
+                dist = dtw(
+                    fr1.data[self.col], fr2.data[self.col], window=self.window
+                )
+            else:
+                dist = dtwl2(fr1.data[self.col], fr2.data[self.col])
+
+            dists.append(dist)
 
         return dists
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> Optional[np.ndarray]:
+        if self.engine != "exact":
+            return super()._compare_block(tasks1, tasks2, mask)
+
+        return self._compare_fraction_cols(
+            tasks1,
+            tasks2,
+            self.col,
+            lambda data1, data2: dtw_matrix(
+                data1, data2, mask=mask, window=self.window
+            ),
+        )
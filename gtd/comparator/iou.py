@@ -1,11 +1,15 @@
 from typing import List
 
-from gtd.comparator.calculators import iou
+import numpy as np
+
+from gtd.comparator.calculators import iou, iou_bands, iou_matrix
 from gtd.comparator.comparator import TaskComparator
 from gtd.internal import Task
 
 
 class IoUTaskComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
         data2 = task2.get_fraction_by_idx(0).data
@@ -14,8 +18,24 @@ class IoUTaskComparator(TaskComparator):
 
         return iou(data1, data2)
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        # The grey band of each image is found once per block, so comparing
+        # a pair only costs O(W).
+        return iou_matrix(
+            iou_bands(
+                np.stack([t.get_fraction_by_idx(0).data for t in tasks1])
+            ),
+            iou_bands(
+                np.stack([t.get_fraction_by_idx(0).data for t in tasks2])
+            ),
+        )
+
 
 class IoUTaskFractionComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
@@ -30,3 +50,21 @@ class IoUTaskFractionComparator(TaskComparator):
             dists.append(iou(fr1.data, fr2.data))
 
         return dists
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        fractions_len = len(tasks1[0].get_fraction_idxs())
+
+        dists = []
+        for i in range(fractions_len):
+            bands1 = iou_bands(
+                np.stack([t.get_fraction_by_idx(i).data for t in tasks1])
+            )
+            bands2 = iou_bands(
+                np.stack([t.get_fraction_by_idx(i).data for t in tasks2])
+            )
+
+            dists.append(iou_matrix(bands1, bands2))
+
+        return np.stack(dists, axis=-1)
@@ -2,13 +2,15 @@ from typing import List
 
 import numpy as np
 
-from gtd.comparator.calculators import l2, l2_img
+from gtd.comparator.calculators import l2, l2_img, l2_matrix
 from gtd.comparator.comparator import TaskComparator
 from gtd.internal import Task
 
 
 class L2TaskComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -18,8 +20,17 @@ class L2TaskComparator(TaskComparator):
 
         return l2(data1[self.col], data2[self.col])
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return l2_matrix(
+            self._stack_col(tasks1, self.col), self._stack_col(tasks2, self.col)
+        )
+
 
 class L2ImageTaskComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
         data2 = task2.get_fraction_by_idx(0).data
@@ -31,6 +42,8 @@ class L2ImageTaskComparator(TaskComparator):
 
 class L2TaskFractionComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
@@ -47,8 +60,15 @@ class L2TaskFractionComparator(TaskComparator):
 
         return dists
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return self._compare_fraction_cols(tasks1, tasks2, self.col, l2_matrix)
+
 
 class L2ImageTaskFractionComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
@@ -66,6 +86,8 @@ class L2ImageTaskFractionComparator(TaskComparator):
 
 
 class L2ImageTaskFractionComparatorV2(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
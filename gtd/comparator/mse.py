@@ -1,12 +1,16 @@
 from typing import List
 
-from gtd.comparator.calculators import mse, mse_img
+import numpy as np
+
+from gtd.comparator.calculators import mse, mse_img, mse_matrix
 from gtd.comparator.comparator import TaskComparator
 from gtd.internal import Task
 
 
 class MSETaskComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -16,8 +20,17 @@ class MSETaskComparator(TaskComparator):
 
         return mse(data1[self.col], data2[self.col])
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return mse_matrix(
+            self._stack_col(tasks1, self.col), self._stack_col(tasks2, self.col)
+        )
+
 
 class MSEImageTaskComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
         data2 = task2.get_fraction_by_idx(0).data
@@ -29,6 +42,8 @@ class MSEImageTaskComparator(TaskComparator):
 
 class MSETaskFractionComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
@@ -45,8 +60,15 @@ class MSETaskFractionComparator(TaskComparator):
 
         return dists
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return self._compare_fraction_cols(tasks1, tasks2, self.col, mse_matrix)
+
 
 class MSEImageTaskFractionComparator(TaskComparator):
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
@@ -0,0 +1,107 @@
+from typing import Callable, Dict, List, Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+from gtd.comparator.calculators import (
+    cosine,
+    l1,
+    l2,
+    mae,
+    mse,
+    multi_metric_matrix,
+)
+from gtd.comparator.comparator import TaskComparator
+from gtd.internal import MatrixPartialOutput, Output, Task
+from gtd.internal.output import AnyPartialOutput
+
+Metric = Literal["l1", "l2", "mae", "mse", "cosine"]
+
+CALCULATORS: Dict[str, Callable[[pd.Series, pd.Series], float]] = {
+    "l1": l1,
+    "l2": l2,
+    "mae": mae,
+    "mse": mse,
+    "cosine": cosine,
+}
+
+
+class MultiMetricTaskComparator(TaskComparator):
+    """Compares `col` of the tasks with several metrics in a single pass.
+
+    The values of each metric are stored in their own part of the output,
+    named `<name>_<metric>`.
+    """
+
+    col: str
+    metrics: List[Metric]
+    max_block_size = 2048
+    symmetric = True
+
+    def get_part_name(self, metric: str) -> str:
+        return f"{self.name}_{metric}"
+
+    def _compare(self, task1: Task, task2: Task) -> List[float]:
+        data1 = task1.get_fraction_by_idx(0).data
+        data2 = task2.get_fraction_by_idx(0).data
+
+        assert data1.shape[0] == data2.shape[0]
+
+        return [
+            CALCULATORS[metric](data1[self.col], data2[self.col])
+            for metric in self.metrics
+        ]
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return multi_metric_matrix(
+            self._stack_col(tasks1, self.col),
+            self._stack_col(tasks2, self.col),
+            list(self.metrics),
+        )
+
+    def _store_output(
+        self, output_obj: Output, partial_output: MatrixPartialOutput
+    ) -> None:
+        for k, metric in enumerate(self.metrics):
+            name = self.get_part_name(metric)
+            output_obj.parts[name] = MatrixPartialOutput.construct(
+                name=name,
+                ids=list(partial_output.ids),
+                values=(
+                    None
+                    if partial_output.values is None
+                    else np.ascontiguousarray(partial_output.values[..., k])
+                ),
+            )
+
+    def _load_output(self, output_obj: Output) -> Optional[AnyPartialOutput]:
+        parts = [
+            output_obj.parts.get(self.get_part_name(metric))
+            for metric in self.metrics
+        ]
+        if any(part is None for part in parts):
+            return None
+
+        matrix_parts: List[MatrixPartialOutput] = []
+        for part in parts:
+            if not isinstance(part, MatrixPartialOutput):
+                raise ValueError(f"{self.name} has no matrix output!")
+
+            matrix_parts.append(part)
+
+        ids = matrix_parts[0].ids
+        if any(part.ids != ids for part in matrix_parts):
+            raise ValueError(f"The parts of {self.name} have different ids!")
+
+        part_values = [
+            part.values for part in matrix_parts if part.values is not None
+        ]
+        values = None
+        if len(part_values) == len(matrix_parts):
+            values = np.stack(part_values, axis=-1)
+
+        return MatrixPartialOutput.construct(
+            name=self.name, ids=list(ids), values=values
+        )
@@ -0,0 +1,109 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, NamedTuple, Optional
+
+from pydantic import BaseModel, PrivateAttr
+
+
+class Progress(NamedTuple):
+    completed: int
+    total: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Completed pairs per second."""
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until all pairs are completed."""
+        if self.completed == 0:
+            return None
+
+        return (self.total - self.completed) / self.rate
+
+    def format(self) -> str:
+        percent = 100 * self.completed / self.total if self.total else 100.0
+        eta = "?" if self.eta is None else _format_seconds(self.eta)
+
+        return (
+            f"{self.completed}/{self.total} pairs ({percent:.1f}%) "
+            f"{self.rate:.1f} pairs/s, "
+            f"elapsed {_format_seconds(self.elapsed)}, eta {eta}"
+        )
+
+
+class ProgressReporter(BaseModel, ABC):
+    """Reports the progress of a comparison, at most once every `interval`
+    seconds and once it is finished."""
+
+    interval: float = 1.0
+
+    _total: int = PrivateAttr(default=0)
+    _completed: int = PrivateAttr(default=0)
+    _start: float = PrivateAttr(default=0.0)
+    _last: float = PrivateAttr(default=0.0)
+
+    def start(self, total: int) -> None:
+        self._total = total
+        self._completed = 0
+        self._start = self._last = time.monotonic()
+
+    def advance(self, completed: int) -> None:
+        self._completed += completed
+
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._report(self._get_progress(now), final=False)
+
+    def finish(self) -> None:
+        self._report(self._get_progress(time.monotonic()), final=True)
+
+    def _get_progress(self, now: float) -> Progress:
+        return Progress(
+            completed=self._completed,
+            total=self._total,
+            elapsed=now - self._start,
+        )
+
+    @abstractmethod
+    def _report(self, progress: Progress, final: bool) -> None:
+        pass
+
+
+class TextProgressReporter(ProgressReporter):
+    """Writes the progress to stderr.
+
+    In terminals and notebooks the progress is updated in place, elsewhere
+    (e.g. in log files) every report is written to its own line.
+    """
+
+    def _report(self, progress: Progress, final: bool) -> None:
+        stream = sys.stderr
+        in_place = stream.isatty() or "ipykernel" in sys.modules
+
+        if in_place:
+            end = "\n" if final else ""
+            stream.write(f"\r{progress.format()}{end}")
+        else:
+            stream.write(f"{progress.format()}\n")
+        stream.flush()
+
+
+class CallbackProgressReporter(ProgressReporter):
+    """Hands the progress to a callback, e.g. to update a progress bar."""
+
+    callback: Callable[[Progress], None]
+
+    def _report(self, progress: Progress, final: bool) -> None:
+        self.callback(progress)
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
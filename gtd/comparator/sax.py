@@ -0,0 +1,101 @@
+from typing import List, Optional
+
+import numpy as np
+
+from gtd.comparator.calculators import (
+    sax_codes,
+    sax_dist_table,
+    sax_mindist,
+    sax_mindist_matrix,
+)
+from gtd.comparator.comparator import TaskComparator
+from gtd.internal import Task
+
+
+class SAXMinDistTaskComparator(TaskComparator):
+    """MINDIST between the SAX words of the tasks.
+
+    Expects the words of `TaskSAXCreator` with the "normal" strategy and the
+    same `n_bins`. MINDIST lower bounds the Euclidean distance of the
+    z-normalized series, so it can filter pairs ahead of an exact comparator.
+    `series_length` is the length of the series before PAA, if any.
+    """
+
+    n_bins: int
+    series_length: Optional[int] = None
+    max_block_size = 2048
+    symmetric = True
+
+    def _compare(self, task1: Task, task2: Task) -> float:
+        codes1 = sax_codes(task1.get_fraction_by_idx(0).data).ravel()
+        codes2 = sax_codes(task2.get_fraction_by_idx(0).data).ravel()
+
+        assert codes1.shape == codes2.shape
+
+        return sax_mindist(
+            codes1, codes2, sax_dist_table(self.n_bins), self.series_length
+        )
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return sax_mindist_matrix(
+            _stack_codes(tasks1),
+            _stack_codes(tasks2),
+            sax_dist_table(self.n_bins),
+            self.series_length,
+        )
+
+
+class SAXMinDistTaskFractionComparator(TaskComparator):
+    """Per fraction MINDIST between the SAX words of `FractionSAXCreator`."""
+
+    n_bins: int
+    series_length: Optional[int] = None
+    max_block_size = 2048
+    symmetric = True
+
+    def _compare(self, task1: Task, task2: Task) -> List[float]:
+        fractions1_len = len(task1.get_fraction_idxs())
+        fractions2_len = len(task2.get_fraction_idxs())
+
+        assert fractions1_len == fractions2_len
+
+        table = sax_dist_table(self.n_bins)
+
+        dists = []
+        for i in range(fractions1_len):
+            codes1 = sax_codes(task1.get_fraction_by_idx(i).data).ravel()
+            codes2 = sax_codes(task2.get_fraction_by_idx(i).data).ravel()
+
+            dists.append(sax_mindist(codes1, codes2, table, self.series_length))
+
+        return dists
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        table = sax_dist_table(self.n_bins)
+
+        n_fractions = len(tasks1[0].fractions)
+        return np.stack(
+            [
+                sax_mindist_matrix(
+                    _stack_codes(tasks1, i),
+                    _stack_codes(tasks2, i),
+                    table,
+                    self.series_length,
+                )
+                for i in range(n_fractions)
+            ],
+            axis=-1,
+        )
+
+
+def _stack_codes(tasks: List[Task], fraction_idx: int = 0) -> np.ndarray:
+    return np.stack(
+        [
+            sax_codes(task.get_fraction_by_idx(fraction_idx).data).ravel()
+            for task in tasks
+        ]
+    )
@@ -2,13 +2,23 @@ from typing import List
 
 import numpy as np
 
-from gtd.comparator.calculators import sdsim, sdsim_img, ssim, ssim_img
+from gtd.comparator.calculators import (
+    sdsim,
+    sdsim_img,
+    ssim,
+    ssim_data_range,
+    ssim_img,
+    ssim_matrix,
+    ssim_stats,
+)
 from gtd.comparator.comparator import TaskComparator
 from gtd.internal import Task
 
 
 class SSIMTaskComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -18,8 +28,20 @@ class SSIMTaskComparator(TaskComparator):
 
         return ssim(data1[self.col], data2[self.col])
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return _ssim_block(
+            self._stack_col(tasks1, self.col),
+            self._stack_col(tasks2, self.col),
+            mask,
+        )
+
 
 class SSIMImageTaskComparator(TaskComparator):
+    max_block_size = 64
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
         data2 = task2.get_fraction_by_idx(0).data
@@ -28,9 +50,19 @@ class SSIMImageTaskComparator(TaskComparator):
 
         return ssim_img(data1, data2)
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        return _ssim_block(
+            np.stack([t.get_fraction_by_idx(0).data for t in tasks1]),
+            np.stack([t.get_fraction_by_idx(0).data for t in tasks2]),
+            mask,
+        )
+
 
 class SSIMTaskFractionComparator(TaskComparator):
     col: str
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
@@ -49,6 +81,9 @@ class SSIMTaskFractionComparator(TaskComparator):
 
 
 class SSIMImageTaskFractionComparator(TaskComparator):
+    max_block_size = 64
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> List[float]:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
@@ -64,8 +99,28 @@ class SSIMImageTaskFractionComparator(TaskComparator):
 
         return dists
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        fractions_len = len(tasks1[0].get_fraction_idxs())
+
+        dists = []
+        for i in range(fractions_len):
+            dists.append(
+                _ssim_block(
+                    np.stack([t.get_fraction_by_idx(i).data for t in tasks1]),
+                    np.stack([t.get_fraction_by_idx(i).data for t in tasks2]),
+                    mask,
+                )
+            )
+
+        return np.stack(dists, axis=-1)
+
 
 class SDSIMImageTaskFractionComparator(TaskComparator):
+    max_block_size = 64
+    symmetric = True
+
     def _compare(self, task1: Task, task2: Task) -> float:
         fractions1_len = len(task1.get_fraction_idxs())
         fractions2_len = len(task2.get_fraction_idxs())
@@ -84,9 +139,30 @@ class SDSIMImageTaskFractionComparator(TaskComparator):
 
         return sdsim_img(task_data1, task_data2)
 
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        data1 = np.stack([self._concat_fractions(t) for t in tasks1])
+        data2 = np.stack([self._concat_fractions(t) for t in tasks2])
+
+        dists: np.ndarray = 1 - _ssim_block(data1, data2, mask)
+
+        return dists
+
+    def _concat_fractions(self, task: Task) -> np.ndarray:
+        return np.concatenate(
+            [
+                task.get_fraction_by_idx(i).data
+                for i in range(len(task.get_fraction_idxs()))
+            ],
+            axis=1,
+        )
+
 
 class SDSIMTaskComparator(TaskComparator):
     col: str
+    max_block_size = 2048
+    symmetric = True
 
     def _compare(self, task1: Task, task2: Task) -> float:
         data1 = task1.get_fraction_by_idx(0).data
@@ -95,3 +171,24 @@ class SDSIMTaskComparator(TaskComparator):
         assert data1.shape[0] == data2.shape[0]
 
         return sdsim(data1[self.col], data2[self.col])
+
+    def _compare_block(
+        self, tasks1: List[Task], tasks2: List[Task], mask: np.ndarray
+    ) -> np.ndarray:
+        dists: np.ndarray = 1 - _ssim_block(
+            self._stack_col(tasks1, self.col),
+            self._stack_col(tasks2, self.col),
+            mask,
+        )
+
+        return dists
+
+
+def _ssim_block(
+    data1: np.ndarray, data2: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    # The local means and variances of each image are computed once for the
+    # whole block, so that only the covariances are left to compute per pair.
+    return ssim_matrix(
+        ssim_stats(data1), ssim_stats(data2), ssim_data_range(data1), mask=mask
+    )
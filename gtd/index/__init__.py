@@ -0,0 +1,9 @@
+from .bucket_join import BucketJoin
+from .lsh import LSHIndex
+from .sax_index import SAXIndex
+
+__all__ = [
+    "BucketJoin",
+    "LSHIndex",
+    "SAXIndex",
+]
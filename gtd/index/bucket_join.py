@@ -0,0 +1,52 @@
+from typing import Any, Dict, Hashable, List, Literal, Set, Tuple
+
+from pydantic import BaseModel, PrivateAttr
+
+from gtd.internal import Input
+
+
+class BucketJoin(BaseModel):
+    """Groups the items of an input that share a bucket key.
+
+    The data of each fraction is a list of bucket keys, e.g. the output of
+    `FractionFingerprintGenerator` in "hash" mode. At task level, a task is
+    part of the buckets of all its fractions. Only the pairs within a
+    bucket are candidates for an (exact) comparator.
+    """
+
+    level: Literal["task", "fraction"] = "task"
+
+    _buckets: Dict[Hashable, List[Any]] = PrivateAttr(default_factory=dict)
+
+    @property
+    def buckets(self) -> Dict[Hashable, List[Any]]:
+        return self._buckets
+
+    def build(self, input_obj: Input) -> "BucketJoin":
+        self._buckets = {}
+        for fraction in input_obj.get_fractions():
+            if self.level == "task":
+                id: Any = (fraction.job_id, fraction.task_idx)
+            else:
+                id = (fraction.job_id, fraction.task_idx, fraction.idx)
+
+            for key in fraction.data:
+                bucket = self._buckets.setdefault(key, [])
+                if not bucket or bucket[-1] != id:
+                    bucket.append(id)
+
+        return self
+
+    def get_bucket_sizes(self) -> Dict[Hashable, int]:
+        return {key: len(ids) for key, ids in self._buckets.items()}
+
+    def candidate_pairs(self) -> List[Tuple[Any, Any]]:
+        """Returns the unique pairs of ids that share at least one bucket."""
+        pairs: Set[Tuple[Any, Any]] = set()
+        for ids in self._buckets.values():
+            unique_ids = sorted(set(ids))
+            for i, id1 in enumerate(unique_ids):
+                for id2 in unique_ids[i + 1 :]:
+                    pairs.add((id1, id2))
+
+        return sorted(pairs)
@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from gtd.internal import Input
+
+
+class LSHIndex(BaseModel):
+    """Locality sensitive hashing index over the feature vectors of an input.
+
+    The data of each task (or fraction) is flattened to a vector, e.g. the
+    output of the ROCKET, RWS or fingerprint preprocessors. Every one of the
+    `n_tables` hash tables keys a vector by `n_hashes` hash functions:
+
+    - "pstable": floor((a.x + b) / bucket_width) with a Gaussian `a`, which
+      preserves Euclidean distances.
+    - "hyperplane": the side of a random hyperplane, i.e. sign(a.x), which
+      preserves cosine distances.
+
+    More hashes per table make the buckets more selective, more tables make
+    it more likely for close vectors to share at least one bucket.
+    """
+
+    level: Literal["task", "fraction"] = "task"
+    family: Literal["pstable", "hyperplane"] = "pstable"
+    n_tables: int = 8
+    n_hashes: int = 8
+    bucket_width: float = 4.0
+    random_state: int = 42
+
+    _ids: List[Any] = PrivateAttr(default_factory=list)
+    _vectors: Optional[np.ndarray] = PrivateAttr(default=None)
+    _projections: Optional[np.ndarray] = PrivateAttr(default=None)
+    _offsets: Optional[np.ndarray] = PrivateAttr(default=None)
+    _tables: List[Dict[bytes, np.ndarray]] = PrivateAttr(default_factory=list)
+
+    def build(self, input_obj: Input) -> "LSHIndex":
+        if self.level == "task":
+            ids: List[Any] = input_obj.get_task_uids()
+            items = [
+                np.concatenate(
+                    [
+                        np.ravel(fraction.data).astype(np.float64)
+                        for fraction in task.get_fractions()
+                    ]
+                )
+                for task in input_obj.get_tasks()
+            ]
+        else:
+            ids = input_obj.get_fraction_uuids()
+            items = [
+                np.ravel(fraction.data).astype(np.float64)
+                for fraction in input_obj.get_fractions()
+            ]
+
+        if len({item.shape for item in items}) > 1:
+            raise ValueError("All vectors must have the same length!")
+
+        return self.build_from_vectors(ids, np.stack(items))
+
+    def build_from_vectors(
+        self, ids: List[Any], vectors: np.ndarray
+    ) -> "LSHIndex":
+        rng = np.random.default_rng(self.random_state)
+
+        self._ids = list(ids)
+        self._vectors = np.asarray(vectors, dtype=np.float64)
+        self._projections = rng.standard_normal(
+            (self.n_tables, self.n_hashes, self._vectors.shape[1])
+        )
+        self._offsets = rng.uniform(
+            0, self.bucket_width, (self.n_tables, self.n_hashes)
+        )
+
+        codes = self._hash(self._vectors)
+        self._tables = []
+        for table_codes in codes:
+            # Group the positions by their code, one bucket per unique code.
+            keys, inverse = np.unique(table_codes, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            order = np.argsort(inverse, kind="stable")
+            splits = np.cumsum(np.bincount(inverse))[:-1]
+
+            self._tables.append(
+                {
+                    key.tobytes(): positions
+                    for key, positions in zip(keys, np.split(order, splits))
+                }
+            )
+
+        return self
+
+    def query(self, vector: np.ndarray, k: int) -> List[Tuple[Any, float]]:
+        """Returns the (id, distance) of (approximately) the k nearest
+        vectors, closest first."""
+        positions, dists = self._query_candidates(vector)
+        order = np.argsort(dists, kind="stable")[:k]
+
+        return [(self._ids[positions[i]], float(dists[i])) for i in order]
+
+    def range_query(
+        self, vector: np.ndarray, radius: float
+    ) -> List[Tuple[Any, float]]:
+        """Returns the (id, distance) of (approximately) all vectors within
+        `radius`, closest first."""
+        positions, dists = self._query_candidates(vector)
+        order = np.argsort(dists, kind="stable")
+
+        return [
+            (self._ids[positions[i]], float(dists[i]))
+            for i in order
+            if dists[i] <= radius
+        ]
+
+    def candidate_pairs(self) -> List[Tuple[Any, Any]]:
+        """Returns the unique pairs of ids that share a bucket in at least one
+        of the tables, to be compared exactly by a comparator."""
+        n = len(self._ids)
+
+        pair_keys = []
+        for table in self._tables:
+            for positions in table.values():
+                if positions.shape[0] < 2:
+                    continue
+
+                rows, cols = np.triu_indices(positions.shape[0], k=1)
+                first = np.minimum(positions[rows], positions[cols])
+                second = np.maximum(positions[rows], positions[cols])
+                pair_keys.append(first.astype(np.int64) * n + second)
+
+        if not pair_keys:
+            return []
+
+        keys = np.unique(np.concatenate(pair_keys))
+
+        return [(self._ids[key // n], self._ids[key % n]) for key in keys]
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Returns the (n_tables, n, n_hashes) codes of (n, d) vectors."""
+        assert self._projections is not None and self._offsets is not None
+
+        projected = np.einsum("lkd,nd->lnk", self._projections, vectors)
+
+        codes: np.ndarray
+        if self.family == "hyperplane":
+            codes = (projected >= 0).astype(np.int8)
+        else:
+            codes = np.floor(
+                (projected + self._offsets[:, None, :]) / self.bucket_width
+            ).astype(np.int64)
+
+        return codes
+
+    def _query_candidates(
+        self, vector: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._vectors is None:
+            raise ValueError("The index has not been built!")
+
+        vector = np.ravel(vector).astype(np.float64)
+        codes = self._hash(vector[None, :])
+
+        found = [
+            table[table_codes[0].tobytes()]
+            for table, table_codes in zip(self._tables, codes)
+            if table_codes[0].tobytes() in table
+        ]
+        if not found:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        positions = np.unique(np.concatenate(found))
+        candidates = self._vectors[positions]
+
+        if self.family == "hyperplane":
+            norms = np.linalg.norm(candidates, axis=1) * np.linalg.norm(vector)
+            dists = 1 - (candidates @ vector) / norms
+        else:
+            dists = np.linalg.norm(candidates - vector, axis=1)
+
+        return positions, dists
@@ -0,0 +1,169 @@
+from typing import Any, List, Literal, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from gtd.comparator.calculators import (
+    sax_codes,
+    sax_dist_table,
+    sax_mindist_matrix,
+)
+from gtd.internal import Input
+
+
+class SAXIndex(BaseModel):
+    """Inverted index from the prefixes of SAX words to tasks (or fractions).
+
+    Expects the words of the SAX creators with the "normal" strategy. The
+    MINDIST of the first `prefix_length` symbols lower bounds the MINDIST of
+    the whole words, which in turn lower bounds the Euclidean distance of
+    the z-normalized series. Whole buckets of words are thus skipped without
+    looking at their members, and the results are a superset of the items
+    within the same Euclidean distance.
+    """
+
+    n_bins: int
+    level: Literal["task", "fraction"] = "task"
+    prefix_length: int = 4
+    series_length: Optional[int] = None
+
+    _ids: List[Any] = PrivateAttr(default_factory=list)
+    _codes: Optional[np.ndarray] = PrivateAttr(default=None)
+    _prefixes: Optional[np.ndarray] = PrivateAttr(default=None)
+    _buckets: List[np.ndarray] = PrivateAttr(default_factory=list)
+
+    def build(self, input_obj: Input) -> "SAXIndex":
+        if self.level == "task":
+            self._ids = input_obj.get_task_uids()
+            words = [
+                np.concatenate(
+                    [
+                        sax_codes(fraction.data).ravel()
+                        for fraction in task.get_fractions()
+                    ]
+                )
+                for task in input_obj.get_tasks()
+            ]
+        else:
+            self._ids = input_obj.get_fraction_uuids()
+            words = [
+                sax_codes(fraction.data).ravel()
+                for fraction in input_obj.get_fractions()
+            ]
+
+        if len({word.shape for word in words}) > 1:
+            raise ValueError("All SAX words must have the same length!")
+
+        self._codes = np.stack(words)
+
+        prefixes, inverse = np.unique(
+            self._codes[:, : self.prefix_length], axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        splits = np.cumsum(np.bincount(inverse))[:-1]
+
+        self._prefixes = prefixes
+        self._buckets = np.split(order, splits)
+
+        return self
+
+    def query(self, word: np.ndarray, k: int) -> List[Tuple[Any, float]]:
+        """Returns the (id, MINDIST) of the k words closest to `word`.
+
+        Buckets are visited in the order of their prefix MINDIST, until it
+        exceeds the k-th MINDIST found so far.
+        """
+        codes, bounds = self._prefix_bounds(word)
+
+        positions = np.empty(0, dtype=np.intp)
+        dists = np.empty(0)
+        for bucket in np.argsort(bounds, kind="stable"):
+            if positions.shape[0] >= k and bounds[bucket] > dists[k - 1]:
+                break
+
+            members = self._buckets[bucket]
+            positions = np.concatenate([positions, members])
+            dists = np.concatenate([dists, self._mindists(codes, members)])
+
+            order = np.argsort(dists, kind="stable")[:k]
+            positions, dists = positions[order], dists[order]
+
+        return [
+            (self._ids[pos], float(dist)) for pos, dist in zip(positions, dists)
+        ]
+
+    def range_query(
+        self, word: np.ndarray, radius: float
+    ) -> List[Tuple[Any, float]]:
+        """Returns the (id, MINDIST) of all words within `radius` of `word`,
+        closest first."""
+        codes, bounds = self._prefix_bounds(word)
+
+        results = []
+        for bucket in np.nonzero(bounds <= radius)[0]:
+            members = self._buckets[bucket]
+            dists = self._mindists(codes, members)
+            for pos, dist in zip(members, dists):
+                if dist <= radius:
+                    results.append((self._ids[pos], float(dist)))
+
+        return sorted(results, key=lambda result: result[1])
+
+    def candidate_pairs(self, radius: float) -> List[Tuple[Any, Any]]:
+        """Returns the pairs of ids whose MINDIST is within `radius`, to be
+        compared exactly (e.g. with `Comparator.compare_pairs`)."""
+        if self._prefixes is None or self._codes is None:
+            raise ValueError("The index has not been built!")
+
+        bounds = self._matrix(self._prefixes, self._prefixes)
+
+        pairs = []
+        for bucket1, bucket2 in zip(*np.nonzero(np.triu(bounds <= radius))):
+            members1 = self._buckets[bucket1]
+            members2 = self._buckets[bucket2]
+            dists = self._matrix(self._codes[members1], self._codes[members2])
+
+            within = dists <= radius
+            if bucket1 == bucket2:
+                within = np.triu(within, k=1)
+
+            for i, j in zip(*np.nonzero(within)):
+                pairs.append((self._ids[members1[i]], self._ids[members2[j]]))
+
+        return pairs
+
+    def _prefix_bounds(self, word: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self._prefixes is None:
+            raise ValueError("The index has not been built!")
+
+        codes = sax_codes(word).ravel()
+
+        bounds: np.ndarray = self._matrix(
+            codes[None, : self.prefix_length], self._prefixes
+        )[0]
+
+        return codes, bounds
+
+    def _mindists(self, codes: np.ndarray, members: np.ndarray) -> np.ndarray:
+        assert self._codes is not None
+
+        dists: np.ndarray = self._matrix(codes[None, :], self._codes[members])[
+            0
+        ]
+
+        return dists
+
+    def _matrix(self, codes1: np.ndarray, codes2: np.ndarray) -> np.ndarray:
+        assert self._codes is not None
+
+        # MINDIST scales by the ratio of the series to the whole word length,
+        # also when only a prefix of the words is compared.
+        word_length = self._codes.shape[1]
+        ratio = (self.series_length or word_length) / word_length
+
+        dists: np.ndarray = sax_mindist_matrix(
+            codes1, codes2, sax_dist_table(self.n_bins), ratio * codes1.shape[1]
+        )
+
+        return dists
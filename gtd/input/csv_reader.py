@@ -4,14 +4,38 @@ from typing import List, Optional
 import pandas as pd
 
 from gtd.input.input_reader import InputReader
+from gtd.internal import Input
+from gtd.internal.types import FloatDType
 
 
 class CsvReader(InputReader):
     columns: Optional[List[str]]
+    # Floating point columns are stored in this dtype, integer ones (e.g. the
+    # timestamps) are left alone.
+    dtype: FloatDType = "float64"
+    # The data of all fractions can be kept in a contiguous columnar store,
+    # see `Input.to_columnar`.
+    columnar: bool = False
 
     @property
     def filetype(self) -> str:
         return "csv"
 
+    def read_input(self) -> Input:
+        if self.columnar and self.lazy:
+            raise ValueError("A lazy input can't be columnar!")
+
+        input_obj = super().read_input()
+        if self.columnar:
+            input_obj.to_columnar()
+
+        return input_obj
+
     def _read_file(self, file: Path) -> pd.DataFrame:
-        return pd.read_csv(filepath_or_buffer=file, usecols=self.columns)
+        df = pd.read_csv(filepath_or_buffer=file, usecols=self.columns)
+
+        if self.dtype != "float64":
+            float_cols = df.select_dtypes(include="floating").columns
+            df = df.astype({col: self.dtype for col in float_cols})
+
+        return df
@@ -23,7 +23,7 @@ class InputFractionReader(InputReader):
             fraction_data = {}
             for fraction_file in fraction_files:
                 idx = fraction_file.stem
-                data = self._read_file(fraction_file)
+                data = self._read_data(fraction_file)
 
                 fraction_data[idx] = data
 
@@ -40,7 +40,7 @@ class InputFractionReader(InputReader):
         input_dict: Dict[str, Dict[str, Any]] = {}
         for task_file in task_files:
             job_id, task_idx, fraction_idx = task_file.stem.split("-")[:3]
-            data = self._read_file(task_file)
+            data = self._read_data(task_file)
 
             if job_id not in input_dict:
                 input_dict[job_id] = {}
@@ -23,7 +23,7 @@ class InputFullReader(InputReader):
             job_dict: Dict[str, Any] = {}
             for task_file in task_files:
                 task_idx = task_file.stem.split("-")[0]
-                data = self._read_file(task_file)
+                data = self._read_data(task_file)
 
                 job_dict[task_idx] = data
 
@@ -37,7 +37,7 @@ class InputFullReader(InputReader):
         input_dict: Dict[str, Dict[str, Any]] = {}
         for task_file in task_files:
             job_id, task_idx = task_file.stem.split("-")[:2]
-            data = self._read_file(task_file)
+            data = self._read_data(task_file)
 
             if job_id not in input_dict:
                 input_dict[job_id] = {}
@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
-from gtd.internal import Fraction, Input, Job, Task
+from gtd.internal import (
+    Fraction,
+    FractionCache,
+    Input,
+    Job,
+    LazyFraction,
+    Task,
+)
 
 
 class InputReader(BaseModel, ABC):
     input_dir: Path
+    # With `lazy`, only the structure is read from the listing of the input
+    # dir, and the data of each fraction is read on its first access. Once
+    # the read data exceeds `memory_budget` bytes, the least recently used
+    # data is evicted again.
+    lazy: bool = False
+    memory_budget: Optional[int] = None
 
     @property
     @abstractmethod
@@ -19,6 +32,10 @@ class InputReader(BaseModel, ABC):
         input_dict = self._read_input()
         return self._dict_to_input(input_dict)
 
+    def _read_data(self, file: Path) -> Any:
+        """Reads the data of a file, or defers it to a lazy fraction."""
+        return file if self.lazy else self._read_file(file)
+
     @abstractmethod
     def _read_input(self) -> Dict[str, Dict[str, Any]]:
         pass
@@ -28,6 +45,12 @@ class InputReader(BaseModel, ABC):
         pass
 
     def _dict_to_input(self, input_dict: Dict[str, Dict[str, Any]]) -> Input:
+        # The structure is built from already parsed ids, so the models are
+        # constructed without (re)validating every one of them.
+        cache = None
+        if self.lazy:
+            cache = FractionCache(self._read_file, self.memory_budget)
+
         jobs: Dict[int, Job] = {}
         for job_id_str, tasks_dict in input_dict.items():
             job_id = int(job_id_str)
@@ -41,27 +64,39 @@ class InputReader(BaseModel, ABC):
                     for fraction_idx_str, data in fractions_data.items():
                         fraction_idx = int(fraction_idx_str)
 
-                        fractions[fraction_idx] = Fraction(
-                            job_id=job_id,
-                            task_idx=task_idx,
-                            idx=fraction_idx,
-                            data=data,
+                        fractions[fraction_idx] = self._create_fraction(
+                            job_id, task_idx, fraction_idx, data, cache
                         )
                 else:
-                    fractions[0] = Fraction(
-                        job_id=job_id,
-                        task_idx=task_idx,
-                        idx=0,
-                        data=fractions_data,
+                    fractions[0] = self._create_fraction(
+                        job_id, task_idx, 0, fractions_data, cache
                     )
 
-                tasks[task_idx] = Task(
+                tasks[task_idx] = Task.construct(
                     job_id=job_id, idx=task_idx, fractions=fractions
                 )
 
-            jobs[job_id] = Job(id=job_id, tasks=tasks)
+            jobs[job_id] = Job.construct(id=job_id, tasks=tasks)
+
+        input_obj = Input.construct(jobs=jobs)
+        input_obj._fraction_cache = cache
+
+        return input_obj
+
+    def _create_fraction(
+        self,
+        job_id: int,
+        task_idx: int,
+        idx: int,
+        data: Any,
+        cache: Optional[FractionCache],
+    ) -> Fraction:
+        if cache is not None:
+            return LazyFraction.create(job_id, task_idx, idx, data, cache)
 
-        return Input(jobs=jobs)
+        return Fraction.construct(
+            job_id=job_id, task_idx=task_idx, idx=idx, data=data
+        )
 
     def _list_subdirs(self) -> List[Path]:
         return [x for x in self.input_dir.iterdir() if x.is_dir()]
@@ -0,0 +1,306 @@
+import functools
+import json
+import math
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Latencies are counted in log-spaced buckets, `HISTOGRAM_STEPS` per power of
+# two of nanoseconds, so that recording a call is O(1) in time and memory.
+HISTOGRAM_STEPS = 4
+
+_active: Optional["Instrumentation"] = None
+
+
+class StageStats:
+    """Aggregated measurements of all the calls of a stage."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram: Dict[int, int] = {}
+        self.rss_delta = 0
+        self.alloc_peak = 0
+
+    def add(self, duration: float) -> None:
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+        bucket = math.ceil(
+            HISTOGRAM_STEPS * math.log2(max(duration * 1e9, 1.0))
+        )
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def get_histogram(self) -> Dict[float, int]:
+        """Returns the call counts by the upper bound (in seconds) of their
+        latency bucket."""
+        return {
+            2 ** (bucket / HISTOGRAM_STEPS) / 1e9: count
+            for bucket, count in sorted(self.histogram.items())
+        }
+
+    def get_percentile(self, q: float) -> float:
+        """Returns the (upper bound of the bucket of the) q-th percentile of
+        the latencies, in seconds."""
+        rank = q / 100 * self.calls
+        seen = 0
+        for bound, count in self.get_histogram().items():
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else 0.0,
+            "p50": self.get_percentile(50),
+            "p95": self.get_percentile(95),
+            "max": self.max,
+            "rss_delta": self.rss_delta,
+            "alloc_peak": self.alloc_peak,
+            "histogram": self.get_histogram(),
+        }
+
+
+class _Frame:
+    def __init__(self, alloc_start: int) -> None:
+        self.alloc_start = alloc_start
+        self.alloc_peak = alloc_start
+
+
+class Instrumentation:
+    """Records the wall time, call counts and latencies of the instrumented
+    stages while it is active, i.e. within its `with` block.
+
+    `Preprocessor.run` and `Comparator.compare` additionally record the growth
+    of the peak RSS of the process and, if `trace_memory` is set, the peak of
+    the Python allocations (tracemalloc) above the start of the call. The
+    per-item `_run` and `_compare` stages are only timed.
+
+    Every call is also kept as an event of a Chrome trace (up to `max_events`),
+    which can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+    Only calls in the current process are recorded, i.e. not the `_compare`
+    calls in the workers of a comparator.
+    """
+
+    def __init__(
+        self, trace_memory: bool = False, max_events: int = 1_000_000
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.max_events = max_events
+        self.stats: Dict[str, StageStats] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.dropped_events = 0
+
+        self._start = 0.0
+        self._frames: List[_Frame] = []
+        self._running: Set[Tuple[int, str]] = set()
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "Instrumentation":
+        global _active
+
+        if _active is not None:
+            raise RuntimeError("Another instrumentation is already active!")
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self._start = time.perf_counter()
+        _active = self
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        global _active
+
+        _active = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def call(
+        self,
+        obj: Any,
+        method: str,
+        track_memory: bool,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        # Overrides that call their base method are recorded only once.
+        key = (id(obj), method)
+        if key in self._running:
+            return func(obj, *args, **kwargs)
+
+        name = f"{type(obj).__name__}.{method}"
+        track_alloc = track_memory and tracemalloc.is_tracing()
+        if track_memory:
+            rss_start = _get_peak_rss()
+        if track_alloc:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._frames.append(_Frame(current))
+
+        self._running.add(key)
+        start = time.perf_counter()
+        try:
+            return func(obj, *args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            self._running.discard(key)
+
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = StageStats(name)
+            stats.add(end - start)
+
+            if track_memory:
+                stats.rss_delta = max(
+                    stats.rss_delta, _get_peak_rss() - rss_start
+                )
+            if track_alloc:
+                stats.alloc_peak = max(stats.alloc_peak, self._pop_frame())
+
+            self._add_event(name, method, start, end)
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """Returns the statistics of each stage, slowest (in total) first."""
+        return [
+            stats.to_dict()
+            for stats in sorted(
+                self.stats.values(), key=lambda stats: -stats.total
+            )
+        ]
+
+    def format_summary(self) -> str:
+        header = (
+            f"{'stage':<48} {'calls':>8} {'total s':>10} {'mean ms':>10} "
+            f"{'p95 ms':>10} {'max ms':>10} {'rss MB':>8} {'alloc MB':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.get_summary():
+            lines.append(
+                f"{row['name']:<48} {row['calls']:>8} "
+                f"{row['total']:>10.4f} {row['mean'] * 1e3:>10.3f} "
+                f"{row['p95'] * 1e3:>10.3f} {row['max'] * 1e3:>10.3f} "
+                f"{row['rss_delta'] / 2**20:>8.1f} "
+                f"{row['alloc_peak'] / 2**20:>9.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def save_trace(self, path: Path) -> None:
+        """Writes the recorded calls as a Chrome trace-event JSON file."""
+        trace = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped_events},
+        }
+        Path(path).write_text(json.dumps(trace))
+
+    def _pop_frame(self) -> int:
+        frame = self._frames.pop()
+        _, peak = tracemalloc.get_traced_memory()
+        frame.alloc_peak = max(frame.alloc_peak, peak)
+
+        # The peak was reset at the start of this call, so the enclosing call
+        # inherits it before the peak of its remaining part is measured.
+        if self._frames:
+            parent = self._frames[-1]
+            parent.alloc_peak = max(parent.alloc_peak, frame.alloc_peak)
+
+        return frame.alloc_peak - frame.alloc_start
+
+    def _add_event(
+        self, name: str, category: str, start: float, end: float
+    ) -> None:
+        if len(self.events) >= self.max_events:
+            self.dropped_events += 1
+            return
+
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._start) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+
+def get_active() -> Optional[Instrumentation]:
+    return _active
+
+
+def instrument_method(func: F, method: str, track_memory: bool) -> F:
+    """Wraps a method to be recorded as `<class of self>.<method>` while an
+    instrumentation is active; otherwise it is called as is."""
+    if getattr(func, "__instrumented__", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if _active is None:
+            return func(self, *args, **kwargs)
+
+        return _active.call(self, method, track_memory, func, *args, **kwargs)
+
+    wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+
+    return cast(F, wrapper)
+
+
+def instrument_methods(cls: type, methods: Dict[str, bool]) -> None:
+    """Instruments the given methods of `cls`, with or without memory
+    tracking, unless they are abstract or already instrumented."""
+    for method, track_memory in methods.items():
+        func = getattr(cls, method, None)
+        if func is None or getattr(func, "__isabstractmethod__", False):
+            continue
+
+        setattr(cls, method, instrument_method(func, method, track_memory))
+
+
+def _get_peak_rss() -> int:
+    """Returns the peak resident set size of the process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
@@ -1,18 +1,31 @@
 from .fraction import Fraction
+from .columnar_store import ColumnarStore
+from .lazy_fraction import FractionCache, LazyFraction
 from .task import Task
 from .job import Job
 from .input import Input
 from .partial_result import FractionResult, JobResult, TaskResult
 from .result import Result
 from .partial_output import PartialOutput
+from .matrix_partial_output import (
+    MatrixPartialOutput,
+    MatrixPartialResult,
+    MatrixResult,
+)
 from .output import Output
 
 __all__ = [
+    "ColumnarStore",
     "Fraction",
+    "FractionCache",
     "FractionResult",
     "Input",
     "Job",
     "JobResult",
+    "LazyFraction",
+    "MatrixPartialOutput",
+    "MatrixPartialResult",
+    "MatrixResult",
     "Output",
     "PartialOutput",
     "Result",
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from gtd.internal.fraction import Fraction
+
+
+class ColumnarStore:
+    """Backing store of the (DataFrame) data of the fractions of an input.
+
+    Every column of all fractions is kept in a single contiguous array, and
+    the rows of the i-th fraction are `offsets[i]:offsets[i + 1]` of them.
+    The data of the fractions is rebuilt as DataFrames of views into these
+    arrays, so equal-length fractions can be stacked into a matrix without
+    copying them.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], offsets: np.ndarray):
+        self.columns = columns
+        self.offsets = offsets
+
+    @classmethod
+    def from_fractions(cls, fractions: List[Fraction]) -> "ColumnarStore":
+        """Copies the data of the fractions into a new store and replaces it
+        with views into the store."""
+        if not fractions:
+            raise ValueError("There are no fractions to store!")
+
+        frames: List[pd.DataFrame] = [fraction.data for fraction in fractions]
+        if not all(isinstance(frame, pd.DataFrame) for frame in frames):
+            raise ValueError("Only DataFrame fractions can be stored!")
+
+        names = list(frames[0].columns)
+        if any(list(frame.columns) != names for frame in frames):
+            raise ValueError("All fractions must have the same columns!")
+
+        lengths = [frame.shape[0] for frame in frames]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        columns = {
+            name: np.concatenate([frame[name].to_numpy() for frame in frames])
+            for name in names
+        }
+
+        store = cls(columns, offsets)
+        for pos, (fraction, frame) in enumerate(zip(fractions, frames)):
+            fraction.data = store.get_frame(pos, frame.index)
+
+        return store
+
+    def get_frame(self, pos: int, index: pd.Index) -> pd.DataFrame:
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+
+        return pd.DataFrame(
+            {name: values[start:end] for name, values in self.columns.items()},
+            index=index,
+            copy=False,
+        )
+
+    def get_matrix(
+        self, col: str, fractions: List[Fraction]
+    ) -> Optional[np.ndarray]:
+        """Returns a read-only (n, T) view of `col` of the fractions, or None
+        if they no longer are (in order) the equal-length views of the
+        store, e.g. after a preprocessor replaced their data."""
+        n = self.offsets.shape[0] - 1
+        values = self.columns.get(col)
+        if values is None or len(fractions) != n or n == 0:
+            return None
+
+        lengths = np.diff(self.offsets)
+        length = int(lengths[0])
+        if (lengths != length).any():
+            return None
+
+        base = values.__array_interface__["data"][0]
+        for pos, fraction in enumerate(fractions):
+            data = fraction.data
+            if not isinstance(data, pd.DataFrame) or col not in data:
+                return None
+
+            view = data[col].to_numpy()
+            address = base + int(self.offsets[pos]) * values.itemsize
+            if (
+                view.__array_interface__["data"][0] != address
+                or view.shape != (length,)
+                or view.strides != values.strides
+            ):
+                return None
+
+        matrix = values[: n * length].reshape(n, length)
+        matrix.flags.writeable = False
+
+        return matrix
@@ -25,3 +25,6 @@ class Fraction(GenericModel, Generic[DataT]):
             )
 
         return False
+
+    def __hash__(self) -> int:
+        return hash((self.job_id, self.task_idx, self.idx))
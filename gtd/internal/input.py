@@ -1,13 +1,62 @@
-from typing import Dict, Iterator, List, Tuple
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import PrivateAttr
 
 from gtd.internal import Fraction, Job, Task
+from gtd.internal.columnar_store import ColumnarStore
+from gtd.internal.lazy_fraction import FractionCache
+from gtd.internal.tracked_dict import TrackedModel, get_structure_version
 
 
-class Input(BaseModel):
+class InputIndex:
+    """Ids of the jobs, tasks and fractions of an input and their ordinals,
+    i.e. their positions in `get_jobs`, `get_tasks` and `get_fractions`."""
+
+    def __init__(self, jobs: Dict[int, Job]) -> None:
+        # Structure version the index was built at; any later change to the
+        # jobs, tasks or fractions of an input bumps it.
+        self.version = get_structure_version()
+
+        self.job_ids = list(jobs.keys())
+        self.task_uids: List[Tuple[int, int]] = []
+        self.fraction_uuids: List[Tuple[int, int, int]] = []
+
+        for job in jobs.values():
+            for task in job.get_tasks():
+                self.task_uids.append((task.job_id, task.idx))
+                for fraction in task.get_fractions():
+                    self.fraction_uuids.append(
+                        (task.job_id, fraction.task_idx, fraction.idx)
+                    )
+
+        self.job_ordinals = {id: pos for pos, id in enumerate(self.job_ids)}
+        self.task_ordinals = {
+            uid: pos for pos, uid in enumerate(self.task_uids)
+        }
+        self.fraction_ordinals = {
+            uuid: pos for pos, uuid in enumerate(self.fraction_uuids)
+        }
+
+    def is_current(self) -> bool:
+        return self.version == get_structure_version()
+
+
+class Input(TrackedModel):
     jobs: Dict[int, Job]
 
+    _tracked_field: ClassVar[str] = "jobs"
+
+    # Optional contiguous store the data of the fractions are views into.
+    _store: Optional[ColumnarStore] = PrivateAttr(default=None)
+
+    # Cache of the data of the fractions of a lazily read input.
+    _fraction_cache: Optional[FractionCache] = PrivateAttr(default=None)
+
+    # Ids and ordinals are built on first use and rebuilt once jobs, tasks or
+    # fractions were added, removed or replaced since.
+    _index: Optional[InputIndex] = PrivateAttr(default=None)
+
     def __str__(self) -> str:
         return f"Input({self.jobs})"
 
@@ -19,7 +68,10 @@ class Input(BaseModel):
             yield job
 
     def get_job_ids(self) -> List[int]:
-        return [idx for idx in self.jobs.keys()]
+        return list(self._get_index().job_ids)
+
+    def get_job_ordinal(self, job_id: int) -> int:
+        return self._get_index().job_ordinals[job_id]
 
     def get_task_by_uid(self, job_id: int, task_idx: int) -> Task:
         return self.jobs[job_id].get_task_by_idx(task_idx)
@@ -30,12 +82,10 @@ class Input(BaseModel):
                 yield task
 
     def get_task_uids(self) -> List[Tuple[int, int]]:
-        uids = []
-        for job in self.jobs.values():
-            for task in job.get_tasks():
-                uids.append((task.job_id, task.idx))
+        return list(self._get_index().task_uids)
 
-        return uids
+    def get_task_ordinal(self, job_id: int, task_idx: int) -> int:
+        return self._get_index().task_ordinals[(job_id, task_idx)]
 
     def get_fraction_by_uuid(
         self, job_id: int, task_idx: int, fraction_idx: int
@@ -53,10 +103,48 @@ class Input(BaseModel):
                     yield fraction
 
     def get_fraction_uuids(self) -> List[Tuple[int, int, int]]:
-        uuids = []
-        for job in self.jobs.values():
-            for task in job.get_tasks():
-                for fraction in task.get_fractions():
-                    uuids.append((task.job_id, fraction.task_idx, fraction.idx))
+        return list(self._get_index().fraction_uuids)
+
+    def get_fraction_ordinal(
+        self, job_id: int, task_idx: int, fraction_idx: int
+    ) -> int:
+        return self._get_index().fraction_ordinals[
+            (job_id, task_idx, fraction_idx)
+        ]
+
+    def get_fraction_cache(self) -> Optional[FractionCache]:
+        return self._fraction_cache
+
+    def get_columnar_store(self) -> Optional[ColumnarStore]:
+        return self._store
+
+    def _get_index(self) -> InputIndex:
+        if self._index is None or not self._index.is_current():
+            self._index = InputIndex(self.jobs)
+
+        return self._index
+
+    def to_columnar(self) -> "Input":
+        """Moves the (DataFrame) data of all fractions into a columnar store
+        and turns it into views of the store."""
+        self._store = ColumnarStore.from_fractions(list(self.get_fractions()))
+
+        return self
+
+    def as_matrix(self, col: str) -> np.ndarray:
+        """Stacks `col` of all (equal-length) fractions in an (n, T) array.
+
+        If the fractions are still the views of the columnar store, this is
+        a read-only view of the store; otherwise the columns are copied.
+        """
+        fractions = list(self.get_fractions())
+        if self._store is not None:
+            matrix = self._store.get_matrix(col, fractions)
+            if matrix is not None:
+                return matrix
+
+        columns = [fraction.data[col].to_numpy() for fraction in fractions]
+        if len({column.shape for column in columns}) > 1:
+            raise ValueError("All fractions must have the same length!")
 
-        return uuids
+        return np.stack(columns)
@@ -1,14 +1,15 @@
-from typing import Dict, Iterator, List, Tuple
-
-from pydantic import BaseModel
+from typing import ClassVar, Dict, Iterator, List, Tuple
 
 from gtd.internal import Fraction, Task
+from gtd.internal.tracked_dict import TrackedModel
 
 
-class Job(BaseModel):
+class Job(TrackedModel):
     id: int
     tasks: Dict[int, Task]
 
+    _tracked_field: ClassVar[str] = "tasks"
+
     def __str__(self) -> str:
         task_idxs = self.get_task_idxs()
         return f"Job(id={self.id}, tasks={task_idxs})"
@@ -19,6 +20,9 @@ class Job(BaseModel):
 
         return False
 
+    def __hash__(self) -> int:
+        return hash(self.id)
+
     def get_task_by_idx(self, task_idx: int) -> Task:
         return self.tasks[task_idx]
 
@@ -0,0 +1,258 @@
+import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import PrivateAttr
+
+from gtd.internal.fraction import Fraction
+
+
+def data_size(data: Any) -> int:
+    """Returns the (approximate) size of the data of a fraction in bytes."""
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=True, deep=False).sum())
+    if isinstance(data, np.ndarray):
+        return int(data.nbytes)
+
+    return sys.getsizeof(data)
+
+
+class _Entry:
+    __slots__ = ("data", "size", "changed")
+
+    def __init__(self, data: Any, size: int, changed: bool) -> None:
+        self.data = data
+        self.size = size
+        self.changed = changed
+
+
+class FractionCache:
+    """LRU cache of the data of lazy fractions, keyed by their files.
+
+    Once the cached data exceeds `memory_budget` bytes, the least recently
+    used data that is not pinned is evicted. Data that is unchanged since it
+    was read is dropped and read again on its next access, while data that
+    was assigned or changed (see `mark_changed`) is first spilled to a file
+    in a temporary dir. Without a budget, data is never evicted.
+    """
+
+    def __init__(
+        self, loader: Callable[[Path], Any], memory_budget: Optional[int]
+    ) -> None:
+        self.loader = loader
+        self.memory_budget = memory_budget
+        self.size = 0
+        self.loads = 0
+        self.spills = 0
+
+        self._entries: "OrderedDict[Path, _Entry]" = OrderedDict()
+        self._pins: Dict[Path, int] = {}
+        self._spilled: Dict[Path, Path] = {}
+        self._spill_dir: Optional[Path] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, file: Path) -> bool:
+        return file in self._entries
+
+    def get(self, file: Path) -> Any:
+        entry = self._entries.get(file)
+        if entry is not None:
+            self._entries.move_to_end(file)
+            return entry.data
+
+        spill_file = self._spilled.get(file)
+        if spill_file is not None:
+            with spill_file.open("rb") as f:
+                data = pickle.load(f)
+        else:
+            data = self.loader(file)
+            self.loads += 1
+
+        self._add(file, data, changed=False)
+
+        return data
+
+    def put(self, file: Path, data: Any) -> None:
+        """Replaces the data of `file`, e.g. with data assigned to its
+        fraction."""
+        self.discard(file)
+        self._add(file, data, changed=True)
+
+    def mark_changed(self, file: Path) -> None:
+        """Marks cached data as changed in place, so that it is spilled
+        instead of dropped when it is evicted."""
+        entry = self._entries.get(file)
+        if entry is None:
+            return
+
+        size = data_size(entry.data)
+        self.size += size - entry.size
+        entry.size = size
+        entry.changed = True
+
+        self._evict()
+
+    def discard(self, file: Path) -> None:
+        entry = self._entries.pop(file, None)
+        if entry is not None:
+            self.size -= entry.size
+
+        spill_file = self._spilled.pop(file, None)
+        if spill_file is not None:
+            spill_file.unlink(missing_ok=True)
+
+    def pin(self, file: Path) -> None:
+        self._pins[file] = self._pins.get(file, 0) + 1
+
+    def unpin(self, file: Path) -> None:
+        count = self._pins.get(file, 0) - 1
+        if count > 0:
+            self._pins[file] = count
+        else:
+            self._pins.pop(file, None)
+
+        self._evict()
+
+    def _add(self, file: Path, data: Any, changed: bool) -> None:
+        entry = _Entry(data, data_size(data), changed)
+        self._entries[file] = entry
+        self.size += entry.size
+
+        self._evict(keep=file)
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        if self.memory_budget is None or self.size <= self.memory_budget:
+            return
+
+        for file in list(self._entries):
+            if self.size <= self.memory_budget:
+                break
+            if file == keep or file in self._pins:
+                continue
+
+            entry = self._entries.pop(file)
+            self.size -= entry.size
+            if entry.changed:
+                self._spill(file, entry.data)
+
+    def _spill(self, file: Path, data: Any) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="gtd-spill-"))
+            weakref.finalize(
+                self, shutil.rmtree, self._spill_dir, ignore_errors=True
+            )
+
+        spill_file = self._spilled.get(file)
+        if spill_file is None:
+            spill_file = self._spill_dir / f"{len(self._spilled)}.pkl"
+            self._spilled[file] = spill_file
+
+        with spill_file.open("wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.spills += 1
+
+
+class LazyFraction(Fraction):
+    """Fraction whose data is read from `file` on first access.
+
+    The data is held by a shared `FractionCache` and may be evicted at any
+    time. Data that is assigned to the fraction replaces the file in the
+    cache and is spilled to disk when evicted, while in-place changes are
+    only kept after `mark_changed` (which preprocessors call for the
+    fractions they run on).
+
+    When pickled (e.g. to be compared by a worker), the fraction is sent as
+    a plain `Fraction` with its data.
+    """
+
+    file: Path
+
+    _cache: Optional[FractionCache] = PrivateAttr(default=None)
+
+    @classmethod
+    def create(
+        cls,
+        job_id: int,
+        task_idx: int,
+        idx: int,
+        file: Path,
+        cache: FractionCache,
+    ) -> "LazyFraction":
+        fraction = cls.construct(
+            job_id=job_id, task_idx=task_idx, idx=idx, file=file
+        )
+        fraction._cache = cache
+
+        # `construct` fills in the (unset) data with its default.
+        fraction.__dict__.pop("data", None)
+
+        return fraction
+
+    def __getattr__(self, name: str) -> Any:
+        # The data is never kept in the instance dict (see `__setattr__`).
+        if name != "data":
+            raise AttributeError(name)
+
+        assert self._cache is not None
+        return self._cache.get(self.file)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "data" and self._cache is not None:
+            self._cache.put(self.file, value)
+        else:
+            super().__setattr__(name, value)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            _make_fraction,
+            (self.job_id, self.task_idx, self.idx, self.data),
+        )
+
+    def derive(self, idx: int, data: Any) -> "LazyFraction":
+        """Creates a fraction of the same task with new data (e.g. a slice of
+        this one's), which is held by the same cache."""
+        assert self._cache is not None
+
+        fraction = LazyFraction.create(
+            self.job_id,
+            self.task_idx,
+            idx,
+            self.file.with_name(f"{self.file.name}#{idx}"),
+            self._cache,
+        )
+        fraction.data = data
+
+        return fraction
+
+    def is_loaded(self) -> bool:
+        return self._cache is not None and self.file in self._cache
+
+    def mark_changed(self) -> None:
+        """Marks the data as changed in place, so that the changes are not
+        lost by an eviction."""
+        if self._cache is not None:
+            self._cache.mark_changed(self.file)
+
+    def pin(self) -> None:
+        """Keeps the data in memory until `unpin` is called."""
+        assert self._cache is not None
+        self._cache.pin(self.file)
+
+    def unpin(self) -> None:
+        assert self._cache is not None
+        self._cache.unpin(self.file)
+
+
+def _make_fraction(job_id: int, task_idx: int, idx: int, data: Any) -> Fraction:
+    return Fraction.construct(
+        job_id=job_id, task_idx=task_idx, idx=idx, data=data
+    )
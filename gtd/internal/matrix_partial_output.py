@@ -0,0 +1,247 @@
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import PrivateAttr
+from pydantic.generics import GenericModel
+
+from gtd.internal.types import Id
+
+
+class MatrixPartialResult:
+    """View of a single (baseline, compared) cell of a `MatrixPartialOutput`.
+
+    Mirrors the `PartialResult` API, but reads and writes its value straight
+    from/to the backing array instead of holding a copy of it.
+    """
+
+    __slots__ = ("_output", "_row", "_col")
+
+    def __init__(self, output: "MatrixPartialOutput", row: int, col: int):
+        self._output = output
+        self._row = row
+        self._col = col
+
+    def __str__(self) -> str:
+        return f"MatrixPartialResult(id_={self.id_}, value={self.value})"
+
+    @property
+    def id_(self) -> Any:
+        return self._output.ids[self._col]
+
+    @property
+    def value(self) -> Any:
+        return self._output.get_value_at(self._row, self._col)
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._output.set_value_at(self._row, self._col, value)
+
+    def get_id(self) -> Any:
+        return self.id_
+
+    @property
+    def job_id(self) -> int:
+        id_ = self.id_
+        return id_ if isinstance(id_, int) else id_[0]
+
+    @property
+    def task_idx(self) -> int:
+        task_idx: int = self.id_[1]
+        return task_idx
+
+    @property
+    def idx(self) -> int:
+        idx: int = self.id_[2]
+        return idx
+
+
+class MatrixResult:
+    """View of the row of a `MatrixPartialOutput` that belongs to a baseline.
+
+    Mirrors the `Result` API. The baseline itself is not part of the compared
+    ids, exactly as in the dict based structure.
+    """
+
+    __slots__ = ("_output", "_row")
+
+    def __init__(self, output: "MatrixPartialOutput", row: int):
+        self._output = output
+        self._row = row
+
+    def __str__(self) -> str:
+        compared_ids = self.get_partial_result_ids()
+        return (
+            f"MatrixResult(baseline={self.baseline}, compared={compared_ids})"
+        )
+
+    @property
+    def baseline(self) -> Any:
+        return self._output.ids[self._row]
+
+    @property
+    def compared(self) -> Dict[Any, MatrixPartialResult]:
+        return {
+            id: MatrixPartialResult(self._output, self._row, col)
+            for col, id in enumerate(self._output.ids)
+            if col != self._row
+        }
+
+    def get_partial_result_by_id(self, id: Any) -> MatrixPartialResult:
+        col = self._output.index_of(id)
+        if col == self._row:
+            raise KeyError(id)
+
+        return MatrixPartialResult(self._output, self._row, col)
+
+    def get_partial_results(self) -> Iterator[MatrixPartialResult]:
+        for col in range(len(self._output.ids)):
+            if col == self._row:
+                continue
+
+            yield MatrixPartialResult(self._output, self._row, col)
+
+    def get_partial_result_ids(self) -> List[Any]:
+        return [
+            id for col, id in enumerate(self._output.ids) if col != self._row
+        ]
+
+
+class MatrixPartialOutput(GenericModel, Generic[Id]):
+    """Partial output that keeps all the pair values in a dense array.
+
+    Row/column `i` of `values` belongs to `ids[i]`. Scalar valued comparators
+    fill an (n, n) array, list valued ones an (n, n, k) array. The array is
+    allocated on the first write, once the shape of the values is known.
+    """
+
+    name: str
+    ids: List[Id]
+    values: Optional[np.ndarray] = None
+
+    _index: Dict[Id, int] = PrivateAttr(default_factory=dict)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __str__(self) -> str:
+        result_ids = self.get_result_ids()
+        return f"MatrixPartialOutput(name={self.name}, results={result_ids})"
+
+    @property
+    def results(self) -> Dict[Id, MatrixResult]:
+        return {id: MatrixResult(self, row) for row, id in enumerate(self.ids)}
+
+    def get_result_by_id(self, id: Id) -> MatrixResult:
+        return MatrixResult(self, self.index_of(id))
+
+    def get_results(self) -> Iterator[MatrixResult]:
+        for row in range(len(self.ids)):
+            yield MatrixResult(self, row)
+
+    def get_result_ids(self) -> List[Id]:
+        return [id for id in self.ids]
+
+    def index_of(self, id: Id) -> int:
+        if len(self._index) != len(self.ids):
+            self._index = {id: pos for pos, id in enumerate(self.ids)}
+
+        return self._index[id]
+
+    def get_value(self, baseline: Id, compared: Id) -> Any:
+        return self.get_value_at(
+            self.index_of(baseline), self.index_of(compared)
+        )
+
+    def set_value(self, baseline: Id, compared: Id, value: Any) -> None:
+        self.set_value_at(
+            self.index_of(baseline), self.index_of(compared), value
+        )
+
+    def get_row(self, baseline: Id) -> np.ndarray:
+        """Returns the values of a baseline against all ids (a view, so that
+        a memory-mapped output only reads that row)."""
+        if self.values is None:
+            return np.zeros(len(self.ids))
+
+        row: np.ndarray = self.values[self.index_of(baseline)]
+        return row
+
+    def get_rows(self, baselines: List[Id]) -> np.ndarray:
+        """Returns the values of the baselines against all ids."""
+        if self.values is None:
+            return np.zeros((len(baselines), len(self.ids)))
+
+        rows: np.ndarray = self.values[[self.index_of(id) for id in baselines]]
+        return rows
+
+    def get_value_at(self, row: int, col: int) -> Union[float, List[float]]:
+        if self.values is None:
+            return 0.0
+
+        value = self.values[row, col]
+        if isinstance(value, np.ndarray):
+            values_list: List[float] = value.tolist()
+            return values_list
+
+        return float(value)
+
+    def set_value_at(self, row: int, col: int, value: Any) -> None:
+        if self.values is None:
+            self.allocate(np.shape(value))
+
+        assert self.values is not None
+        self.values[row, col] = value
+
+    def set_block(
+        self, row: int, col: int, values: np.ndarray, mask: np.ndarray
+    ) -> None:
+        """Writes the masked cells of a block that starts at (row, col)."""
+        if self.values is None:
+            self.allocate(values.shape[2:])
+
+        assert self.values is not None
+        rows, cols = mask.shape
+        self.values[row : row + rows, col : col + cols][mask] = values[mask]
+
+    def add_ids(self, ids: List[Id]) -> None:
+        """Appends rows/columns for `ids`, whose values are left to zero."""
+        if not ids:
+            return
+
+        self.ids = self.ids + list(ids)
+        if self.values is not None:
+            k = len(ids)
+            pad = [(0, k), (0, k)] + [(0, 0)] * (self.values.ndim - 2)
+            self.values = np.pad(self.values, pad)
+
+    def allocate(self, value_shape: Tuple[int, ...] = ()) -> None:
+        n = len(self.ids)
+        self.values = np.zeros((n, n) + tuple(value_shape), dtype=np.float64)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns one row per (baseline, compared) pair."""
+        labels = np.array([_id_to_label(id) for id in self.ids], dtype=object)
+        rows, cols = np.nonzero(~np.eye(len(self.ids), dtype=bool))
+
+        data = {"baseline": labels[rows], "compared": labels[cols]}
+        if self.values is None or self.values.ndim == 2:
+            values = (
+                np.zeros(rows.shape[0])
+                if self.values is None
+                else self.values[rows, cols]
+            )
+            data["value"] = values
+        else:
+            pair_values = self.values[rows, cols]
+            for k in range(pair_values.shape[1]):
+                data[f"value_{k}"] = pair_values[:, k]
+
+        return pd.DataFrame(data)
+
+
+def _id_to_label(id: Any) -> str:
+    if isinstance(id, tuple):
+        return "-".join(str(x) for x in id)
+
+    return str(id)
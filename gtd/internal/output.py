@@ -1,23 +1,163 @@
-from typing import Dict, Iterator, List
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Type, Union
 
+import numpy as np
 from pydantic import BaseModel
 
+from gtd.internal.matrix_partial_output import MatrixPartialOutput
 from gtd.internal.partial_output import PartialOutput
+from gtd.internal.partial_result import (
+    FractionResult,
+    JobResult,
+    PartialResult,
+    TaskResult,
+)
+from gtd.internal.result import Result
+
+AnyPartialOutput = Union[PartialOutput, MatrixPartialOutput]
+
+MANIFEST_FILE = "manifest.json"
+
+FORMAT_VERSION = 1
+
+# Type of the partial results by the number of fields of their ids.
+_RESULT_CLASSES: Dict[int, Type[PartialResult]] = {
+    1: JobResult,
+    2: TaskResult,
+    3: FractionResult,
+}
 
 
 class Output(BaseModel):
-    parts: Dict[str, PartialOutput] = {}
+    parts: Dict[str, AnyPartialOutput] = {}
 
     def __str__(self) -> str:
         part_names = self.get_part_names()
         return f"Output(parts={part_names})"
 
-    def get_part_by_name(self, part: str) -> PartialOutput:
+    def get_part_by_name(self, part: str) -> AnyPartialOutput:
         return self.parts[part]
 
-    def get_parts(self) -> Iterator[PartialOutput]:
+    def get_parts(self) -> Iterator[AnyPartialOutput]:
         for part in self.parts.values():
             yield part
 
     def get_part_names(self) -> List[str]:
         return [name for name in self.parts.keys()]
+
+    def save(self, path: Path) -> None:
+        """Stores the output in the `path` dir as plain `.npy` arrays.
+
+        A matrix part is stored as its ids and its values array; a sparse
+        part (e.g. of `compare_pairs`) as one row per pair, i.e. the
+        baseline ids, the compared ids and the values.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+
+        parts = []
+        for i, (name, part) in enumerate(self.parts.items()):
+            prefix = f"part-{i}"
+            if isinstance(part, MatrixPartialOutput):
+                _save_ids(path, f"{prefix}.ids", part.ids)
+                if part.values is not None:
+                    np.save(path / f"{prefix}.values.npy", part.values)
+
+                parts.append(
+                    {
+                        "name": name,
+                        "kind": "matrix",
+                        "prefix": prefix,
+                        "allocated": part.values is not None,
+                    }
+                )
+            else:
+                baselines, compared, values = [], [], []
+                for result in part.get_results():
+                    for partial_result in result.get_partial_results():
+                        baselines.append(result.baseline)
+                        compared.append(partial_result.id_)
+                        values.append(partial_result.value)
+
+                _save_ids(path, f"{prefix}.baseline", baselines)
+                _save_ids(path, f"{prefix}.compared", compared)
+                np.save(
+                    path / f"{prefix}.values.npy",
+                    np.asarray(values, dtype=np.float64),
+                )
+                parts.append({"name": name, "kind": "sparse", "prefix": prefix})
+
+        manifest = {"version": FORMAT_VERSION, "parts": parts}
+        (path / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "Output":
+        """Loads an output stored by `save`.
+
+        With `mmap`, the values of the matrix parts are memory-mapped instead
+        of read, so only the rows that are accessed are paged in. Writes to a
+        memory-mapped part stay in memory and never reach the files.
+        """
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        if manifest["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported output version {manifest['version']}!"
+            )
+
+        mmap_mode: Optional[Literal["c"]] = "c" if mmap else None
+        output = cls()
+        for part in manifest["parts"]:
+            name, prefix = part["name"], part["prefix"]
+
+            if part["kind"] == "matrix":
+                values = None
+                if part["allocated"]:
+                    values = np.load(
+                        path / f"{prefix}.values.npy", mmap_mode=mmap_mode
+                    )
+
+                output.parts[name] = MatrixPartialOutput.construct(
+                    name=name,
+                    ids=_load_ids(path, f"{prefix}.ids"),
+                    values=values,
+                )
+            else:
+                output.parts[name] = _load_sparse(path, name, prefix)
+
+        return output
+
+
+def _save_ids(path: Path, name: str, ids: List[Any]) -> None:
+    np.save(path / f"{name}.npy", np.asarray(ids, dtype=np.int64))
+
+
+def _load_ids(path: Path, name: str) -> List[Any]:
+    ids: List[Any] = np.load(path / f"{name}.npy").tolist()
+    if ids and isinstance(ids[0], list):
+        return [tuple(id) for id in ids]
+
+    return ids
+
+
+def _load_sparse(path: Path, name: str, prefix: str) -> PartialOutput:
+    baselines = _load_ids(path, f"{prefix}.baseline")
+    compared = _load_ids(path, f"{prefix}.compared")
+    values: List[Any] = np.load(path / f"{prefix}.values.npy").tolist()
+
+    results: Dict[Any, Result] = {}
+    if baselines:
+        first = baselines[0]
+        result_class = _RESULT_CLASSES[
+            len(first) if isinstance(first, tuple) else 1
+        ]
+        for baseline, id, value in zip(baselines, compared, values):
+            if baseline not in results:
+                results[baseline] = Result.construct(
+                    baseline=baseline, compared={}
+                )
+
+            results[baseline].compared[id] = result_class.construct(
+                id_=id, value=value
+            )
+
+    return PartialOutput.construct(name=name, results=results)
@@ -1,15 +1,16 @@
-from typing import Dict, Iterator, List
-
-from pydantic import BaseModel
+from typing import ClassVar, Dict, Iterator, List
 
 from gtd.internal import Fraction
+from gtd.internal.tracked_dict import TrackedModel
 
 
-class Task(BaseModel):
+class Task(TrackedModel):
     job_id: int
     idx: int
     fractions: Dict[int, Fraction]
 
+    _tracked_field: ClassVar[str] = "fractions"
+
     def __str__(self) -> str:
         fr_idxs = self.get_fraction_idxs()
         return f"""
@@ -22,6 +23,9 @@ class Task(BaseModel):
 
         return False
 
+    def __hash__(self) -> int:
+        return hash((self.job_id, self.idx))
+
     def get_fraction_by_idx(self, fraction_idx: int) -> Fraction:
         return self.fractions[fraction_idx]
 
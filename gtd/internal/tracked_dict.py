@@ -0,0 +1,115 @@
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel
+
+K = TypeVar("K")
+V = TypeVar("V")
+ModelT = TypeVar("ModelT", bound="TrackedModel")
+
+# Bumped whenever jobs, tasks or fractions are added, removed or replaced in
+# any input, so that indexes built before can tell that they are outdated.
+_structure_version = 0
+
+
+def get_structure_version() -> int:
+    return _structure_version
+
+
+def _bump() -> None:
+    global _structure_version
+    _structure_version += 1
+
+
+class TrackedDict(Dict[K, V]):
+    """Dict of the jobs of an input, the tasks of a job or the fractions of a
+    task, which bumps the structure version on every change."""
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+        _bump()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        _bump()
+
+    def pop(self, key: K, *default: Any) -> Any:
+        _bump()
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[K, V]:
+        _bump()
+        return super().popitem()
+
+    def setdefault(self, key: K, default: Any = None) -> Any:
+        _bump()
+        return super().setdefault(key, default)
+
+    def update(  # type: ignore[override]
+        self,
+        other: Union[Mapping[K, V], Iterable[Tuple[K, V]]] = (),
+        **kwargs: V,
+    ) -> None:
+        super().update(other, **kwargs)
+        _bump()
+
+    def clear(self) -> None:
+        super().clear()
+        _bump()
+
+    def __ior__(  # type: ignore[misc,override]
+        self, other: Any
+    ) -> "TrackedDict[K, V]":
+        super().__ior__(other)
+        _bump()
+        return self
+
+
+def track(items: Dict[K, V]) -> "TrackedDict[K, V]":
+    """Wraps the items of a (new) structure level, which bumps the structure
+    version as well."""
+    tracked: TrackedDict[K, V] = TrackedDict(items)
+    _bump()
+
+    return tracked
+
+
+class TrackedModel(BaseModel):
+    """Model whose `_tracked_field` (its jobs, tasks or fractions) is kept as a
+    `TrackedDict`, whether it is constructed, validated or assigned."""
+
+    _tracked_field: ClassVar[str]
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**data)
+        self.__dict__[self._tracked_field] = track(
+            self.__dict__[self._tracked_field]
+        )
+
+    @classmethod
+    def construct(
+        cls: Type[ModelT],
+        _fields_set: Optional[Set[str]] = None,
+        **values: Any,
+    ) -> ModelT:
+        if cls._tracked_field in values:
+            values[cls._tracked_field] = track(values[cls._tracked_field])
+
+        return super().construct(_fields_set, **values)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == self._tracked_field:
+            value = track(value)
+
+        super().__setattr__(name, value)
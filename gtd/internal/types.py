@@ -1,7 +1,12 @@
-from typing import List, Tuple, TypeVar
+from typing import List, Literal, Tuple, TypeVar
 
 Id = TypeVar("Id", int, Tuple[int, int], Tuple[int, int, int])
 
 DataT = TypeVar("DataT")
 
 ValueT = TypeVar("ValueT", float, int, List[float], List[int])
+
+# Compact dtypes the readers and preprocessors can store their data in.
+FloatDType = Literal["float64", "float32"]
+
+ImageDType = Literal["float64", "float32", "uint8"]
@@ -1,4 +1,5 @@
-from typing import List
+import hashlib
+from typing import List, Literal
 
 import numpy as np
 
@@ -11,6 +12,15 @@ class FractionFingerprintGenerator(FractionPreprocessor):
     fs: float = 1 / (5 * 60)
     n_top: int = 5
 
+    # In "hash" mode the data of each fraction becomes a list of `n_grids`
+    # bucket keys instead of the raw frequencies. The frequencies are
+    # quantized in steps of `resolution` Hz, with each grid shifted by a
+    # fraction of a step, so that close frequencies near a step boundary
+    # still share the key of another grid.
+    mode: Literal["raw", "hash"] = "raw"
+    resolution: float = 1e-5
+    n_grids: int = 1
+
     def _run(self, fraction: Fraction) -> None:
         dft = np.fft.fft(fraction.data[self.col])
 
@@ -37,13 +47,25 @@ class FractionFingerprintGenerator(FractionPreprocessor):
         for i in reversed(top_freq_idxs):
             top_freqs.append(f_oneside[i])
 
-        # h = self._hash(top_freqs)
+        if self.mode == "hash":
+            fraction.data = [
+                self._hash(top_freqs, grid) for grid in range(self.n_grids)
+            ]
+        else:
+            fraction.data = [int(x * 10000000) for x in top_freqs]
+
+        return
 
-        h = [int(x * 10000000) for x in top_freqs]
+    def _hash(self, top_freqs: List[float], grid: int = 0) -> int:
+        shift = grid / self.n_grids
+        bins = np.floor(np.asarray(top_freqs) / self.resolution + shift)
 
-        fraction.data = h
+        # The order of the frequencies depends on their amplitudes, which
+        # must not change the key.
+        bins = np.sort(bins.astype(np.int64))
 
-        return
+        hasher = hashlib.blake2b(digest_size=8)
+        hasher.update(np.int64(grid).tobytes())
+        hasher.update(bins.tobytes())
 
-    def _hash(self, top_freqs: List[float]) -> float:
-        return 0.0
+        return int.from_bytes(hasher.digest(), "little", signed=True)
@@ -1,28 +1,31 @@
 from typing import Tuple
 
-import numpy as np
 from pyts.image import GramianAngularField
 
 from gtd.internal import Fraction
+from gtd.internal.types import ImageDType
 from gtd.preprocessor.preprocessor import FractionPreprocessor
+from gtd.utils import to_image_dtype, to_pyts_samples
 
 
 class FractionGADFCreator(FractionPreprocessor):
     col: str
     image_size: int
     sample_range: Tuple[float, float] = (-1.0, 1.0)
+    # The values of the fields are in [-1, 1], which uint8 maps to [0, 255].
+    dtype: ImageDType = "float64"
 
     def _run(self, fraction: Fraction) -> None:
         fraction.data = fraction.data[self.col]
 
-        data_arr = fraction.data.to_numpy(dtype=np.float64).reshape(1, -1)
+        data_arr = to_pyts_samples(fraction.data, "float64")
 
         gadf = GramianAngularField(
             self.image_size, method="difference", sample_range=self.sample_range
         )
         X_gadf = gadf.fit_transform(data_arr)
 
-        fraction.data = X_gadf[0]
+        fraction.data = to_image_dtype(X_gadf[0], self.dtype, (-1.0, 1.0))
 
         return
 
@@ -31,17 +34,19 @@ class FractionGASFCreator(FractionPreprocessor):
     col: str
     image_size: int
     sample_range: Tuple[float, float] = (-1.0, 1.0)
+    # The values of the fields are in [-1, 1], which uint8 maps to [0, 255].
+    dtype: ImageDType = "float64"
 
     def _run(self, fraction: Fraction) -> None:
         fraction.data = fraction.data[self.col]
 
-        data_arr = fraction.data.to_numpy(dtype=np.float64).reshape(1, -1)
+        data_arr = to_pyts_samples(fraction.data, "float64")
 
         gasf = GramianAngularField(
             self.image_size, method="summation", sample_range=self.sample_range
         )
         X_gasf = gasf.fit_transform(data_arr)
 
-        fraction.data = X_gasf[0]
+        fraction.data = to_image_dtype(X_gasf[0], self.dtype, (-1.0, 1.0))
 
         return
@@ -9,30 +9,43 @@ class FractionIoUPreprocessor(FractionPreprocessor):
     border_size: int = 1
 
     def _run(self, fraction: Fraction) -> None:
-        border_rows = np.full(
-            (self.border_size, fraction.data.shape[1]), 255, dtype=int
+        fraction.data = add_iou_band(
+            fraction.data, self.epsilon, self.border_size
         )
-        padded_img = np.vstack([border_rows, fraction.data, border_rows])
 
-        columns = padded_img.shape[1]
+        return
 
-        # for each column in the picture find the index of
-        # the higher and the lower black pixel
-        # min level = index of higher black pixel
-        # max level = index of lower black pixel
-        # image coordinate have (0,0) in top left corner
 
-        for i in range(columns):
-            levels = np.where(padded_img[:, i] == 0)
-            min_level = levels[0].min()
-            max_level = levels[0].max()
+def add_iou_band(
+    images: np.ndarray, epsilon: int, border_size: int = 1
+) -> np.ndarray:
+    """Pads (..., H, W) images with white rows and paints `epsilon` grey
+    pixels above and below the black pixels of each column."""
+    border_rows = np.full(
+        images.shape[:-2] + (border_size, images.shape[-1]), 255, dtype=int
+    )
+    padded_img = np.concatenate([border_rows, images, border_rows], axis=-2)
 
-            for j in range(1, self.epsilon + 1):
-                # Add grey pixel on top
-                padded_img[max(min_level - j, 0), i] = 127
-                # Add grey pixel on bottom
-                padded_img[min(max_level + j, padded_img.shape[0] - 1), i] = 127
+    height = padded_img.shape[-2]
 
-        fraction.data = padded_img
+    # for each column in the picture find the index of
+    # the higher and the lower black pixel
+    # min level = index of higher black pixel
+    # max level = index of lower black pixel
+    # image coordinate have (0,0) in top left corner
+    black = padded_img == 0
+    if not black.any(axis=-2).all():
+        raise ValueError("Every image column should contain a black pixel.")
 
-        return
+    min_level = np.argmax(black, axis=-2)
+    max_level = height - 1 - np.argmax(black[..., ::-1, :], axis=-2)
+
+    # rows of the grey pixels on top and bottom of each column
+    offsets = np.arange(1, epsilon + 1)[:, None]
+    top_rows = np.maximum(min_level[..., None, :] - offsets, 0)
+    bottom_rows = np.minimum(max_level[..., None, :] + offsets, height - 1)
+
+    np.put_along_axis(padded_img, top_rows, 127, axis=-2)
+    np.put_along_axis(padded_img, bottom_rows, 127, axis=-2)
+
+    return padded_img
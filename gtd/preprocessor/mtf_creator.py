@@ -2,13 +2,18 @@ import numpy as np
 from pyts.image import MarkovTransitionField
 
 from gtd.internal import Fraction
+from gtd.internal.types import ImageDType
 from gtd.preprocessor.preprocessor import FractionPreprocessor
+from gtd.utils import to_image_dtype
 
 
 class FractionMTFCreator(FractionPreprocessor):
     col: str
     n_bins: int
     size: int = 64
+    # The transition probabilities are in [0, 1], which uint8 maps to
+    # [0, 255].
+    dtype: ImageDType = "float64"
 
     def _run(self, fraction: Fraction) -> None:
         """buckets = np.linspace(0, 1, num=self.n_bins + 1)
@@ -41,6 +46,6 @@ class FractionMTFCreator(FractionPreprocessor):
         )
         X_mtf = mtf.fit_transform(X)
 
-        fraction.data = X_mtf[0]
+        fraction.data = to_image_dtype(X_mtf[0], self.dtype, (0.0, 1.0))
 
         return
@@ -9,6 +9,8 @@ from gtd.preprocessor.preprocessor import TaskPreprocessor
 class TaskNormalizer(TaskPreprocessor):
     col: str
 
+    _changes_data_in_place = True
+
     def _run(self, task: Task) -> None:
         if len(task.fractions) > 1:
             warnings.warn(
@@ -9,6 +9,8 @@ class OutlierHandler(TaskPreprocessor):
     llim: float
     ulim: float
 
+    _changes_data_in_place = True
+
     def _run(self, task: Task) -> None:
         if len(task.fractions) > 1:
             warnings.warn(
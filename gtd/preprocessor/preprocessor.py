@@ -1,20 +1,63 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, ClassVar, Dict, Iterator, List, Union
 
 from pydantic import BaseModel
 
-from gtd.internal import Fraction, Input, Job, Task
+from gtd.instrumentation import instrument_methods
+from gtd.internal import Fraction, Input, Job, LazyFraction, Task
 
 
 class Preprocessor(BaseModel, ABC):
+    # Methods that are recorded while an `Instrumentation` is active, by
+    # whether their memory usage is tracked as well.
+    _instrumented: ClassVar[Dict[str, bool]] = {"run": True, "_run": False}
+
+    # Whether `_run` changes the data of the fractions in place, instead of
+    # only reading it or assigning new data to them.
+    _changes_data_in_place: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, cls._instrumented)
+
     @abstractmethod
     def run(self, input_obj: Input) -> Input:
         pass
 
+    @contextmanager
+    def _tracking_lazy_data(
+        self, input_obj: Input, item: Union[Job, Task, Fraction]
+    ) -> Iterator[None]:
+        # Assigned data is put into the fraction cache by the lazy fractions
+        # themselves. Data that is changed in place is pinned while the item is
+        # preprocessed and marked as changed afterwards, to be spilled instead
+        # of dropped (and read again) when it is evicted.
+        if (
+            not self._changes_data_in_place
+            or input_obj.get_fraction_cache() is None
+        ):
+            yield
+            return
+
+        pinned = _get_lazy_fractions(item)
+        for fraction in pinned:
+            fraction.pin()
+
+        try:
+            yield
+            for fraction in _get_lazy_fractions(item):
+                fraction.mark_changed()
+        finally:
+            for fraction in pinned:
+                fraction.unpin()
+
 
 class JobPreprocessor(Preprocessor):
     def run(self, input_obj: Input) -> Input:
         for job in input_obj.get_jobs():
-            self._run(job)
+            with self._tracking_lazy_data(input_obj, job):
+                self._run(job)
 
         return input_obj
 
@@ -26,7 +69,8 @@ class JobPreprocessor(Preprocessor):
 class TaskPreprocessor(Preprocessor):
     def run(self, input_obj: Input) -> Input:
         for task in input_obj.get_tasks():
-            self._run(task)
+            with self._tracking_lazy_data(input_obj, task):
+                self._run(task)
 
         return input_obj
 
@@ -38,10 +82,17 @@ class TaskPreprocessor(Preprocessor):
 class FractionPreprocessor(Preprocessor):
     def run(self, input_obj: Input) -> Input:
         for fraction in input_obj.get_fractions():
-            self._run(fraction)
+            with self._tracking_lazy_data(input_obj, fraction):
+                self._run(fraction)
 
         return input_obj
 
     @abstractmethod
     def _run(self, fraction: Fraction) -> None:
         pass
+
+
+def _get_lazy_fractions(item: Union[Job, Task, Fraction]) -> List[LazyFraction]:
+    fractions = [item] if isinstance(item, Fraction) else item.get_fractions()
+
+    return [f for f in fractions if isinstance(f, LazyFraction)]
@@ -4,6 +4,7 @@ from pyts.transformation import ROCKET
 
 from gtd.internal import Fraction, Task
 from gtd.preprocessor.preprocessor import FractionPreprocessor, TaskPreprocessor
+from gtd.utils import to_pyts_samples
 
 
 class FractionROCKETCreator(FractionPreprocessor):
@@ -12,7 +13,7 @@ class FractionROCKETCreator(FractionPreprocessor):
     random_state: int = 42
 
     def _run(self, fraction: Fraction) -> None:
-        X = fraction.data[self.col].to_numpy().reshape(1, -1)
+        X = to_pyts_samples(fraction.data[self.col])
 
         rocket = ROCKET(
             n_kernels=self.n_kernels, random_state=self.random_state
@@ -38,7 +39,7 @@ class TaskROCKETCreator(TaskPreprocessor):
             )
             return
 
-        X = task.get_fraction_by_idx(0).data[self.col].to_numpy().reshape(1, -1)
+        X = to_pyts_samples(task.get_fraction_by_idx(0).data[self.col])
 
         rocket = ROCKET(
             n_kernels=self.n_kernels, random_state=self.random_state
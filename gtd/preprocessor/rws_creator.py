@@ -20,7 +20,7 @@ class RWSCreator(Preprocessor):
         for i in range(self.R):
             D = np.random.randint(low=self.DMin, high=self.DMax, size=1)
 
-            sampleX.append(np.random.randn(1, int(D)) / self.sigma)
+            sampleX.append(np.random.randn(1, int(D[0])) / self.sigma)
 
         m = len(input_obj.get_fraction_uuids())
         l1 = max(x.data.shape[0] for x in input_obj.get_fractions())
@@ -1,20 +1,50 @@
 import warnings
+from typing import Literal, Optional
 
+import numpy as np
+from pyts.approximation import PiecewiseAggregateApproximation as PAA
 from pyts.approximation import SymbolicAggregateApproximation as SAX
 
 from gtd.internal import Fraction, Task
 from gtd.preprocessor.preprocessor import FractionPreprocessor, TaskPreprocessor
 
 
+def sax_transform(
+    X: np.ndarray,
+    n_bins: int,
+    strategy: str = "uniform",
+    n_segments: Optional[int] = None,
+) -> np.ndarray:
+    """Returns the SAX words of the rows of X.
+
+    With the "normal" strategy, the rows are z-normalized first and the
+    breakpoints are the same for all words, which is what the MINDIST lower
+    bound of `SAXMinDistTaskComparator` requires. With `n_segments`, the rows
+    are reduced to that many segment means (PAA) first.
+    """
+    if strategy == "normal":
+        std = X.std(axis=1, keepdims=True)
+        X = (X - X.mean(axis=1, keepdims=True)) / np.where(std > 0, std, 1)
+
+    if n_segments is not None:
+        X = PAA(window_size=None, output_size=n_segments).fit_transform(X)
+
+    sax = SAX(n_bins=n_bins, strategy=strategy)
+    X_sax: np.ndarray = sax.fit_transform(X)
+
+    return X_sax
+
+
 class FractionSAXCreator(FractionPreprocessor):
     col: str
     n_bins: int
+    strategy: Literal["uniform", "quantile", "normal"] = "uniform"
+    n_segments: Optional[int] = None
 
     def _run(self, fraction: Fraction) -> None:
         X = fraction.data[self.col].to_numpy().reshape(1, -1)
 
-        sax = SAX(n_bins=self.n_bins, strategy="uniform")
-        X_sax = sax.fit_transform(X)
+        X_sax = sax_transform(X, self.n_bins, self.strategy, self.n_segments)
 
         fraction.data = X_sax
 
@@ -24,6 +54,8 @@ class FractionSAXCreator(FractionPreprocessor):
 class TaskSAXCreator(TaskPreprocessor):
     col: str
     n_bins: int
+    strategy: Literal["uniform", "quantile", "normal"] = "uniform"
+    n_segments: Optional[int] = None
 
     def _run(self, task: Task) -> None:
         if len(task.fractions) > 1:
@@ -36,8 +68,7 @@ class TaskSAXCreator(TaskPreprocessor):
 
         X = task.get_fraction_by_idx(0).data[self.col].to_numpy().reshape(1, -1)
 
-        sax = SAX(n_bins=self.n_bins, strategy="uniform")
-        X_sax = sax.fit_transform(X)
+        X_sax = sax_transform(X, self.n_bins, self.strategy, self.n_segments)
 
         task.get_fraction_by_idx(0).data = X_sax
 
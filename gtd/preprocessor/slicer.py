@@ -1,7 +1,7 @@
 import warnings
 from typing import Dict, List, Tuple
 
-from gtd.internal import Fraction, Task
+from gtd.internal import Fraction, LazyFraction, Task
 from gtd.preprocessor.preprocessor import TaskPreprocessor
 
 
@@ -16,17 +16,21 @@ class TaskSlicer(TaskPreprocessor):
             )
             return
 
-        task_ts = task.get_fraction_by_idx(0).data.shape[0]
-        slices = self._get_slices(0, task_ts)
+        fraction = task.get_fraction_by_idx(0)
+        task_data = fraction.data
+        slices = self._get_slices(0, task_data.shape[0])
 
         new_fractions: Dict[int, Fraction] = {}
         for i, slice in enumerate(slices):
             llim, ulim = slice
-            data = task.get_fraction_by_idx(0).data[llim:ulim].copy()
-
-            new_fractions[i] = Fraction(
-                job_id=task.job_id, task_idx=task.idx, idx=i, data=data
-            )
+            data = task_data[llim:ulim].copy()
+
+            if isinstance(fraction, LazyFraction):
+                new_fractions[i] = fraction.derive(i, data)
+            else:
+                new_fractions[i] = Fraction.construct(
+                    job_id=task.job_id, task_idx=task.idx, idx=i, data=data
+                )
 
         task.fractions = new_fractions
 
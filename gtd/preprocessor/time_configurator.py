@@ -27,7 +27,7 @@ class TimeConfigurator(TaskPreprocessor):
         data.set_index(self.time_col, inplace=True)
         data = data[~data.index.duplicated(keep="first")]
         data = data.resample(self.freq).mean()
-        data = data.fillna(method="ffill")
+        data = data.ffill()
         data = data.asfreq(freq=self.freq, method="ffill")
 
         return data
@@ -1,4 +1,8 @@
 import importlib
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 
 def import_class(  # type: ignore[no-untyped-def]
@@ -19,3 +23,28 @@ def import_class(  # type: ignore[no-untyped-def]
         )
 
     return _class
+
+
+def to_image_dtype(
+    image: np.ndarray, dtype: str, value_range: Tuple[float, float]
+) -> np.ndarray:
+    """Casts an image to `dtype`, rescaling `value_range` to [0, 255] for
+    uint8."""
+    if dtype != "uint8":
+        return image.astype(dtype, copy=False)
+
+    low, high = value_range
+    scaled = (image - low) * (255 / (high - low))
+
+    return np.clip(np.rint(scaled), 0, 255).astype(np.uint8)
+
+
+def to_pyts_samples(data: pd.Series, dtype: Optional[str] = None) -> np.ndarray:
+    """Copies a series into the (1, n) samples array of pyts transformers.
+
+    pyts needs a writable array, which the values of a series (e.g. a view
+    under copy-on-write or of a columnar store) may not be.
+    """
+    samples: np.ndarray = data.to_numpy(dtype=dtype, copy=True)
+
+    return samples.reshape(1, -1)
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gtd.input import CsvFullReader
+from gtd.internal import Input
+
+COL = "avg_cpu_usage"
+
+N_JOBS = 3
+N_TASKS = 4
+LENGTH = 48
+
+
+@pytest.fixture(scope="session")
+def input_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Writes a small input of random series in the structured layout:
+    `<job_id>/<task_idx>-<start>-<end>.csv`."""
+    input_dir = tmp_path_factory.mktemp("input")
+    rng = np.random.default_rng(42)
+
+    for job_id in range(1, N_JOBS + 1):
+        job_dir = input_dir / str(job_id)
+        job_dir.mkdir()
+
+        for task_idx in range(N_TASKS):
+            data = pd.DataFrame(
+                {
+                    "time": np.arange(LENGTH, dtype=np.int64) * 300,
+                    COL: rng.uniform(0.01, 1.0, LENGTH),
+                }
+            )
+            data.to_csv(job_dir / f"{task_idx}-0-{LENGTH}.csv", index=False)
+
+    return input_dir
+
+
+@pytest.fixture
+def input_obj(input_dir: Path) -> Input:
+    return CsvFullReader(
+        input_dir=input_dir, columns=["time", COL]
+    ).read_input()
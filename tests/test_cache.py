@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gtd.comparator import L2TaskComparator, MAPETaskComparator
+from gtd.comparator.cache import CACHE_FILE, ComparatorCache
+from gtd.internal import Fraction, Input, Output, Task
+
+COL = "avg_cpu_usage"
+
+
+def _compare(comparator: Any, input_obj: Input) -> np.ndarray:
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    return output_obj.get_part_by_name(comparator.name).values
+
+
+def _fail_compare_block(self: Any, *args: Any) -> Any:
+    raise AssertionError("All pairs should have been cached!")
+
+
+@pytest.mark.parametrize(
+    "comparator_class", [L2TaskComparator, MAPETaskComparator]
+)
+def test_cached_values_equal_compared(
+    input_obj: Input,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    comparator_class: Any,
+) -> None:
+    expected = _compare(comparator_class(name="c", col=COL), input_obj)
+
+    cold = _compare(
+        comparator_class(name="c", col=COL, block_size=5, cache_dir=tmp_path),
+        input_obj,
+    )
+    np.testing.assert_allclose(cold, expected)
+
+    monkeypatch.setattr(comparator_class, "_compare_block", _fail_compare_block)
+    warm = _compare(
+        comparator_class(name="c", col=COL, cache_dir=tmp_path), input_obj
+    )
+    np.testing.assert_allclose(warm, expected)
+
+
+def test_new_items_compare_only_their_pairs(
+    input_obj: Input, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    job_id = input_obj.get_job_ids()[-1]
+    job = input_obj.jobs.pop(job_id)
+    _compare(
+        L2TaskComparator(name="l2", col=COL, cache_dir=tmp_path), input_obj
+    )
+
+    input_obj.jobs[job_id] = job
+    compare_block = L2TaskComparator._compare_block
+    compared = []
+
+    def counted_compare_block(
+        self: Any, items1: Any, items2: Any, mask: np.ndarray
+    ) -> Any:
+        compared.append(int(mask.sum()))
+        return compare_block(self, items1, items2, mask)
+
+    monkeypatch.setattr(
+        L2TaskComparator, "_compare_block", counted_compare_block
+    )
+    values = _compare(
+        L2TaskComparator(name="l2", col=COL, cache_dir=tmp_path), input_obj
+    )
+
+    n, k = len(input_obj.get_task_uids()), len(job.tasks)
+    assert sum(compared) == k * (n - k) + k * (k - 1) // 2
+
+    monkeypatch.undo()
+    expected = _compare(L2TaskComparator(name="l2", col=COL), input_obj)
+    np.testing.assert_allclose(values, expected)
+
+
+def test_duplicate_items(input_obj: Input, tmp_path: Path) -> None:
+    # A copy of a task has the same digest as the task itself.
+    task = next(input_obj.get_tasks())
+    job = input_obj.get_job_by_id(task.job_id)
+    fraction = task.get_fraction_by_idx(0)
+    job.tasks[99] = Task.construct(
+        job_id=task.job_id,
+        idx=99,
+        fractions={
+            0: Fraction.construct(
+                job_id=task.job_id,
+                task_idx=99,
+                idx=0,
+                data=pd.DataFrame(fraction.data, copy=True),
+            )
+        },
+    )
+
+    comparator = L2TaskComparator(name="l2", col=COL, cache_dir=tmp_path)
+    _compare(comparator, input_obj)
+    values = _compare(comparator, input_obj)
+
+    expected = _compare(L2TaskComparator(name="l2", col=COL), input_obj)
+    np.testing.assert_allclose(values, expected)
+
+
+def test_evicts_to_max_size(input_obj: Input, tmp_path: Path) -> None:
+    _compare(
+        L2TaskComparator(name="l2", col=COL, block_size=4, cache_dir=tmp_path),
+        input_obj,
+    )
+    with ComparatorCache(tmp_path, max_size=1 << 30) as cache:
+        size = cache.size()
+
+    _compare(
+        MAPETaskComparator(
+            name="mape",
+            col=COL,
+            block_size=4,
+            cache_dir=tmp_path,
+            cache_size=size,
+        ),
+        input_obj,
+    )
+
+    with ComparatorCache(tmp_path, max_size=size) as cache:
+        assert 0 < cache.size() <= size
+        (count,) = cache._conn.execute(
+            "SELECT COUNT(*) FROM comparators"
+        ).fetchone()
+    assert count == 1
+    assert (tmp_path / CACHE_FILE).exists()
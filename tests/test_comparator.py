@@ -0,0 +1,338 @@
+import re
+from pathlib import Path
+from typing import Any, List
+
+import numpy as np
+import pytest
+
+from gtd.comparator import (
+    CosineTaskComparator,
+    DTWL2TaskComparator,
+    L2TaskComparator,
+    L2TaskFractionComparator,
+    MAPETaskComparator,
+)
+from gtd.comparator.comparator import Comparator
+from gtd.internal import Input, Output
+from gtd.preprocessor import TaskSlicer
+
+COL = "avg_cpu_usage"
+
+
+def _assert_pairs_equal(
+    comparator: Comparator, input_obj: Input, values: np.ndarray
+) -> None:
+    items = comparator._get_items(input_obj)
+    for i, item1 in enumerate(items):
+        for j, item2 in enumerate(items):
+            if i != j:
+                expected = comparator._compare(item1, item2)
+                np.testing.assert_allclose(values[i, j], expected)
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 256])
+@pytest.mark.parametrize(
+    "comparator_class", [L2TaskComparator, MAPETaskComparator]
+)
+def test_compare_equals_pairs(
+    input_obj: Input, comparator_class: Any, block_size: int
+) -> None:
+    comparator = comparator_class(name="cmp", col=COL, block_size=block_size)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    partial_output = output_obj.get_part_by_name("cmp")
+    assert partial_output.ids == input_obj.get_task_uids()
+    _assert_pairs_equal(comparator, input_obj, partial_output.values)
+
+
+def test_compare_fractions_equals_pairs(input_obj: Input) -> None:
+    TaskSlicer(step=16).run(input_obj)
+
+    comparator = L2TaskFractionComparator(name="cmp", col=COL, block_size=5)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    values = output_obj.get_part_by_name("cmp").values
+    assert values.shape[2] == 3
+    _assert_pairs_equal(comparator, input_obj, values)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_symmetric_values_are_mirrored(input_obj: Input, workers: int) -> None:
+    output_obj = Output()
+    L2TaskComparator(name="l2", col=COL, block_size=5, workers=workers).compare(
+        input_obj, output_obj
+    )
+
+    values = output_obj.get_part_by_name("l2").values
+    np.testing.assert_array_equal(values, values.T)
+
+
+def test_asymmetric_values_are_not_mirrored(input_obj: Input) -> None:
+    comparator = MAPETaskComparator(name="mape", col=COL, block_size=5)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    tasks = comparator._get_items(input_obj)
+    id1, id2 = comparator._get_id(tasks[0]), comparator._get_id(tasks[7])
+    partial_output = output_obj.get_part_by_name("mape")
+    value = partial_output.get_value(id1, id2)
+    mirrored = partial_output.get_value(id2, id1)
+
+    assert value == pytest.approx(comparator._compare(tasks[0], tasks[7]))
+    assert mirrored == pytest.approx(comparator._compare(tasks[7], tasks[0]))
+    assert value != pytest.approx(mirrored)
+
+
+def test_compare_pairs_after_structure_change(input_obj: Input) -> None:
+    uids = input_obj.get_task_uids()
+    job_id, task_idx = uids[0]
+    input_obj.get_job_by_id(job_id).tasks.pop(task_idx)
+
+    comparator = L2TaskComparator(name="l2", col=COL)
+    pairs = [(uids[1], uids[2]), (uids[5], uids[3])]
+    output_obj = Output()
+    comparator.compare_pairs(input_obj, output_obj, pairs)
+
+    partial_output = output_obj.get_part_by_name("l2")
+    assert uids[0] not in partial_output.results
+    for baseline, compared in pairs:
+        expected = comparator._compare(
+            input_obj.get_task_by_uid(*baseline),
+            input_obj.get_task_by_uid(*compared),
+        )
+        for id1, id2 in [(baseline, compared), (compared, baseline)]:
+            value = (
+                partial_output.get_result_by_id(id1)
+                .get_partial_result_by_id(id2)
+                .value
+            )
+            assert value == pytest.approx(expected)
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def test_resume_compares_remaining_pairs(
+    input_obj: Input, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    compare_block = L2TaskComparator._compare_block
+    compared: List[int] = []
+
+    def interrupted_compare_block(
+        self: Comparator, items1: Any, items2: Any, mask: np.ndarray
+    ) -> Any:
+        if len(compared) == 3:
+            raise _Interrupted()
+
+        compared.append(int(mask.sum()))
+        return compare_block(self, items1, items2, mask)
+
+    def counted_compare_block(
+        self: Comparator, items1: Any, items2: Any, mask: np.ndarray
+    ) -> Any:
+        compared.append(int(mask.sum()))
+        return compare_block(self, items1, items2, mask)
+
+    def create_comparator(resume: bool) -> L2TaskComparator:
+        return L2TaskComparator(
+            name="l2",
+            col=COL,
+            block_size=4,
+            checkpoint_dir=tmp_path,
+            checkpoint_interval=0.0,
+            resume=resume,
+        )
+
+    # 12 tasks in blocks of 4 make up 6 blocks of the upper triangle.
+    monkeypatch.setattr(
+        L2TaskComparator, "_compare_block", interrupted_compare_block
+    )
+    with pytest.raises(_Interrupted):
+        create_comparator(resume=False).compare(input_obj, Output())
+    interrupted = sum(compared)
+
+    compared.clear()
+    monkeypatch.setattr(
+        L2TaskComparator, "_compare_block", counted_compare_block
+    )
+    output_obj = Output()
+    create_comparator(resume=True).compare(input_obj, output_obj)
+
+    n = len(input_obj.get_task_uids())
+    assert len(compared) == 3
+    assert interrupted + sum(compared) == n * (n - 1) // 2
+
+    monkeypatch.undo()
+    expected = Output()
+    L2TaskComparator(name="l2", col=COL).compare(input_obj, expected)
+    np.testing.assert_allclose(
+        output_obj.get_part_by_name("l2").values,
+        expected.get_part_by_name("l2").values,
+    )
+    assert not list(tmp_path.iterdir())
+
+
+def test_reset_refuses_foreign_checkpoint(
+    input_obj: Input, tmp_path: Path
+) -> None:
+    (tmp_path / "manifest.json").write_text('{"key": "another"}')
+
+    with pytest.raises(ValueError):
+        L2TaskComparator(name="l2", col=COL, checkpoint_dir=tmp_path).compare(
+            input_obj, Output()
+        )
+    assert (tmp_path / "manifest.json").exists()
+
+
+def _fail_compare_block(self: Comparator, *args: Any) -> Any:
+    raise AssertionError("All pairs should have been cached!")
+
+
+def test_cache_loads_requested_pairs(
+    input_obj: Input, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    L2TaskComparator(name="l2", col=COL, cache_dir=tmp_path).compare(
+        input_obj, Output()
+    )
+
+    job_id = input_obj.get_job_ids()[0]
+    input_obj.jobs.pop(job_id)
+    monkeypatch.setattr(L2TaskComparator, "_compare_block", _fail_compare_block)
+    comparator = L2TaskComparator(name="l2", col=COL, cache_dir=tmp_path)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    partial_output = output_obj.get_part_by_name("l2")
+    _assert_pairs_equal(comparator, input_obj, partial_output.values)
+
+
+def test_dtw_is_symmetric_only_for_exact_engine(input_obj: Input) -> None:
+    fast = DTWL2TaskComparator(name="fast", col=COL)
+    exact = DTWL2TaskComparator(name="exact", col=COL, engine="exact")
+    assert not fast.symmetric and exact.symmetric
+
+    output_obj = Output()
+    fast.compare(input_obj, output_obj)
+    exact.compare(input_obj, output_obj)
+
+    _assert_pairs_equal(
+        fast, input_obj, output_obj.get_part_by_name("fast").values
+    )
+    values = output_obj.get_part_by_name("exact").values
+    np.testing.assert_array_equal(values, values.T)
+
+
+@pytest.mark.parametrize(
+    "comparator",
+    [
+        L2TaskComparator(name="cmp", col=COL, block_size=5),
+        CosineTaskComparator(name="cmp", col=COL, block_size=5),
+        DTWL2TaskComparator(name="cmp", col=COL, block_size=5, engine="exact"),
+    ],
+)
+def test_compare_slices_columnar_store(
+    input_obj: Input, comparator: Comparator
+) -> None:
+    expected = Output()
+    comparator.compare(input_obj, expected)
+
+    input_obj.to_columnar()
+    tasks = comparator._get_items(input_obj)
+    with comparator._comparing(input_obj):
+        data = comparator._stack_col(tasks[2:7], COL)
+    assert np.shares_memory(data, input_obj.as_matrix(COL))
+
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+    np.testing.assert_allclose(
+        output_obj.get_part_by_name("cmp").values,
+        expected.get_part_by_name("cmp").values,
+    )
+
+
+def test_compare_fractions_slices_columnar_store(input_obj: Input) -> None:
+    TaskSlicer(step=16).run(input_obj)
+    comparator = L2TaskFractionComparator(name="cmp", col=COL, block_size=5)
+    expected = Output()
+    comparator.compare(input_obj, expected)
+
+    input_obj.to_columnar()
+    tasks = comparator._get_items(input_obj)
+    with comparator._comparing(input_obj):
+        data = comparator._stack_fraction_cols(tasks[::2], COL)
+    assert data.shape == (6, 3, 16)
+
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+    np.testing.assert_allclose(
+        output_obj.get_part_by_name("cmp").values,
+        expected.get_part_by_name("cmp").values,
+    )
+
+
+@pytest.mark.parametrize(
+    "comparator_class", [L2TaskComparator, MAPETaskComparator]
+)
+def test_block_size_scales_with_workers(comparator_class: Any) -> None:
+    def count_blocks(workers: int, n: int) -> int:
+        comparator = comparator_class(name="cmp", col=COL, workers=workers)
+        return len(comparator._get_blocks(n))
+
+    comparator = comparator_class(name="cmp", col=COL)
+    assert comparator._get_block_size(5000) == comparator.max_block_size
+
+    for workers in [4, 16, 64]:
+        assert count_blocks(workers, 5000) >= 4 * workers
+
+    # Small inputs are not split into tiny blocks, and large ones not into
+    # blocks above the cap.
+    assert count_blocks(64, 40) == (3 if comparator.symmetric else 4)
+    comparator = comparator_class(name="cmp", col=COL, workers=2)
+    assert comparator._get_block_size(10**6) == comparator.max_block_size
+
+    comparator = comparator_class(name="cmp", col=COL, block_size=7, workers=64)
+    assert comparator._get_block_size(5000) == 7
+
+
+@pytest.mark.parametrize(
+    "comparator_class", [L2TaskComparator, MAPETaskComparator]
+)
+def test_compare_incremental_equals_full_compare(
+    input_obj: Input, comparator_class: Any
+) -> None:
+    comparator = comparator_class(name="cmp", col=COL, block_size=5)
+    job_id = input_obj.get_job_ids()[1]
+    job = input_obj.jobs.pop(job_id)
+
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    input_obj.jobs[job_id] = job
+    new_ids = [(task.job_id, task.idx) for task in job.get_tasks()]
+    comparator.compare_incremental(input_obj, output_obj, new_ids)
+
+    expected = Output()
+    comparator.compare(input_obj, expected)
+
+    partial_output = output_obj.get_part_by_name("cmp")
+    for id1 in input_obj.get_task_uids():
+        for id2 in input_obj.get_task_uids():
+            if id1 != id2:
+                assert partial_output.get_value(id1, id2) == pytest.approx(
+                    expected.get_part_by_name("cmp").get_value(id1, id2)
+                )
+
+
+def test_compare_incremental_rejects_removed_ids(input_obj: Input) -> None:
+    comparator = L2TaskComparator(name="l2", col=COL)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    job_id = input_obj.get_job_ids()[0]
+    removed = [(job_id, idx) for idx in input_obj.jobs.pop(job_id).tasks]
+
+    with pytest.raises(ValueError, match=re.escape(str(removed))):
+        comparator.compare_incremental(input_obj, output_obj, [])
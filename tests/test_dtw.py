@@ -0,0 +1,169 @@
+import math
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from gtd.comparator import DTWL2TaskComparator
+from gtd.comparator.calculators import (
+    dtw,
+    dtw_batch,
+    dtw_envelope,
+    dtw_matrix,
+    lb_keogh,
+    lb_kim,
+)
+from gtd.internal import Input, Output
+
+COL = "avg_cpu_usage"
+
+
+def _naive_dtw(
+    data1: np.ndarray, data2: np.ndarray, window: Optional[int] = None
+) -> float:
+    n, m = data1.shape[0], data2.shape[0]
+    w = max(n, m) if window is None else max(window, abs(n - m))
+
+    cost = np.full((n + 1, m + 1), np.inf)
+    cost[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(max(1, i - w), min(m, i + w) + 1):
+            cost[i, j] = abs(data1[i - 1] - data2[j - 1]) + min(
+                cost[i - 1, j], cost[i, j - 1], cost[i - 1, j - 1]
+            )
+
+    return float(cost[n, m])
+
+
+@pytest.mark.parametrize("window", [None, 0, 1, 3])
+@pytest.mark.parametrize("lengths", [(20, 20), (17, 23), (1, 5)])
+def test_dtw_equals_naive_dp(window: Optional[int], lengths: tuple) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        data1 = rng.normal(size=lengths[0])
+        data2 = rng.normal(size=lengths[1])
+
+        expected = _naive_dtw(data1, data2, window)
+        assert dtw(data1, data2, window=window) == pytest.approx(expected)
+        assert dtw(data2, data1, window=window) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("window", [None, 2])
+def test_dtw_matrix_equals_pairs(window: Optional[int]) -> None:
+    rng = np.random.default_rng(1)
+    data1, data2 = rng.normal(size=(6, 15)), rng.normal(size=(4, 15))
+    mask = rng.random((6, 4)) < 0.6
+
+    dists = dtw_matrix(data1, data2, mask=mask, window=window)
+
+    for i in range(6):
+        for j in range(4):
+            expected = (
+                _naive_dtw(data1[i], data2[j], window) if mask[i, j] else 0
+            )
+            assert dists[i, j] == pytest.approx(expected)
+
+
+def test_dtw_batch_abandons_pairs_above_max_dist() -> None:
+    rng = np.random.default_rng(2)
+    data1, data2 = rng.normal(size=(30, 25)), rng.normal(size=(30, 25))
+    expected = np.array([_naive_dtw(a, b, 4) for a, b in zip(data1, data2)])
+    max_dist = float(np.median(expected))
+
+    dists = dtw_batch(data1, data2, window=4, max_dist=max_dist)
+
+    within = expected <= max_dist
+    np.testing.assert_allclose(dists[within], expected[within])
+    assert np.isinf(dists[~within]).all()
+    assert dtw_batch(data1, data2, window=4, max_dist=math.inf) == (
+        pytest.approx(expected)
+    )
+
+
+def test_exact_engine_compares_naive_dtw(input_obj: Input) -> None:
+    comparator = DTWL2TaskComparator(
+        name="dtw", col=COL, engine="exact", window=5, block_size=5
+    )
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    partial_output = output_obj.get_part_by_name("dtw")
+    tasks = comparator._get_items(input_obj)
+    for i, task1 in enumerate(tasks):
+        for j, task2 in enumerate(tasks):
+            if i == j:
+                continue
+
+            expected = _naive_dtw(
+                task1.get_fraction_by_idx(0).data[COL].to_numpy(),
+                task2.get_fraction_by_idx(0).data[COL].to_numpy(),
+                window=5,
+            )
+            assert partial_output.values[i, j] == pytest.approx(expected)
+
+
+def _brute_force_dists(
+    comparator: DTWL2TaskComparator, input_obj: Input
+) -> np.ndarray:
+    data = comparator._stack_col(comparator._get_items(input_obj), COL)
+    return np.array(
+        [[_naive_dtw(a, b, comparator.window) for b in data] for a in data]
+    )
+
+
+@pytest.mark.parametrize("window", [None, 4])
+def test_query_equals_brute_force(
+    input_obj: Input, window: Optional[int]
+) -> None:
+    comparator = DTWL2TaskComparator(
+        name="dtw", col=COL, engine="exact", window=window
+    )
+    dists = _brute_force_dists(comparator, input_obj)
+    uids = input_obj.get_task_uids()
+
+    for pos, uid in enumerate(uids):
+        neighbours = comparator.query(
+            input_obj, input_obj.get_task_by_uid(*uid), 3
+        )
+
+        order = [i for i in np.argsort(dists[pos]) if i != pos][:3]
+        assert [id for id, _ in neighbours] == [uids[i] for i in order]
+        assert [dist for _, dist in neighbours] == pytest.approx(
+            dists[pos, order]
+        )
+
+
+def test_knn_matrix_equals_brute_force(input_obj: Input) -> None:
+    comparator = DTWL2TaskComparator(
+        name="dtw", col=COL, engine="exact", window=4
+    )
+    dists = _brute_force_dists(comparator, input_obj)
+    np.fill_diagonal(dists, np.inf)
+
+    n = dists.shape[0]
+    ids, knn_idxs, knn_dists = comparator.knn_matrix(input_obj, n)
+
+    assert ids == input_obj.get_task_uids()
+    np.testing.assert_array_equal(
+        knn_idxs[:, : n - 1], np.argsort(dists, axis=1)[:, : n - 1]
+    )
+    np.testing.assert_allclose(
+        knn_dists[:, : n - 1], np.sort(dists, axis=1)[:, : n - 1]
+    )
+
+    # There are only n - 1 neighbours, the rest is padding.
+    assert (knn_idxs[:, -1] == -1).all() and np.isinf(knn_dists[:, -1]).all()
+
+
+def test_lower_bounds_do_not_exceed_dtw() -> None:
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(40, 30))
+    query = rng.normal(size=30)
+    lower, upper = dtw_envelope(data, 3)
+    query_lower, query_upper = dtw_envelope(query[None, :], 3)
+
+    dists = np.array([_naive_dtw(query, row, 3) for row in data])
+
+    assert (lb_kim(query, data) <= dists + 1e-9).all()
+    assert (lb_keogh(query, lower, upper) <= dists + 1e-9).all()
+    assert (lb_keogh(data, query_lower, query_upper) <= dists + 1e-9).all()
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from gtd.comparator.calculators import (
+    l1_img,
+    l2_img,
+    mae_img,
+    mape_img,
+    mse_img,
+    ssim_stats,
+)
+from gtd.input import CsvFullReader
+from gtd.internal import Input
+from gtd.preprocessor import (
+    FractionGADFCreator,
+    FractionGASFCreator,
+    FractionMTFCreator,
+)
+
+COL = "avg_cpu_usage"
+
+
+def test_csv_reader_downcasts_float_columns(
+    input_dir: Path, input_obj: Input
+) -> None:
+    compact = CsvFullReader(
+        input_dir=input_dir, columns=["time", COL], dtype="float32"
+    ).read_input()
+
+    for task in compact.get_tasks():
+        data = task.get_fraction_by_idx(0).data
+        assert data[COL].dtype == np.float32
+        assert data["time"].dtype == np.int64
+
+        expected = input_obj.get_task_by_uid(task.job_id, task.idx)
+        np.testing.assert_allclose(
+            data[COL], expected.get_fraction_by_idx(0).data[COL], rtol=1e-6
+        )
+
+
+@pytest.mark.parametrize(
+    "creator_class, kwargs, value_range",
+    [
+        (FractionGADFCreator, {"image_size": 16}, (-1.0, 1.0)),
+        (FractionGASFCreator, {"image_size": 16}, (-1.0, 1.0)),
+        (FractionMTFCreator, {"n_bins": 4, "size": 16}, (0.0, 1.0)),
+    ],
+)
+@pytest.mark.parametrize("dtype", ["float32", "uint8"])
+def test_image_creators_store_compact_images(
+    input_dir: Path,
+    input_obj: Input,
+    creator_class: Any,
+    kwargs: dict,
+    value_range: tuple,
+    dtype: str,
+) -> None:
+    compact = CsvFullReader(
+        input_dir=input_dir, columns=["time", COL]
+    ).read_input()
+    creator_class(col=COL, **kwargs).run(input_obj)
+    creator_class(col=COL, dtype=dtype, **kwargs).run(compact)
+
+    low, high = value_range
+    for task in compact.get_tasks():
+        image = task.get_fraction_by_idx(0).data
+        expected = (
+            input_obj.get_task_by_uid(task.job_id, task.idx)
+            .get_fraction_by_idx(0)
+            .data
+        )
+        assert image.dtype == dtype
+        assert image.shape == expected.shape
+
+        if dtype == "uint8":
+            # Rescaled to [0, 255], and rounded to the nearest step.
+            restored = low + image * ((high - low) / 255)
+            np.testing.assert_allclose(
+                restored, expected, atol=(high - low) / 510 + 1e-9
+            )
+        else:
+            np.testing.assert_allclose(image, expected, rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize(
+    "calculator", [l1_img, l2_img, mae_img, mse_img, mape_img]
+)
+@pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+def test_image_calculators_equal_float64(
+    calculator: Callable[[np.ndarray, np.ndarray], float], dtype: Any
+) -> None:
+    rng = np.random.default_rng(0)
+    image1 = rng.integers(0, 256, (32, 32)).astype(dtype)
+    image2 = rng.integers(0, 256, (32, 32)).astype(dtype)
+    image1[0, :4] = 0
+
+    # uint8 differences must not wrap around.
+    assert calculator(image1, image2) == pytest.approx(
+        calculator(image1.astype(np.float64), image2.astype(np.float64)),
+        rel=1e-6,
+    )
+
+
+def test_ssim_stats_keep_float32() -> None:
+    images = np.random.default_rng(1).uniform(-1, 1, (3, 16, 16))
+
+    for data in ssim_stats(images.astype(np.float32)):
+        assert data.dtype == np.float32
+    for data in ssim_stats(images.astype(np.uint8)):
+        assert data.dtype == np.float64
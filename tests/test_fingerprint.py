@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from gtd.index import BucketJoin
+from gtd.internal import Fraction, Input, Job, Task
+from gtd.preprocessor import FractionFingerprintGenerator
+
+COL = "avg_cpu_usage"
+
+
+def _sine_input(periods: list) -> Input:
+    """One job with a task per period, whose series is a noisy sine wave."""
+    rng = np.random.default_rng(0)
+    t = np.arange(288)
+    tasks = {}
+    for idx, period in enumerate(periods):
+        data = pd.DataFrame(
+            {
+                COL: np.sin(2 * np.pi * t / period)
+                + 0.5 * np.sin(2 * np.pi * t / (period / 3))
+                + rng.normal(scale=0.01, size=t.shape[0])
+            }
+        )
+        tasks[idx] = Task.construct(
+            job_id=1,
+            idx=idx,
+            fractions={
+                0: Fraction.construct(job_id=1, task_idx=idx, idx=0, data=data)
+            },
+        )
+
+    return Input.construct(jobs={1: Job.construct(id=1, tasks=tasks)})
+
+
+def test_hash_ignores_the_order_of_frequencies() -> None:
+    generator = FractionFingerprintGenerator(col=COL, resolution=1.0)
+
+    assert generator._hash([3.2, 1.5, 7.9]) == generator._hash([7.9, 3.2, 1.5])
+    assert generator._hash([3.2, 1.5]) == generator._hash([3.7, 1.1])
+    assert generator._hash([3.2, 1.5]) != generator._hash([4.2, 1.5])
+
+
+def test_shifted_grids_join_frequencies_across_a_step() -> None:
+    generator = FractionFingerprintGenerator(col=COL, resolution=1.0, n_grids=2)
+
+    assert generator._hash([0.99], grid=0) != generator._hash([1.01], grid=0)
+    assert generator._hash([0.99], grid=1) == generator._hash([1.01], grid=1)
+    assert generator._hash([1.2], grid=0) != generator._hash([1.2], grid=1)
+
+
+def test_bucket_join_pairs_tasks_of_the_same_frequencies() -> None:
+    input_obj = _sine_input([24, 24, 72, 24, 72, 36])
+    FractionFingerprintGenerator(
+        col=COL, n_top=2, mode="hash", resolution=1e-6, n_grids=2
+    ).run(input_obj)
+
+    join = BucketJoin().build(input_obj)
+
+    keys = {
+        (task.job_id, task.idx): set(task.get_fraction_by_idx(0).data)
+        for task in input_obj.get_tasks()
+    }
+    expected = sorted(
+        (id1, id2)
+        for id1 in keys
+        for id2 in keys
+        if id1 < id2 and keys[id1] & keys[id2]
+    )
+    assert join.candidate_pairs() == expected
+
+    # Tasks 0, 1 and 3 and tasks 2 and 4 have the same periods.
+    same_period = [((1, 0), (1, 1)), ((1, 0), (1, 3)), ((1, 1), (1, 3))]
+    assert set(same_period + [((1, 2), (1, 4))]) <= set(expected)
+    assert ((1, 0), (1, 2)) not in expected
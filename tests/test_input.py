@@ -0,0 +1,94 @@
+import numpy as np
+
+from gtd.internal import Input
+from gtd.internal.tracked_dict import TrackedDict
+from gtd.preprocessor import TaskNormalizer, TaskSlicer
+
+COL = "avg_cpu_usage"
+
+
+def test_ids_follow_structure_changes(input_obj: Input) -> None:
+    uids = input_obj.get_task_uids()
+
+    job_id, task_idx = uids[0]
+    task = input_obj.get_job_by_id(job_id).tasks.pop(task_idx)
+
+    assert input_obj.get_task_uids() == uids[1:]
+    assert input_obj.get_task_ordinal(*uids[1]) == 0
+
+    input_obj.get_job_by_id(job_id).tasks[task_idx] = task
+    assert input_obj.get_task_uids() == uids[1:4] + [uids[0]] + uids[4:]
+    assert input_obj.get_task_ordinal(*uids[0]) == 3
+
+
+def test_index_is_reused_until_structure_changes(input_obj: Input) -> None:
+    input_obj.get_task_uids()
+    index = input_obj._index
+
+    input_obj.get_fraction_uuids()
+    input_obj.get_job_ordinal(input_obj.get_job_ids()[0])
+    assert input_obj._index is index
+
+    job = next(input_obj.get_jobs())
+    job.tasks = dict(job.tasks)
+    assert isinstance(job.tasks, TrackedDict)
+
+    input_obj.get_task_uids()
+    assert input_obj._index is not index
+
+
+def test_fraction_ids_follow_slicing(input_obj: Input) -> None:
+    n = len(input_obj.get_fraction_uuids())
+
+    TaskSlicer(step=16).run(input_obj)
+
+    uuids = input_obj.get_fraction_uuids()
+    assert len(uuids) == 3 * n
+    assert uuids == [
+        (fraction.job_id, fraction.task_idx, fraction.idx)
+        for fraction in input_obj.get_fractions()
+    ]
+    assert input_obj.get_fraction_ordinal(*uuids[-1]) == len(uuids) - 1
+
+
+def test_as_matrix_is_a_view_of_the_columnar_store(input_obj: Input) -> None:
+    expected = input_obj.as_matrix(COL)
+    assert not np.shares_memory(expected, input_obj.as_matrix(COL))
+
+    input_obj.to_columnar()
+    matrix = input_obj.as_matrix(COL)
+    store = input_obj.get_columnar_store()
+
+    assert store is not None
+    assert np.shares_memory(matrix, store.columns[COL])
+    assert not matrix.flags.writeable
+    np.testing.assert_array_equal(matrix, expected)
+
+
+def test_as_matrix_copies_replaced_data(input_obj: Input) -> None:
+    input_obj.to_columnar()
+    store = input_obj.get_columnar_store()
+    assert store is not None
+
+    TaskNormalizer(col=COL).run(input_obj)
+
+    matrix = input_obj.as_matrix(COL)
+    assert not np.shares_memory(matrix, store.columns[COL])
+    np.testing.assert_array_equal(matrix.min(axis=1), 0.0)
+    np.testing.assert_array_equal(matrix.max(axis=1), 1.0)
+
+    # The untouched column is still a view.
+    assert np.shares_memory(input_obj.as_matrix("time"), store.columns["time"])
+
+
+def test_as_matrix_copies_after_structure_change(input_obj: Input) -> None:
+    input_obj.to_columnar()
+    store = input_obj.get_columnar_store()
+    assert store is not None
+
+    job = next(input_obj.get_jobs())
+    job.tasks.pop(job.get_task_idxs()[0])
+
+    matrix = input_obj.as_matrix(COL)
+    assert matrix.shape == (11, 48)
+    assert not np.shares_memory(matrix, store.columns[COL])
@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gtd.comparator import L2TaskComparator
+from gtd.instrumentation import Instrumentation, StageStats, get_active
+from gtd.internal import Input, Output, Task
+from gtd.preprocessor import TaskNormalizer
+
+COL = "avg_cpu_usage"
+
+
+def test_stage_stats_percentiles() -> None:
+    stats = StageStats("stage")
+    for duration in [1e-6] * 90 + [1e-3] * 10:
+        stats.add(duration)
+
+    assert stats.calls == 100
+    assert stats.total == pytest.approx(90e-6 + 10e-3)
+    assert stats.max == 1e-3
+    assert sum(stats.get_histogram().values()) == 100
+
+    # The percentiles are the upper bounds of their buckets.
+    assert 1e-6 <= stats.get_percentile(50) < 1.2e-6
+    assert stats.get_percentile(95) == stats.max
+
+
+def test_summary_counts_calls(input_obj: Input) -> None:
+    comparator = L2TaskComparator(name="l2", col=COL, block_size=5)
+
+    with Instrumentation() as instrumentation:
+        assert get_active() is instrumentation
+        TaskNormalizer(col=COL).run(input_obj)
+        comparator.compare(input_obj, Output())
+    assert get_active() is None
+
+    # Nothing is recorded outside of the `with` block.
+    comparator.compare(input_obj, Output())
+
+    summary = {row["name"]: row for row in instrumentation.get_summary()}
+    assert summary["TaskNormalizer.run"]["calls"] == 1
+    assert summary["TaskNormalizer._run"]["calls"] == 12
+    assert summary["L2TaskComparator.compare"]["calls"] == 1
+    # 12 tasks in blocks of 5, of which the lower triangle is skipped.
+    assert summary["L2TaskComparator._compare_block"]["calls"] == 6
+
+    totals = [row["total"] for row in instrumentation.get_summary()]
+    assert totals == sorted(totals, reverse=True)
+    assert summary["L2TaskComparator.compare"]["total"] >= (
+        summary["L2TaskComparator._compare_block"]["total"]
+    )
+    assert "L2TaskComparator.compare" in instrumentation.format_summary()
+
+
+def test_nested_instrumentation_is_rejected() -> None:
+    with Instrumentation():
+        with pytest.raises(RuntimeError):
+            with Instrumentation():
+                pass
+
+
+def test_trace_memory_records_allocations(input_obj: Input) -> None:
+    buffers = []
+
+    class _Allocator(TaskNormalizer):
+        def _run(self, task: Task) -> None:
+            buffers.append(np.ones(2**20))
+
+    with Instrumentation(trace_memory=True) as instrumentation:
+        _Allocator(col=COL).run(input_obj)
+
+    summary = {row["name"]: row for row in instrumentation.get_summary()}
+    # 12 buffers of 8 MB are kept alive until the end of the run.
+    assert summary["_Allocator.run"]["alloc_peak"] >= 12 * 2**23
+    assert summary["_Allocator._run"]["alloc_peak"] == 0
+
+
+def test_save_trace(input_obj: Input, tmp_path: Path) -> None:
+    with Instrumentation(max_events=5) as instrumentation:
+        TaskNormalizer(col=COL).run(input_obj)
+
+    path = tmp_path / "trace.json"
+    instrumentation.save_trace(path)
+    trace = json.loads(path.read_text())
+
+    assert len(trace["traceEvents"]) == 5
+    assert trace["otherData"]["dropped_events"] == 13 - 5
+    assert {event["ph"] for event in trace["traceEvents"]} == {"X"}
+    assert {event["name"] for event in trace["traceEvents"]} == {
+        "TaskNormalizer._run"
+    }
@@ -0,0 +1,120 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from gtd.comparator import IoUTaskComparator
+from gtd.comparator.calculators import iou, iou_bands, iou_matrix
+from gtd.internal import Fraction, Input, Job, Output, Task
+from gtd.preprocessor.iou import add_iou_band
+
+
+def _naive_iou_band(
+    image: np.ndarray, epsilon: int, border_size: int
+) -> np.ndarray:
+    border_rows = np.full((border_size, image.shape[1]), 255, dtype=int)
+    padded_img = np.vstack([border_rows, image, border_rows])
+
+    for i in range(padded_img.shape[1]):
+        levels = np.where(padded_img[:, i] == 0)[0]
+        for j in range(1, epsilon + 1):
+            padded_img[max(levels.min() - j, 0), i] = 127
+            padded_img[min(levels.max() + j, padded_img.shape[0] - 1), i] = 127
+
+    return padded_img
+
+
+def _naive_iou(data1: np.ndarray, data2: np.ndarray) -> float:
+    ious: List[float] = []
+    for i in range(data1.shape[1]):
+        rows1 = np.where(data1[:, i] == 127)[0]
+        rows2 = np.where(data2[:, i] == 127)[0]
+
+        inter = max(
+            min(rows1.max(), rows2.max()) - max(rows1.min(), rows2.min()), 0
+        )
+        if inter == 0:
+            ious.append(0.0)
+            continue
+
+        union = (
+            (rows1.max() - rows1.min()) + (rows2.max() - rows2.min()) - inter
+        )
+        ious.append(inter / union)
+
+    return sum(ious) / len(ious)
+
+
+def _random_images(n: int, seed: int) -> np.ndarray:
+    """Line plots: one black pixel per column, at a random height."""
+    rng = np.random.default_rng(seed)
+    images = np.full((n, 12, 20), 255, dtype=int)
+    rows = rng.integers(0, 12, size=(n, 20))
+    np.put_along_axis(images, rows[:, None, :], 0, axis=1)
+
+    return images
+
+
+@pytest.mark.parametrize("epsilon", [1, 3])
+@pytest.mark.parametrize("border_size", [1, 2])
+def test_iou_band_equals_naive(epsilon: int, border_size: int) -> None:
+    images = _random_images(5, seed=0)
+
+    banded = add_iou_band(images, epsilon, border_size)
+
+    for image, expected in zip(images, banded):
+        np.testing.assert_array_equal(
+            _naive_iou_band(image, epsilon, border_size), expected
+        )
+
+
+def test_iou_equals_naive() -> None:
+    images = add_iou_band(_random_images(8, seed=1), epsilon=2)
+
+    for image1 in images:
+        for image2 in images:
+            assert iou(image1, image2) == pytest.approx(
+                _naive_iou(image1, image2)
+            )
+
+
+def test_iou_matrix_equals_pairs() -> None:
+    images1 = add_iou_band(_random_images(6, seed=2), epsilon=2)
+    images2 = add_iou_band(_random_images(4, seed=3), epsilon=2)
+
+    dists = iou_matrix(iou_bands(images1), iou_bands(images2))
+
+    expected = [[_naive_iou(a, b) for b in images2] for a in images1]
+    np.testing.assert_allclose(dists, expected)
+
+
+def test_iou_comparator_equals_pairs() -> None:
+    images = add_iou_band(_random_images(7, seed=4), epsilon=2)
+    input_obj = Input.construct(
+        jobs={
+            1: Job.construct(
+                id=1,
+                tasks={
+                    idx: Task.construct(
+                        job_id=1,
+                        idx=idx,
+                        fractions={
+                            0: Fraction.construct(
+                                job_id=1, task_idx=idx, idx=0, data=image
+                            )
+                        },
+                    )
+                    for idx, image in enumerate(images)
+                },
+            )
+        }
+    )
+
+    output_obj = Output()
+    IoUTaskComparator(name="iou", block_size=3).compare(input_obj, output_obj)
+
+    values = output_obj.get_part_by_name("iou").values
+    for i, image1 in enumerate(images):
+        for j, image2 in enumerate(images):
+            if i != j:
+                assert values[i, j] == pytest.approx(_naive_iou(image1, image2))
@@ -0,0 +1,130 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from gtd.input import CsvFullReader
+from gtd.internal import FractionCache, Task
+from gtd.preprocessor import TaskNormalizer, TaskSlicer
+from gtd.preprocessor.preprocessor import TaskPreprocessor
+
+COL = "avg_cpu_usage"
+
+# Every array takes 800 bytes, so a budget of 2000 bytes holds two of them.
+SIZE = 800
+
+
+@pytest.fixture
+def loaded() -> List[Path]:
+    return []
+
+
+@pytest.fixture
+def cache(loaded: List[Path]) -> FractionCache:
+    def load(file: Path) -> np.ndarray:
+        loaded.append(file)
+        return np.full(SIZE // 8, float(file.name))
+
+    return FractionCache(load, memory_budget=2 * SIZE + 400)
+
+
+def test_evicts_least_recently_used(
+    cache: FractionCache, loaded: List[Path]
+) -> None:
+    files = [Path(str(i)) for i in range(3)]
+
+    cache.get(files[0])
+    cache.get(files[1])
+    cache.get(files[0])
+    cache.get(files[2])
+
+    assert files[0] in cache and files[2] in cache
+    assert files[1] not in cache
+    assert cache.size == 2 * SIZE
+
+    assert cache.get(files[1])[0] == 1.0
+    assert loaded == [files[0], files[1], files[2], files[1]]
+
+
+def test_pinned_data_is_not_evicted(cache: FractionCache) -> None:
+    files = [Path(str(i)) for i in range(3)]
+
+    cache.pin(files[0])
+    for file in files:
+        cache.get(file)
+
+    assert files[0] in cache and files[1] not in cache
+
+    cache.unpin(files[0])
+    cache.get(files[1])
+    assert files[0] not in cache
+
+
+def test_changed_data_is_spilled(
+    cache: FractionCache, loaded: List[Path]
+) -> None:
+    files = [Path(str(i)) for i in range(3)]
+
+    cache.put(files[0], np.full(SIZE // 8, -1.0))
+    cache.get(files[1])[:] = -2.0
+    cache.mark_changed(files[1])
+    cache.get(files[2])
+    cache.get(Path("3"))
+
+    assert files[0] not in cache and files[1] not in cache
+    assert cache.spills == 2
+
+    assert cache.get(files[0])[0] == -1.0
+    assert cache.get(files[1])[0] == -2.0
+    assert loaded == [files[1], files[2], Path("3")]
+
+
+def test_preprocessed_input_stays_within_budget(input_dir: Path) -> None:
+    reader_args: Dict[str, Any] = {
+        "input_dir": input_dir,
+        "columns": ["time", COL],
+    }
+    expected = CsvFullReader(**reader_args).read_input()
+    input_obj = CsvFullReader(
+        **reader_args, lazy=True, memory_budget=4096
+    ).read_input()
+
+    for inp in (expected, input_obj):
+        TaskNormalizer(col=COL).run(inp)
+        TaskSlicer(step=16).run(inp)
+
+    cache = input_obj.get_fraction_cache()
+    assert cache is not None
+    assert cache.size <= 4096
+    assert cache.spills > 0
+
+    np.testing.assert_allclose(
+        input_obj.as_matrix(COL), expected.as_matrix(COL)
+    )
+
+
+class _ColumnSum(TaskPreprocessor):
+    col: str
+    sums: Dict[Any, float] = {}
+
+    def _run(self, task: Task) -> None:
+        data = task.get_fraction_by_idx(0).data
+        self.sums[(task.job_id, task.idx)] = float(data[self.col].sum())
+
+
+def test_read_only_preprocessor_spills_nothing(input_dir: Path) -> None:
+    input_obj = CsvFullReader(
+        input_dir=input_dir,
+        columns=["time", COL],
+        lazy=True,
+        memory_budget=4096,
+    ).read_input()
+
+    preprocessor = _ColumnSum(col=COL)
+    preprocessor.run(input_obj)
+
+    cache = input_obj.get_fraction_cache()
+    assert cache is not None
+    assert cache.spills == 0
+    assert len(preprocessor.sums) == len(input_obj.get_task_uids())
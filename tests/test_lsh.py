@@ -0,0 +1,90 @@
+from typing import Set, Tuple
+
+import numpy as np
+import pytest
+
+from gtd.comparator import L2TaskComparator
+from gtd.index import LSHIndex
+from gtd.internal import Input, Output
+
+COL = "avg_cpu_usage"
+
+
+def _clustered_vectors(seed: int) -> np.ndarray:
+    """10 clusters of 5 vectors that are close to their cluster's center."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=10.0, size=(10, 16))
+
+    return np.repeat(centers, 5, axis=0) + rng.normal(scale=0.05, size=(50, 16))
+
+
+def _shared_bucket_pairs(index: LSHIndex, vectors: np.ndarray) -> Set[Tuple]:
+    codes = index._hash(vectors)
+    pairs = set()
+    for table_codes in codes:
+        for i in range(vectors.shape[0]):
+            for j in range(i + 1, vectors.shape[0]):
+                if (table_codes[i] == table_codes[j]).all():
+                    pairs.add((i, j))
+
+    return pairs
+
+
+@pytest.mark.parametrize("family", ["pstable", "hyperplane"])
+def test_candidate_pairs_share_a_bucket(family: str) -> None:
+    vectors = _clustered_vectors(seed=0)
+    index = LSHIndex(family=family, n_tables=4, n_hashes=3)
+    index.build_from_vectors(list(range(50)), vectors)
+
+    assert set(index.candidate_pairs()) == _shared_bucket_pairs(index, vectors)
+
+
+@pytest.mark.parametrize("family", ["pstable", "hyperplane"])
+def test_query_finds_cluster_neighbours(family: str) -> None:
+    vectors = _clustered_vectors(seed=1)
+    index = LSHIndex(family=family).build_from_vectors(list(range(50)), vectors)
+
+    for i in range(0, 50, 7):
+        neighbours = index.query(vectors[i], 5)
+
+        assert {id for id, _ in neighbours} == set(
+            range(i - i % 5, i - i % 5 + 5)
+        )
+        dists = [dist for _, dist in neighbours]
+        assert dists == sorted(dists)
+        assert dists[0] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_range_query_returns_exact_distances() -> None:
+    vectors = _clustered_vectors(seed=2)
+    index = LSHIndex().build_from_vectors(list(range(50)), vectors)
+
+    found = index.range_query(vectors[0], 1.0)
+    assert {id for id, _ in found} >= {0}
+    for id, dist in found:
+        assert dist <= 1.0
+        assert dist == pytest.approx(np.linalg.norm(vectors[id] - vectors[0]))
+
+
+def test_compare_candidate_pairs(input_obj: Input) -> None:
+    index = LSHIndex(n_tables=4, n_hashes=2, bucket_width=50.0).build(input_obj)
+    pairs = index.candidate_pairs()
+    assert pairs
+
+    comparator = L2TaskComparator(name="l2", col=COL)
+    output_obj = Output()
+    comparator.compare_pairs(input_obj, output_obj, pairs)
+
+    partial_output = output_obj.get_part_by_name("l2")
+    for baseline, compared in pairs:
+        value = (
+            partial_output.get_result_by_id(baseline)
+            .get_partial_result_by_id(compared)
+            .value
+        )
+        assert value == pytest.approx(
+            comparator._compare(
+                input_obj.get_task_by_uid(*baseline),
+                input_obj.get_task_by_uid(*compared),
+            )
+        )
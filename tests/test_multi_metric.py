@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from gtd.comparator import (
+    CosineTaskComparator,
+    L1TaskComparator,
+    L2TaskComparator,
+    MAETaskComparator,
+    MSETaskComparator,
+    MultiMetricTaskComparator,
+)
+from gtd.internal import Input, Output
+
+COL = "avg_cpu_usage"
+
+SINGLE_COMPARATORS = {
+    "l1": L1TaskComparator,
+    "l2": L2TaskComparator,
+    "mae": MAETaskComparator,
+    "mse": MSETaskComparator,
+    "cosine": CosineTaskComparator,
+}
+
+
+def test_multi_metric_equals_single_metrics(input_obj: Input) -> None:
+    metrics = ["mse", "l1", "cosine", "l2", "mae"]
+    output_obj = Output()
+    MultiMetricTaskComparator(
+        name="multi", col=COL, metrics=metrics, block_size=5
+    ).compare(input_obj, output_obj)
+
+    for metric in metrics:
+        expected = Output()
+        SINGLE_COMPARATORS[metric](name=metric, col=COL).compare(
+            input_obj, expected
+        )
+
+        np.testing.assert_allclose(
+            output_obj.get_part_by_name(f"multi_{metric}").values,
+            expected.get_part_by_name(metric).values,
+            atol=1e-12,
+        )
+
+
+def test_multi_metric_incremental_equals_full(input_obj: Input) -> None:
+    comparator = MultiMetricTaskComparator(
+        name="multi", col=COL, metrics=["l2", "mae"]
+    )
+    job_id = input_obj.get_job_ids()[-1]
+    job = input_obj.jobs.pop(job_id)
+
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    input_obj.jobs[job_id] = job
+    new_ids = [(task.job_id, task.idx) for task in job.get_tasks()]
+    comparator.compare_incremental(input_obj, output_obj, new_ids)
+
+    expected = Output()
+    comparator.compare(input_obj, expected)
+    for metric in ["l2", "mae"]:
+        name = f"multi_{metric}"
+        assert (
+            output_obj.get_part_by_name(name).ids == input_obj.get_task_uids()
+        )
+        np.testing.assert_allclose(
+            output_obj.get_part_by_name(name).values,
+            expected.get_part_by_name(name).values,
+        )
+
+
+def test_multi_metric_rejects_unknown_metrics() -> None:
+    with pytest.raises(ValueError):
+        MultiMetricTaskComparator(name="multi", col=COL, metrics=["dtw"])
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from gtd.comparator import L2TaskComparator
+from gtd.internal import Input, MatrixPartialOutput, Output, PartialOutput
+
+COL = "avg_cpu_usage"
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_matrix_part_round_trip(
+    input_obj: Input, tmp_path: Path, mmap: bool
+) -> None:
+    output_obj = Output()
+    L2TaskComparator(name="l2", col=COL).compare(input_obj, output_obj)
+    output_obj.save(tmp_path)
+
+    loaded = Output.load(tmp_path, mmap=mmap)
+    part = loaded.get_part_by_name("l2")
+    expected = output_obj.get_part_by_name("l2")
+    assert isinstance(part, MatrixPartialOutput)
+    assert isinstance(part.values, np.memmap) == mmap
+    assert part.ids == expected.ids
+    np.testing.assert_array_equal(part.values, expected.values)
+
+    uids = input_obj.get_task_uids()
+    np.testing.assert_array_equal(part.get_row(uids[2]), expected.values[2])
+    np.testing.assert_array_equal(
+        part.get_rows([uids[5], uids[1]]), expected.values[[5, 1]]
+    )
+
+    # Edits of a memory-mapped part never reach the files.
+    part.values[0, 1] = -1.0
+    reloaded = Output.load(tmp_path).get_part_by_name("l2")
+    assert reloaded.values[0, 1] == expected.values[0, 1]
+
+
+def test_sparse_part_round_trip(input_obj: Input, tmp_path: Path) -> None:
+    uids = input_obj.get_task_uids()
+    pairs = [(uids[0], uids[1]), (uids[0], uids[5]), (uids[7], uids[2])]
+    output_obj = Output()
+    L2TaskComparator(name="l2", col=COL).compare_pairs(
+        input_obj, output_obj, pairs
+    )
+    output_obj.save(tmp_path)
+
+    part = Output.load(tmp_path).get_part_by_name("l2")
+    expected = output_obj.get_part_by_name("l2")
+    assert isinstance(part, PartialOutput)
+    assert part.get_result_ids() == expected.get_result_ids()
+    for result in expected.get_results():
+        loaded_result = part.get_result_by_id(result.baseline)
+        for partial_result in result.get_partial_results():
+            assert (
+                loaded_result.get_partial_result_by_id(partial_result.id_)
+                == partial_result
+            )
+
+
+def test_unallocated_matrix_part_round_trip(tmp_path: Path) -> None:
+    output_obj = Output(
+        parts={
+            "empty": MatrixPartialOutput.construct(
+                name="empty", ids=[1, 2, 3], values=None
+            )
+        }
+    )
+    output_obj.save(tmp_path)
+
+    part = Output.load(tmp_path).get_part_by_name("empty")
+    assert part.ids == [1, 2, 3]
+    assert part.values is None
+
+
+def test_load_rejects_other_versions(tmp_path: Path) -> None:
+    Output().save(tmp_path)
+    manifest_file = tmp_path / "manifest.json"
+    manifest = json.loads(manifest_file.read_text())
+    manifest_file.write_text(json.dumps({**manifest, "version": 0}))
+
+    with pytest.raises(ValueError):
+        Output.load(tmp_path)
@@ -0,0 +1,92 @@
+from typing import List
+
+import pytest
+
+from gtd.comparator import (
+    CallbackProgressReporter,
+    L2TaskComparator,
+    Progress,
+    TextProgressReporter,
+)
+from gtd.internal import Input, Output
+
+COL = "avg_cpu_usage"
+
+
+def test_progress_rate_and_eta() -> None:
+    progress = Progress(completed=30, total=120, elapsed=15.0)
+
+    assert progress.rate == 2.0
+    assert progress.eta == 45.0
+    assert progress.format() == (
+        "30/120 pairs (25.0%) 2.0 pairs/s, elapsed 0:00:15, eta 0:00:45"
+    )
+    assert Progress(completed=0, total=120, elapsed=0.0).eta is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compare_reports_all_pairs(input_obj: Input, workers: int) -> None:
+    reports: List[Progress] = []
+    comparator = L2TaskComparator(
+        name="l2",
+        col=COL,
+        block_size=5,
+        workers=workers,
+        progress=CallbackProgressReporter(callback=reports.append, interval=0),
+    )
+    comparator.compare(input_obj, Output())
+
+    # 12 tasks, of which only the upper triangle is compared.
+    assert [report.total for report in reports] == [66] * len(reports)
+    completed = [report.completed for report in reports]
+    assert completed == sorted(completed)
+    assert completed[-1] == 66
+    # A report per block, and the final one.
+    assert len(reports) == 6 + 1
+
+
+def test_compare_pairs_reports_per_row(input_obj: Input) -> None:
+    uids = input_obj.get_task_uids()
+    pairs = [(uids[0], uids[1]), (uids[0], uids[2]), (uids[3], uids[1])]
+    reports: List[Progress] = []
+    comparator = L2TaskComparator(
+        name="l2",
+        col=COL,
+        progress=CallbackProgressReporter(callback=reports.append, interval=0),
+    )
+    comparator.compare_pairs(input_obj, Output(), pairs)
+
+    assert [report.completed for report in reports] == [2, 3, 3]
+    assert reports[-1].total == 3
+
+
+def test_reports_are_throttled(input_obj: Input) -> None:
+    reports: List[Progress] = []
+    comparator = L2TaskComparator(
+        name="l2",
+        col=COL,
+        block_size=5,
+        progress=CallbackProgressReporter(
+            callback=reports.append, interval=3600
+        ),
+    )
+    comparator.compare(input_obj, Output())
+
+    assert len(reports) == 1
+    assert reports[0].completed == reports[0].total
+
+
+def test_text_reporter_writes_lines(
+    input_obj: Input, capsys: pytest.CaptureFixture
+) -> None:
+    comparator = L2TaskComparator(
+        name="l2",
+        col=COL,
+        block_size=5,
+        progress=TextProgressReporter(interval=0),
+    )
+    comparator.compare(input_obj, Output())
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 7
+    assert lines[-1].startswith("66/66 pairs (100.0%)")
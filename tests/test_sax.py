@@ -0,0 +1,125 @@
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from gtd.comparator import SAXMinDistTaskComparator
+from gtd.comparator.calculators import (
+    sax_codes,
+    sax_dist_table,
+    sax_mindist,
+    sax_mindist_matrix,
+)
+from gtd.index import SAXIndex
+from gtd.internal import Input, Output
+from gtd.preprocessor import TaskSAXCreator
+
+COL = "avg_cpu_usage"
+N_BINS = 6
+
+
+def _z_normalized(input_obj: Input) -> np.ndarray:
+    data = np.stack(
+        [
+            task.get_fraction_by_idx(0).data[COL].to_numpy()
+            for task in input_obj.get_tasks()
+        ]
+    )
+
+    return (data - data.mean(axis=1, keepdims=True)) / data.std(
+        axis=1, keepdims=True
+    )
+
+
+def _codes(input_obj: Input) -> np.ndarray:
+    return np.stack(
+        [
+            sax_codes(task.get_fraction_by_idx(0).data).ravel()
+            for task in input_obj.get_tasks()
+        ]
+    )
+
+
+@pytest.mark.parametrize("n_segments", [None, 8])
+def test_mindist_lower_bounds_euclidean_distance(
+    input_obj: Input, n_segments: Optional[int]
+) -> None:
+    series = _z_normalized(input_obj)
+    TaskSAXCreator(
+        col=COL, n_bins=N_BINS, strategy="normal", n_segments=n_segments
+    ).run(input_obj)
+
+    comparator = SAXMinDistTaskComparator(
+        name="sax", n_bins=N_BINS, series_length=series.shape[1], block_size=5
+    )
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    mindists = output_obj.get_part_by_name("sax").values
+    dists = np.linalg.norm(series[:, None, :] - series[None, :, :], axis=2)
+
+    assert (mindists <= dists + 1e-9).all()
+    assert (mindists > 0).any()
+
+    tasks = comparator._get_items(input_obj)
+    for i, task1 in enumerate(tasks):
+        for j, task2 in enumerate(tasks):
+            if i != j:
+                assert mindists[i, j] == pytest.approx(
+                    comparator._compare(task1, task2)
+                )
+
+
+def test_mindist_matrix_equals_pairs() -> None:
+    rng = np.random.default_rng(0)
+    codes1 = rng.integers(0, N_BINS, (5, 10))
+    codes2 = rng.integers(0, N_BINS, (7, 10))
+    table = sax_dist_table(N_BINS)
+
+    dists = sax_mindist_matrix(codes1, codes2, table, 40)
+
+    for i in range(5):
+        for j in range(7):
+            assert dists[i, j] == pytest.approx(
+                sax_mindist(codes1[i], codes2[j], table, 40)
+            )
+
+
+@pytest.fixture
+def sax_input(input_obj: Input) -> Input:
+    TaskSAXCreator(col=COL, n_bins=N_BINS, strategy="normal").run(input_obj)
+
+    return input_obj
+
+
+@pytest.mark.parametrize("prefix_length", [1, 4, 48])
+def test_index_queries_equal_brute_force(
+    sax_input: Input, prefix_length: int
+) -> None:
+    codes = _codes(sax_input)
+    mindists = sax_mindist_matrix(codes, codes, sax_dist_table(N_BINS))
+    uids = sax_input.get_task_uids()
+    radius = float(np.median(mindists))
+
+    index = SAXIndex(n_bins=N_BINS, prefix_length=prefix_length)
+    index.build(sax_input)
+
+    for pos in range(len(uids)):
+        word = sax_input.get_task_by_uid(*uids[pos]).get_fraction_by_idx(0).data
+
+        results = index.query(word, 4)
+        assert [dist for _, dist in results] == pytest.approx(
+            np.sort(mindists[pos])[:4]
+        )
+
+        results = index.range_query(word, radius)
+        assert {id for id, _ in results} == {
+            uids[i] for i in np.nonzero(mindists[pos] <= radius)[0]
+        }
+
+    pairs = index.candidate_pairs(radius)
+    assert len(pairs) == len(set(pairs))
+    assert {frozenset(pair) for pair in pairs} == {
+        frozenset((uids[i], uids[j]))
+        for i, j in zip(*np.nonzero(np.triu(mindists <= radius, k=1)))
+    }
@@ -0,0 +1,100 @@
+from typing import Any
+
+import numpy as np
+import pytest
+from skimage.metrics import structural_similarity
+
+from gtd.comparator import (
+    SDSIMTaskComparator,
+    SSIMImageTaskComparator,
+    SSIMTaskComparator,
+)
+from gtd.comparator.calculators import ssim_data_range, ssim_matrix, ssim_stats
+from gtd.comparator.comparator import Comparator
+from gtd.internal import Fraction, Input, Job, Output, Task
+
+COL = "avg_cpu_usage"
+
+
+def _assert_pairs_equal(
+    comparator: Comparator, input_obj: Input, values: np.ndarray
+) -> None:
+    items = comparator._get_items(input_obj)
+    for i, item1 in enumerate(items):
+        for j, item2 in enumerate(items):
+            if i != j:
+                expected = comparator._compare(item1, item2)
+                assert values[i, j] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "images",
+    [
+        np.random.default_rng(0).integers(0, 256, (5, 16, 12), dtype=np.uint8),
+        np.random.default_rng(1).uniform(-1, 1, (5, 16, 12)),
+        np.random.default_rng(2).uniform(0, 1, (5, 48)),
+    ],
+)
+def test_ssim_matrix_equals_skimage(images: np.ndarray) -> None:
+    data_range = ssim_data_range(images)
+    stats = ssim_stats(images)
+    mask = np.ones((5, 5), dtype=bool)
+    mask[1, 3] = False
+
+    dists = ssim_matrix(stats, stats, data_range, mask=mask)
+
+    for i in range(5):
+        for j in range(5):
+            expected = (
+                structural_similarity(
+                    images[i], images[j], data_range=data_range
+                )
+                if mask[i, j]
+                else 0.0
+            )
+            assert dists[i, j] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "comparator_class", [SSIMTaskComparator, SDSIMTaskComparator]
+)
+def test_ssim_comparators_equal_pairs(
+    input_obj: Input, comparator_class: Any
+) -> None:
+    comparator = comparator_class(name="ssim", col=COL, block_size=5)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    values = output_obj.get_part_by_name("ssim").values
+    _assert_pairs_equal(comparator, input_obj, values)
+
+
+def test_ssim_image_comparator_equals_pairs() -> None:
+    rng = np.random.default_rng(3)
+    images = rng.integers(0, 256, (6, 16, 16), dtype=np.uint8)
+    input_obj = Input.construct(
+        jobs={
+            1: Job.construct(
+                id=1,
+                tasks={
+                    idx: Task.construct(
+                        job_id=1,
+                        idx=idx,
+                        fractions={
+                            0: Fraction.construct(
+                                job_id=1, task_idx=idx, idx=0, data=image
+                            )
+                        },
+                    )
+                    for idx, image in enumerate(images)
+                },
+            )
+        }
+    )
+
+    comparator = SSIMImageTaskComparator(name="ssim", block_size=4)
+    output_obj = Output()
+    comparator.compare(input_obj, output_obj)
+
+    values = output_obj.get_part_by_name("ssim").values
+    _assert_pairs_equal(comparator, input_obj, values)